@@ -0,0 +1,168 @@
+import json
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from . import config
+
+# Drug classes and their members: generic names plus common brand and combination names, lower case
+DRUG_CLASSES: Dict[str, Tuple[str, ...]] = {
+    "penicillins": (
+        "penicillin", "amoxicillin", "amoxycillin", "ampicillin", "co-amoxiclav", "augmentin", "flucloxacillin",
+        "cloxacillin", "dicloxacillin", "nafcillin", "oxacillin", "piperacillin", "tazocin", "benzylpenicillin",
+        "phenoxymethylpenicillin", "ticarcillin", "temocillin", "pivmecillinam",
+    ),
+    "cephalosporins": (
+        "cefalexin", "cephalexin", "cefadroxil", "cefazolin", "cefuroxime", "cefaclor", "cefixime", "cefpodoxime",
+        "cefotaxime", "ceftriaxone", "ceftazidime", "cefepime", "ceftaroline", "cefoperazone",
+    ),
+    "carbapenems": ("meropenem", "imipenem", "ertapenem", "doripenem"),
+    "sulfonamides": (
+        "sulfamethoxazole", "co-trimoxazole", "cotrimoxazole", "bactrim", "septrin", "sulfadiazine", "sulfasalazine",
+        "sulfacetamide", "dapsone",
+    ),
+    "nsaids": (
+        "aspirin", "acetylsalicylic", "ibuprofen", "naproxen", "diclofenac", "indomethacin", "indometacin",
+        "ketorolac", "ketoprofen", "mefenamic", "piroxicam", "meloxicam", "celecoxib", "etoricoxib", "aceclofenac",
+    ),
+    "opioids": (
+        "codeine", "morphine", "diamorphine", "tramadol", "oxycodone", "hydromorphone", "hydrocodone", "fentanyl",
+        "pethidine", "meperidine", "tapentadol", "dihydrocodeine", "co-codamol", "buprenorphine",
+    ),
+    "macrolides": ("erythromycin", "azithromycin", "clarithromycin", "roxithromycin"),
+    "fluoroquinolones": ("ciprofloxacin", "levofloxacin", "moxifloxacin", "ofloxacin", "norfloxacin"),
+    "tetracyclines": ("tetracycline", "doxycycline", "minocycline", "oxytetracycline", "lymecycline"),
+    "aminoglycosides": ("gentamicin", "amikacin", "tobramycin", "streptomycin", "neomycin"),
+    "ace inhibitors": ("lisinopril", "enalapril", "ramipril", "captopril", "perindopril", "fosinopril"),
+    "anticonvulsants": ("carbamazepine", "oxcarbazepine", "phenytoin", "fosphenytoin", "phenobarbital", "lamotrigine"),
+    "heparins": ("heparin", "enoxaparin", "dalteparin", "tinzaparin"),
+    "iodinated contrast": ("iohexol", "iopamidol", "iodixanol", "omnipaque"),
+}
+
+# Other names patients' allergies are recorded under, for each class
+CLASS_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "penicillins": ("pcn", "beta-lactam", "beta lactam"),
+    "cephalosporins": ("cephalosporin",),
+    "carbapenems": ("carbapenem",),
+    "sulfonamides": ("sulfa", "sulfa drugs", "sulpha", "sulphonamides", "sulfonamide", "sulphonamide"),
+    "nsaids": ("nsaid", "non-steroidal anti-inflammatory", "salicylates"),
+    "opioids": ("opioid", "opiates", "opiate"),
+    "macrolides": ("macrolide",),
+    "fluoroquinolones": ("quinolones", "fluoroquinolone"),
+    "aminoglycosides": ("aminoglycoside",),
+    "ace inhibitors": ("ace inhibitor", "ace-inhibitors"),
+    "iodinated contrast": ("contrast", "contrast dye", "iodine", "iodine contrast"),
+}
+
+# Classes that can cross-react with an allergy to another class: prescribing them is flagged with caution
+CROSS_REACTIVE: Dict[str, Tuple[str, ...]] = {
+    "penicillins": ("cephalosporins", "carbapenems"),
+    "cephalosporins": ("penicillins", "carbapenems"),
+    "carbapenems": ("penicillins", "cephalosporins"),
+}
+
+CONTRAINDICATED = "contraindicated"
+CAUTION = "caution"
+
+_WORD = re.compile(r"[a-z]+(?:-[a-z]+)*")
+
+def normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+class AllergyChecker:
+    """Flags prescriptions that clash with a patient's recorded allergies.
+
+    The class tables are compiled once, at import, into hash maps from a
+    drug name or word to its class and from an allergy name to the class it
+    covers. A patient's allergies (the JSON text stored on the patient) are
+    parsed once per distinct text into a tuple of (recorded name, class) and
+    cached, so checking a prescription is a few dictionary lookups. The
+    cache is keyed by the text itself, so editing a patient's allergies
+    needs no invalidation.
+    """
+
+    def __init__(self, classes, aliases, cross_reactive, cache_size: int = 4096):
+        self._drug_class: Dict[str, str] = {}
+        self._allergy_class: Dict[str, str] = {}
+        for drug_class, members in classes.items():
+            self._allergy_class[drug_class] = drug_class
+            for member in members:
+                self._drug_class[member] = drug_class
+                self._allergy_class[member] = drug_class
+        for drug_class, names in aliases.items():
+            for name in names:
+                self._allergy_class[name] = drug_class
+        # Allergy class -> {drug class: severity}
+        self._severity: Dict[str, Dict[str, str]] = {
+            drug_class: {drug_class: CONTRAINDICATED, **{other: CAUTION for other in cross_reactive.get(drug_class, ())}}
+            for drug_class in classes
+        }
+        self.patient_allergies = lru_cache(maxsize=cache_size)(self._parse_allergies)
+        self.drug_class = lru_cache(maxsize=cache_size)(self._drug_class_of)
+
+    def allergy_class(self, name: str) -> Optional[str]:
+        """The drug class an allergy name covers ("Amoxicillin", "sulfa drugs"), or None."""
+        return self._allergy_class.get(normalize(name))
+
+    def _parse_allergies(self, allergies: Optional[str]) -> Tuple[Tuple[str, str, Optional[str]], ...]:
+        """(recorded name, normalized name, class or None) for each allergy in the stored JSON text."""
+        if not allergies:
+            return ()
+        try:
+            names = json.loads(allergies)
+        except ValueError:
+            names = allergies.split(",")  # Free text entered outside the API
+        if isinstance(names, str):
+            names = [names]
+        parsed = []
+        for name in names if isinstance(names, list) else ():
+            if isinstance(name, str) and name.strip():
+                key = normalize(name)
+                parsed.append((name.strip(), key, self._allergy_class.get(key)))
+        return tuple(parsed)
+
+    def _drug_class_of(self, medication: str) -> Tuple[Optional[str], FrozenSet[str]]:
+        """The class of a medication name ("Amoxicillin 500mg" -> penicillins) and its words."""
+        key = normalize(medication)
+        words = frozenset(_WORD.findall(key))
+        drug_class = self._drug_class.get(key)
+        if drug_class is None:
+            for word in words:
+                drug_class = self._drug_class.get(word)
+                if drug_class is not None:
+                    break
+        return drug_class, words
+
+    def check(self, allergies: Optional[str], medication: str) -> List[dict]:
+        """Warnings for prescribing ``medication`` to a patient with the given allergies JSON."""
+        patient = self.patient_allergies(allergies)
+        if not patient:
+            return []
+        drug_class, words = self.drug_class(medication)
+        warnings = []
+        for recorded, key, allergy_class in patient:
+            severity = self._severity[allergy_class].get(drug_class) if allergy_class and drug_class else None
+            if severity is None and key in words:
+                severity = CONTRAINDICATED  # Allergy to a drug the tables do not know, named in the prescription
+            if severity is None:
+                continue
+            if severity == CAUTION:
+                message = f"Patient is allergic to {recorded} ({allergy_class}); {medication} ({drug_class}) may cross-react"
+            elif drug_class:
+                message = f"Patient is allergic to {recorded}; {medication} is in the {drug_class} class"
+            else:
+                message = f"Patient is allergic to {recorded}, named in {medication}"
+            warnings.append({
+                "allergy": recorded,
+                "drug_class": drug_class,
+                "severity": severity,
+                "message": message,
+            })
+        return warnings
+
+    def check_many(self, allergies: Optional[str], medications: Iterable[str]) -> List[List[dict]]:
+        """Warnings for each of a batch of medication names prescribed to one patient."""
+        if not self.patient_allergies(allergies):
+            return [[] for _ in medications]
+        return [self.check(allergies, medication) for medication in medications]
+
+allergy_checker = AllergyChecker(DRUG_CLASSES, CLASS_ALIASES, CROSS_REACTIVE, config.ALLERGY_CACHE_SIZE)
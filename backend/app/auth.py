@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -5,8 +7,9 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from . import models, schemas
-from .database import get_db
+from . import config, crud, models, schemas
+from .cache import TTLCache
+from .database import get_db, run_in_session
 
 # Configuration
 SECRET_KEY = "your-secret-key-here"  # In production, use environment variable
@@ -18,6 +21,21 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/auth/token", auto_error=False)
+
+# Authenticated users keyed by token subject (email). Entries are dropped by
+# crud.update_user/delete_user in this process; other workers see changes
+# once the TTL expires.
+user_cache = TTLCache(maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+
+# Trusted-claims mode: every user's (email, role) by id under one key, so a
+# token of a deleted or changed user stops being trusted within the TTL
+user_roles = TTLCache(maxsize=1, ttl=config.USER_CACHE_TTL)
+
+def invalidate_cached_user(email: str):
+    """Drop a user from the authentication caches."""
+    user_cache.pop(email)
+    user_roles.pop("users")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -27,15 +45,67 @@ def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
+class PasswordHashPool:
+    """Bounded worker pool for bcrypt, which is too slow to run on the event loop.
+
+    bcrypt releases the GIL while hashing, so worker threads run in parallel.
+    When more than ``max_queue`` jobs are waiting, new ones are rejected with
+    503 instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.in_flight = 0  # Only touched from the event loop thread
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a free worker."""
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, fn, *args):
+        if self.queue_depth >= self.max_queue:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+
+password_hash_pool = PasswordHashPool(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_MAX_QUEUE)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hash pool."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password hash pool."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
     """Authenticate a user with email and password."""
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = await run_in_session(db, crud.get_user_by_email, email=email)
     if not user:
         return None
-    if not verify_password(password, user.password):
+    if not await verify_password_async(password, user.password):
         return None
     return user
 
+def get_token_claims(user: models.User) -> dict:
+    """Build the JWT claims for a user, including the profile used in trusted-claims mode."""
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "name": user.name,
+        "role": user.role,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+    }
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -47,7 +117,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> schemas.User:
     """Get the current authenticated user from JWT token."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,13 +132,43 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = schemas.TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
+
+    if config.AUTH_TRUST_TOKEN_CLAIMS and payload.get("uid") and payload.get("created_at"):
+        roles = user_roles.get("users")
+        if roles is None:
+            roles = await run_in_session(db, crud.get_user_roles)
+            user_roles.set("users", roles)
+        if roles.get(payload["uid"]) == (email, payload.get("role")):
+            return schemas.User(
+                id=payload["uid"],
+                name=payload["name"],
+                email=email,
+                role=payload["role"],
+                created_at=payload["created_at"]
+            )
+        # The user was deleted or changed since the token was issued: look them up below
+
+    user = user_cache.get(token_data.email)
     if user is None:
-        raise credentials_exception
+        db_user = await run_in_session(db, crud.get_user_by_email, email=token_data.email)
+        if db_user is None:
+            raise credentials_exception
+        user = schemas.User.model_validate(db_user)
+        user_cache.set(token_data.email, user)
     return user
 
-async def get_current_active_user(current_user: models.User = Depends(get_current_user)) -> models.User:
+async def get_current_stream_user(
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+    access_token: Optional[str] = None,
+    db: Session = Depends(get_db)
+) -> schemas.User:
+    """Like get_current_user, but also accepts the token as an access_token query parameter.
+
+    Browsers' EventSource cannot send an Authorization header.
+    """
+    return await get_current_user(token or access_token or "", db)
+
+async def get_current_active_user(current_user: schemas.User = Depends(get_current_user)) -> schemas.User:
     """Get the current active user."""
     if not current_user:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -0,0 +1,108 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from . import config
+
+# A bed is identified by (ward_type, room_number, bed_number)
+BedKey = Tuple[str, str, str]
+
+class BedOccupiedError(Exception):
+    """Raised when an admission or transfer targets a bed another patient occupies."""
+
+    def __init__(self, key: BedKey):
+        self.key = key
+        super().__init__(f"Bed {key[2]} in room {key[1]} ({key[0]}) is already occupied")
+
+class BedOccupancyIndex:
+    """In-memory map of every bed and its occupant, grouped by ward.
+
+    Keeps a set of free beds per ward, so free counts and picking a free bed
+    are O(1). The beds table is the source of truth: crud applies each change
+    here after its transaction commits, and the whole map is reloaded from the
+    table once it is older than ``ttl`` seconds, which picks up writes made by
+    other processes. Safe to share between the event loop and threadpool workers.
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._occupant: Dict[BedKey, Optional[str]] = {}
+        self._free: Dict[str, Set[Tuple[str, str]]] = {}
+        self._beds: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._journal: Optional[List[Tuple[BedKey, Optional[str]]]] = None
+        self._generation = 0  # Latest load started; only it may finish
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def begin_load(self) -> int:
+        """Start recording changes, so ones committed while the table is read are not lost.
+
+        Returns the load's generation, to pass to ``finish_load``. A later
+        ``begin_load`` supersedes this load; its rows were read after ours.
+        """
+        with self._lock:
+            self._generation += 1
+            self._journal = []
+            return self._generation
+
+    def finish_load(self, beds: Iterable[Tuple[BedKey, Optional[str]]], generation: int) -> None:
+        """Replace the map with (key, patient_id) rows read from the beds table, unless superseded."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._occupant, self._free, self._beds = {}, {}, {}
+            for key, patient_id in beds:
+                self._set(key, patient_id)
+            for key, patient_id in self._journal or []:
+                self._set(key, patient_id)
+            self._journal = None
+            self._loaded_at = time.monotonic()
+
+    def apply(self, changes: Iterable[Tuple[BedKey, Optional[str]]]) -> None:
+        """Record committed (key, patient_id) changes; a None patient frees the bed."""
+        with self._lock:
+            for key, patient_id in changes:
+                self._set(key, patient_id)
+                if self._journal is not None:
+                    self._journal.append((key, patient_id))
+
+    def _set(self, key: BedKey, patient_id: Optional[str]) -> None:
+        ward, room, bed = key
+        if key not in self._occupant:
+            self._beds[ward] = self._beds.get(ward, 0) + 1
+        self._occupant[key] = patient_id
+        free = self._free.setdefault(ward, set())
+        if patient_id is None:
+            free.add((room, bed))
+        else:
+            free.discard((room, bed))
+
+    def free_count(self, ward: str) -> int:
+        with self._lock:
+            return len(self._free.get(ward, ()))
+
+    def free_beds(self, ward: str) -> List[Tuple[str, str]]:
+        """(room_number, bed_number) of every free bed in a ward, sorted."""
+        with self._lock:
+            return sorted(self._free.get(ward, ()))
+
+    def occupant(self, key: BedKey) -> Optional[str]:
+        with self._lock:
+            return self._occupant.get(key)
+
+    def summary(self) -> List[dict]:
+        """Bed, occupied and free counts for every ward."""
+        with self._lock:
+            return [
+                {
+                    "ward_type": ward,
+                    "beds": total,
+                    "occupied": total - len(self._free.get(ward, ())),
+                    "free": len(self._free.get(ward, ()))
+                }
+                for ward, total in sorted(self._beds.items())
+            ]
+
+bed_index = BedOccupancyIndex(ttl=config.BED_INDEX_TTL)
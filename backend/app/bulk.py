@@ -0,0 +1,91 @@
+import json
+from typing import Any, List, Tuple, Type
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from . import config
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# Rows of a bulk request that passed validation, tagged with their input position
+BulkRows = List[Tuple[int, BaseModel]]
+
+def _too_many_rows() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Bulk requests are limited to {config.BULK_MAX_ROWS} rows"
+    )
+
+def _parse_line(line: bytes, line_number: int) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON on line {line_number}")
+
+async def read_bulk_rows(request: Request) -> List[Any]:
+    """Read the rows of a bulk request body.
+
+    Accepts a JSON array, or NDJSON (one object per line) when the request is
+    sent with an NDJSON content type. NDJSON is parsed as it arrives, so large
+    imports never hold the raw body in memory.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in NDJSON_MEDIA_TYPES:
+        try:
+            rows = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of rows")
+        if len(rows) > config.BULK_MAX_ROWS:
+            raise _too_many_rows()
+        return rows
+
+    rows = []
+    buffer = b""
+    line_number = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                rows.append(_parse_line(line, line_number))
+        if len(rows) > config.BULK_MAX_ROWS:
+            raise _too_many_rows()
+    if buffer.strip():
+        rows.append(_parse_line(buffer, line_number + 1))
+    if len(rows) > config.BULK_MAX_ROWS:
+        raise _too_many_rows()
+    return rows
+
+def validate_rows(rows: List[Any], schema: Type[BaseModel]) -> Tuple[BulkRows, List[dict]]:
+    """Validate every row against a schema.
+
+    Returns the valid rows with their input index, and an "invalid" result
+    for each row that failed, so one bad row does not reject the batch.
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schema.model_validate(row)))
+        except ValidationError as exc:
+            messages = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                for error in exc.errors()
+            )
+            errors.append({"index": index, "status": "invalid", "error": messages})
+    return valid, errors
+
+def bulk_result(results: List[dict]) -> dict:
+    """Summarise per-row results into a BulkResult response."""
+    results = sorted(results, key=lambda result: result["index"])
+    counts = {"created": 0, "updated": 0}
+    for result in results:
+        if result["status"] in counts:
+            counts[result["status"]] += 1
+    return {
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "failed": len(results) - counts["created"] - counts["updated"],
+        "results": results
+    }
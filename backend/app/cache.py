@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+from sqlalchemy import event
+
+class TTLCache:
+    """Bounded least-recently-used cache whose entries expire after ``ttl`` seconds.
+
+    Safe to share between the event loop and threadpool workers.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class TableVersions:
+    """Per-table write counters, bumped once a transaction that wrote the table has committed.
+
+    ``track`` hooks an engine: INSERT/UPDATE/DELETE statements record their
+    table on the connection, and the counters move when the connection goes
+    back to the pool after its commit, never before the data is visible, so a
+    response cached under the current versions can't hold uncommitted state.
+    Counters are per process; other workers' writes are not seen here.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, *tables: str) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def track(self, engine) -> None:
+        """Count committed writes made through a (sync) engine."""
+        event.listen(engine, "after_cursor_execute", self._record_write)
+        event.listen(engine, "commit", self._mark_committed)
+        event.listen(engine, "rollback", self._discard)
+        event.listen(engine.pool, "checkin", self._bump_committed)
+
+    @staticmethod
+    def _record_write(conn, cursor, statement, parameters, context, executemany):
+        if context is None or context.compiled is None:
+            return
+        if context.isinsert or context.isupdate or context.isdelete:
+            table = getattr(context.compiled.statement, "table", None)
+            if table is not None:
+                conn.info.setdefault("written_tables", set()).add(table.name)
+
+    @staticmethod
+    def _mark_committed(conn):
+        # Fires just before the DBAPI commit; the bump waits for checkin
+        written = conn.info.pop("written_tables", None)
+        if written:
+            conn.info.setdefault("committed_tables", set()).update(written)
+
+    @staticmethod
+    def _discard(conn):
+        conn.info.pop("written_tables", None)
+
+    def _bump_committed(self, dbapi_connection, connection_record):
+        committed = connection_record.info.pop("committed_tables", None)
+        if committed:
+            self.bump(committed)
+
+table_versions = TableVersions()
@@ -0,0 +1,255 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, List, Optional, Set
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Delivered to a subscriber that missed events; the client should refetch its lists
+RESET = {"event": "reset"}
+
+class Subscription:
+    """One client's queue of change events, filled from any thread and read on its event loop."""
+
+    def __init__(self, feed: "ChangeFeed", topics: Set[str], loop: asyncio.AbstractEventLoop):
+        self.feed = feed
+        self.topics = topics
+        self.loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=config.CHANGE_FEED_QUEUE_SIZE)
+        self._lost = False
+
+    def put(self, event: dict) -> None:
+        # Runs on self.loop
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._lost = True
+
+    async def get(self) -> dict:
+        """Next event, or RESET when events were dropped because the client fell behind."""
+        if self._lost:
+            self._lost = False
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            return RESET
+        return await self._queue.get()
+
+    def close(self) -> None:
+        self.feed.unsubscribe(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+class ChangeFeedBackend(ABC):
+    """Carries published events to every worker's ChangeFeed.
+
+    ``start`` is called once with the feed's ``dispatch``; ``publish`` must
+    number each event with a ``seq`` shared by all workers and eventually
+    dispatch it, in seq order, in this process and in every other one.
+    """
+
+    def start(self, dispatch: Callable[[dict], None]) -> None:
+        self._dispatch = dispatch
+
+    @abstractmethod
+    def publish(self, events: List[dict]) -> None:
+        """Number and deliver committed events; may return before they are dispatched."""
+
+class MemoryBackend(ChangeFeedBackend):
+    """Single-process backend: publishing numbers events and dispatches them to local subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_seq = 0
+
+    def publish(self, events: List[dict]) -> None:
+        with self._lock:
+            for event in events:
+                self._last_seq += 1
+                self._dispatch({**event, "seq": self._last_seq})
+
+class PostgresBackend(ChangeFeedBackend):
+    """Relays events between workers with PostgreSQL LISTEN/NOTIFY.
+
+    Publishing runs on a single background thread, so it never blocks the
+    caller's event loop. Each batch is numbered from a database sequence and
+    sent as one NOTIFY per event inside one transaction holding an advisory
+    lock, so every worker sees the same seq for an event and receives events
+    in seq order. A daemon thread LISTENs and dispatches every notification,
+    including this process's own. Row data is dropped from events too large
+    for a NOTIFY payload (8000 bytes); clients then refetch that row.
+    """
+
+    channel = "hms_changes"
+    sequence = "hms_change_seq"
+    max_payload = 7900
+
+    def __init__(self, url: str):
+        from sqlalchemy.engine import make_url
+        self.conninfo = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="change-feed-publish")
+        self._connection = None
+
+    def start(self, dispatch: Callable[[dict], None]) -> None:
+        super().start(dispatch)
+        threading.Thread(target=self._listen, name="change-feed-listener", daemon=True).start()
+
+    def _listen(self) -> None:
+        import psycopg
+
+        while True:
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self.channel}")
+                    for notify in conn.notifies():
+                        self._dispatch(json.loads(notify.payload))
+            except Exception:
+                logger.exception("Change feed listener lost its connection; reconnecting")
+                time.sleep(1)
+
+    def _payload(self, event: dict) -> str:
+        payload = json.dumps(event)
+        if len(payload.encode()) > self.max_payload:
+            payload = json.dumps({**event, "data": None})
+        return payload
+
+    def publish(self, events: List[dict]) -> None:
+        self._executor.submit(self._send, events)
+
+    def _connect(self):
+        import psycopg
+
+        if self._connection is None or self._connection.closed:
+            self._connection = psycopg.connect(self.conninfo, autocommit=True)
+            self._connection.execute(f"CREATE SEQUENCE IF NOT EXISTS {self.sequence}")
+        return self._connection
+
+    def _send(self, events: List[dict]) -> None:
+        import psycopg
+
+        for attempt in range(2):
+            try:
+                connection = self._connect()
+                with connection.transaction(), connection.cursor() as cursor:
+                    # Held until commit, so seqs are taken and delivered in the same order
+                    cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (self.sequence,))
+                    cursor.execute(f"SELECT nextval('{self.sequence}') FROM generate_series(1, %s)", (len(events),))
+                    seqs = [row[0] for row in cursor.fetchall()]
+                    cursor.executemany("SELECT pg_notify(%s, %s)", [
+                        (self.channel, self._payload({**event, "seq": seq})) for event, seq in zip(events, seqs)
+                    ])
+                return
+            except psycopg.OperationalError:
+                self._connection = None
+                if attempt:
+                    logger.exception("Could not publish %d change feed events", len(events))
+            except Exception:
+                logger.exception("Could not publish %d change feed events", len(events))
+                return
+
+class ChangeFeed:
+    """Fans committed appointment and admission changes out to streaming clients.
+
+    crud publishes events after each commit; the backend numbers them and
+    delivers them to ``dispatch`` in every worker, which keeps the last
+    CHANGE_FEED_HISTORY for clients resuming with Last-Event-ID and queues
+    them for each subscriber of the topic. A gap in the numbering (a lost
+    listener connection) clears the history and sends RESET to subscribers.
+    """
+
+    def __init__(self, backend: ChangeFeedBackend, history: int = 1000):
+        self._lock = threading.Lock()
+        self._subscribers: Set[Subscription] = set()
+        self._history: Deque[dict] = deque(maxlen=history)
+        self._last_id = 0
+        self._started = False
+        self.backend = backend
+
+    def _ensure_started(self) -> None:
+        if not self._started:
+            with self._lock:
+                if not self._started:
+                    self.backend.start(self.dispatch)
+                    self._started = True
+
+    def publish(self, events: Iterable[dict]) -> None:
+        """Send committed change events ({"topic", "op", "id", "data"}) to every worker.
+
+        Called after commit, so a failure is logged rather than failing the write.
+        """
+        try:
+            events = list(events)
+            if events:
+                self._ensure_started()
+                self.backend.publish(events)
+        except Exception:
+            logger.exception("Could not publish change feed events")
+
+    def dispatch(self, event: dict) -> None:
+        """Record an event numbered by the backend and queue it for matching subscribers."""
+        with self._lock:
+            gap = self._last_id and event["seq"] != self._last_id + 1
+            if gap:
+                self._history.clear()
+            self._last_id = event["seq"]
+            self._history.append(event)
+            subscribers = [
+                sub for sub in self._subscribers if gap or event["topic"] in sub.topics
+            ]
+        for sub in subscribers:
+            try:
+                if gap:
+                    sub.loop.call_soon_threadsafe(sub.put, RESET)
+                if event["topic"] in sub.topics:
+                    sub.loop.call_soon_threadsafe(sub.put, event)
+            except RuntimeError:
+                # The subscriber's event loop has shut down
+                self.unsubscribe(sub)
+
+    def subscribe(self, topics: Iterable[str], last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber on the running event loop.
+
+        With last_event_id, events after it are replayed from history first.
+        RESET comes first when some have already been dropped from history, or
+        when last_event_id is ahead of this worker (it restarted, or the
+        client last read from another worker that has seen more).
+        """
+        self._ensure_started()
+        sub = Subscription(self, set(topics), asyncio.get_running_loop())
+        with self._lock:
+            if last_event_id is not None and last_event_id != self._last_id:
+                missed = [event for event in self._history if event["seq"] > last_event_id]
+                if last_event_id > self._last_id or not missed or missed[0]["seq"] != last_event_id + 1:
+                    sub.put(RESET)
+                for event in missed:
+                    if event["topic"] in sub.topics:
+                        sub.put(event)
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+def create_backend(name: str) -> ChangeFeedBackend:
+    """Backend named by CHANGE_FEED_BACKEND."""
+    if name == "memory":
+        return MemoryBackend()
+    if name == "postgres":
+        return PostgresBackend(config.CHANGE_FEED_URL or config.DATABASE_URL)
+    raise ValueError(f"Unknown CHANGE_FEED_BACKEND {name!r}; expected 'memory' or 'postgres'")
+
+change_feed = ChangeFeed(create_backend(config.CHANGE_FEED_BACKEND), history=config.CHANGE_FEED_HISTORY)
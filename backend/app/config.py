@@ -0,0 +1,77 @@
+import os
+from dotenv import load_dotenv
+
+# Load settings from a .env file in the backend directory, if present
+load_dotenv()
+
+def get_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hospital_management.db")
+DB_ASYNC = get_bool("DB_ASYNC", False)  # Use AsyncSession instead of a thread-offloaded Session
+
+# Authentication
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))  # Max users kept by get_current_user
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # Seconds before a cached user is re-read
+AUTH_TRUST_TOKEN_CLAIMS = get_bool("AUTH_TRUST_TOKEN_CLAIMS", False)  # Build the user from token claims, skipping the users table
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))  # Concurrent bcrypt operations
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))  # Waiting bcrypt jobs before logins get 503
+
+# Database engine profile: "default" or "production" (SQLite pragmas below).
+# Server databases such as PostgreSQL always use the pool settings.
+DB_PROFILE = os.getenv("DB_PROFILE", "default")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_PRE_PING = get_bool("DB_POOL_PRE_PING", True)  # Test connections on checkout; survives DB restarts and failovers
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Replace connections older than this many seconds (-1 disables)
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))  # Page cache per connection
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # Bytes of the file to memory-map
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # Wait this long for a write lock
+
+# Bulk imports
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "10000"))  # Rows accepted by one bulk create/update request
+
+# Exports
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))  # Rows fetched and written per chunk of a streaming export
+
+# Bed occupancy
+BED_INDEX_TTL = float(os.getenv("BED_INDEX_TTL", "30"))  # Seconds before the in-memory bed map is reloaded from the beds table
+
+# Patient search
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "50"))  # Upper bound on the limit of one search request
+
+# Prescription safety
+ALLERGY_CACHE_SIZE = int(os.getenv("ALLERGY_CACHE_SIZE", "4096"))  # Distinct parsed allergy lists and medication names kept
+
+# Allergy and vital sign filters
+CLINICAL_FILTER_MAX_RESULTS = int(os.getenv("CLINICAL_FILTER_MAX_RESULTS", "1000"))  # Upper bound on the limit of one filter request
+
+# Vital sign time series and deterioration board
+VITALS_SERIES_TTL = float(os.getenv("VITALS_SERIES_TTL", "300"))  # Seconds before the in-memory series are reloaded from round_vitals
+VITALS_ROLLING_WINDOW = int(os.getenv("VITALS_ROLLING_WINDOW", "6"))  # Rounds in a rolling mean/standard deviation window
+VITALS_MAX_AGE_HOURS = float(os.getenv("VITALS_MAX_AGE_HOURS", "12"))  # Older readings are not carried into a later round's score
+VITALS_SERIES_MAX_POINTS = int(os.getenv("VITALS_SERIES_MAX_POINTS", "2000"))  # Upper bound on the points of one downsampled series
+
+# Response cache for polled dashboard lists
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))  # Cached responses kept, least recently used evicted
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))  # Seconds a response is reused; bounds staleness across workers
+
+# Fast-path serialization of list routes: comma-separated route names, "*" for all, "" for none
+FAST_SERIALIZATION_ROUTES = {route.strip() for route in os.getenv("FAST_SERIALIZATION_ROUTES", "*").split(",") if route.strip()}
+
+# Metrics and slow-query log
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))  # Statements at least this slow are logged with their SQL text
+SLOW_QUERY_LOG_CHARS = int(os.getenv("SLOW_QUERY_LOG_CHARS", "2000"))  # Longer statements are truncated in the log
+
+# Change feed (server-sent events for appointments and admissions)
+CHANGE_FEED_BACKEND = os.getenv("CHANGE_FEED_BACKEND", "memory")  # "memory" for one worker, "postgres" (LISTEN/NOTIFY) for several
+CHANGE_FEED_URL = os.getenv("CHANGE_FEED_URL", "")  # PostgreSQL URL for the postgres backend; defaults to DATABASE_URL
+CHANGE_FEED_HISTORY = int(os.getenv("CHANGE_FEED_HISTORY", "1000"))  # Recent events kept for clients resuming with Last-Event-ID
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "1000"))  # Events buffered per client before it is sent a reset
+CHANGE_FEED_KEEPALIVE = float(os.getenv("CHANGE_FEED_KEEPALIVE", "15"))  # Seconds between keepalive comments on an idle stream
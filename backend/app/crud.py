@@ -1,9 +1,258 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import List, Optional
-from datetime import datetime, date
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, func, insert, literal, literal_column, select, tuple_, union_all, update, delete, String, column as sql_column, table as sql_table
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, date, time, timedelta
+import re
 import uuid
 from . import models, schemas
+from .allergies import allergy_checker, normalize as normalize_allergen
+from .beds import BedKey, BedOccupiedError, bed_index
+from .change_feed import change_feed
+from .pagination import CursorKey, paginate
+from .vitals import VITAL_COLUMNS, parse_vital_signs
+from .vitals_series import record_vitals_write, vitals_series
+
+# Single-statement write helpers
+def update_by_id(db: Session, model, obj_id, values: dict):
+    """Run UPDATE ... WHERE id = :id and return the updated row, or None if no row matched.
+
+    Uses RETURNING where the database supports it, so the write is one round trip.
+    Rows counted in the doctor workload summary first read their old key when
+    the update can move them to another doctor, day or status.
+    """
+    if not values:
+        return db.get(model, obj_id)
+    tracked = model in WORKLOAD_SOURCES and bool(values.keys() & WORKLOAD_FIELDS)
+    if tracked:
+        db_old = db.query(model).filter(model.id == obj_id).with_for_update().first()
+        if db_old is None:
+            return None
+        old_key = workload_key(model, db_old)
+    stmt = update(model).where(model.id == obj_id).values(**values)
+    if db.get_bind().dialect.update_returning:
+        db_obj = db.execute(stmt.returning(model)).scalars().first()
+    else:
+        result = db.execute(stmt)
+        db_obj = db.get(model, obj_id) if result.rowcount else None
+    if tracked and db_obj is not None:
+        record_workload(db, [(old_key, -1), (workload_key(model, db_obj), 1)])
+    if db_obj is not None and model in SEARCH_SOURCES and values.keys() & SEARCH_SOURCES[model][2]:
+        index_search_rows(db, model, [db_obj])
+    if db_obj is not None and model in PARSED_SOURCES and values.keys() & PARSED_SOURCES[model]:
+        index_parsed_rows(db, model, [db_obj])
+    db.commit()
+    if db_obj is not None:
+        publish_changes(model, "updated", [db_obj])
+    return db_obj
+
+def delete_by_id(db: Session, model, obj_id) -> bool:
+    """Run DELETE ... WHERE id = :id. Only for models without ORM cascades to children."""
+    stmt = delete(model).where(model.id == obj_id)
+    if model not in WORKLOAD_SOURCES:
+        deleted = db.execute(stmt).rowcount > 0
+    else:
+        columns = [getattr(model, field) for field in WORKLOAD_FIELDS if hasattr(model, field)]
+        if db.get_bind().dialect.delete_returning:
+            row = db.execute(stmt.returning(*columns)).first()
+        else:
+            row = db.query(*columns).filter(model.id == obj_id).first()
+            db.execute(stmt)
+        deleted = row is not None
+        if deleted:
+            record_workload(db, [(workload_key(model, row), -1)])
+    db.commit()
+    if deleted:
+        publish_changes(model, "deleted", [obj_id])
+    return deleted
+
+# Doctor workload summary, maintained in the same transaction as each write
+WorkloadKey = Tuple[str, date, str, str]  # (doctor_id, day, kind, status)
+
+# Rows counted in doctor_daily_workload: model -> (kind, status column)
+WORKLOAD_SOURCES = {
+    models.OutPatientVisit: ("visit", None),
+    models.InPatientRound: ("round", None),
+    models.OutPatientAppointment: ("appointment", "status"),
+}
+WORKLOAD_FIELDS = {"doctor_id", "date", "status"}
+
+def workload_key(model, row) -> Optional[WorkloadKey]:
+    """Summary key a visit, round or appointment (object, row or dict) is counted under."""
+    kind, status_field = WORKLOAD_SOURCES[model]
+    get = row.get if isinstance(row, dict) else lambda field: getattr(row, field, None)
+    doctor_id, when = get("doctor_id"), get("date")
+    if not doctor_id or when is None:
+        return None
+    status = get(status_field) if status_field else None
+    day = when.date() if isinstance(when, datetime) else when
+    return (doctor_id, day, kind, getattr(status, "value", status) or "")
+
+def record_workload(db: Session, changes) -> None:
+    """Apply (key, delta) count changes to doctor_daily_workload with one upsert; the caller commits."""
+    totals = {}
+    for key, delta in changes:
+        if key is not None:
+            totals[key] = totals.get(key, 0) + delta
+    # Sorted so concurrent writers lock summary rows in the same order
+    rows = [
+        {"doctor_id": doctor_id, "day": day, "kind": kind, "status": status, "count": delta}
+        for (doctor_id, day, kind, status), delta in sorted(totals.items()) if delta
+    ]
+    if not rows:
+        return
+    table = models.DoctorDailyWorkload.__table__
+    upsert = postgresql_insert(table) if db.get_bind().dialect.name == "postgresql" else sqlite_insert(table)
+    db.execute(upsert.on_conflict_do_update(
+        index_elements=[table.c.doctor_id, table.c.day, table.c.kind, table.c.status],
+        set_={"count": table.c.count + upsert.excluded.count}
+    ), rows)
+
+# Patient search documents, rewritten in the same transaction as each write
+# Rows whose text is searchable: model -> (patient kind, patient id field, fields copied into the document)
+SEARCH_SOURCES = {
+    models.OutPatient: ("out-patient", "id", {"name", "phone", "email"}),
+    models.InPatient: ("in-patient", "id", {"name", "phone", "email", "admission_diagnosis", "discharge_diagnosis"}),
+    models.OutPatientVisit: ("out-patient", "patient_id", {"diagnosis"}),
+    models.InPatientRound: ("in-patient", "patient_id", {"diagnosis"}),
+}
+# Patient kind -> (patient model, history model, patient fields holding diagnoses)
+SEARCH_PATIENTS = {
+    "out-patient": (models.OutPatient, models.OutPatientVisit, ()),
+    "in-patient": (models.InPatient, models.InPatientRound, ("admission_diagnosis", "discharge_diagnosis")),
+}
+
+def search_documents(db: Session, kind: str):
+    """SELECT of the search document of every patient of one kind, for INSERT ... SELECT."""
+    patient, history, diagnosis_fields = SEARCH_PATIENTS[kind]
+    if db.get_bind().dialect.name == "sqlite":
+        joined = func.group_concat(history.diagnosis, " ", type_=String)
+    else:
+        joined = func.string_agg(history.diagnosis, " ", type_=String)
+    diagnoses = func.coalesce(select(joined).where(history.patient_id == patient.id).scalar_subquery(), "")
+    for field in diagnosis_fields:
+        diagnoses = func.coalesce(getattr(patient, field), "") + " " + diagnoses
+    phone_digits = patient.phone
+    for char in "-() .+":
+        phone_digits = func.replace(phone_digits, char, "")
+    return select(literal(kind, String), patient.id, patient.name, patient.phone, phone_digits, patient.email, diagnoses)
+
+def index_patients(db: Session, kind: str, patient_ids, replace: bool = True) -> None:
+    """Rewrite the search documents of some patients from their flushed rows; the caller commits.
+
+    replace=False skips deleting old documents, for patients created in this transaction.
+    """
+    ids = {patient_id for patient_id in patient_ids if patient_id}
+    if not ids:
+        return
+    table = models.PatientSearchDocument.__table__
+    if replace:
+        db.execute(delete(table).where(table.c.kind == kind, table.c.patient_id.in_(ids)))
+    db.execute(insert(table).from_select(
+        ["kind", "patient_id", "name", "phone", "phone_digits", "email", "diagnoses"],
+        search_documents(db, kind).where(SEARCH_PATIENTS[kind][0].id.in_(ids))
+    ))
+
+def index_search_rows(db: Session, model, rows, created: bool = False) -> None:
+    """Rewrite the search documents of the patients written rows (objects or dicts) belong to."""
+    kind, id_field, _ = SEARCH_SOURCES[model]
+    get = (lambda row: row.get(id_field)) if rows and isinstance(rows[0], dict) else (lambda row: getattr(row, id_field))
+    index_patients(db, kind, [get(row) for row in rows], replace=not (created and id_field == "id"))
+
+def unindex_patient(db: Session, kind: str, patient_id: str) -> None:
+    """Remove a deleted patient's search document, allergy rows and, for in-patients, round vitals."""
+    table = models.PatientSearchDocument.__table__
+    db.execute(delete(table).where(table.c.kind == kind, table.c.patient_id == patient_id))
+    allergies = models.PatientAllergy.__table__
+    db.execute(delete(allergies).where(allergies.c.kind == kind, allergies.c.patient_id == patient_id))
+    if kind == "in-patient":
+        db.execute(delete(models.RoundVitals).where(models.RoundVitals.patient_id == patient_id))
+        record_vitals_write(db, [patient_id])
+
+# Allergies and vital signs parsed out of JSON text into indexed tables, rewritten in the same transaction as each write
+# Rows holding the JSON: model -> fields whose change rewrites the parsed rows
+PARSED_SOURCES = {
+    models.OutPatient: {"allergies"},
+    models.InPatient: {"allergies"},
+    models.InPatientRound: {"vital_signs", "patient_id", "date"},
+}
+
+def allergy_rows(kind: str, patient_id: str, allergies: Optional[str]) -> List[dict]:
+    """patient_allergies rows for a patient's allergies JSON, one per distinct allergen."""
+    rows = {}
+    for name, allergen, drug_class in allergy_checker.patient_allergies(allergies):
+        rows.setdefault(allergen, {
+            "kind": kind, "patient_id": patient_id, "name": name, "allergen": allergen, "drug_class": drug_class
+        })
+    return list(rows.values())
+
+def vitals_row(round_id: str, patient_id: str, when: Optional[datetime], vital_signs: Optional[str]) -> Optional[dict]:
+    """round_vitals row for a round's vital_signs JSON, or None when it holds no readings."""
+    readings = parse_vital_signs(vital_signs)
+    if not readings or when is None:
+        return None
+    return {"round_id": round_id, "patient_id": patient_id, "date": when, **{column: readings.get(column) for column in VITAL_COLUMNS}}
+
+def index_allergies(db: Session, kind: str, patients, replace: bool = True) -> None:
+    """Rewrite the allergy rows of (patient_id, allergies JSON) pairs; the caller commits."""
+    table = models.PatientAllergy.__table__
+    if replace and patients:
+        db.execute(delete(table).where(table.c.kind == kind, table.c.patient_id.in_({patient_id for patient_id, _ in patients})))
+    rows = [row for patient_id, allergies in patients for row in allergy_rows(kind, patient_id, allergies)]
+    if rows:
+        db.execute(insert(table), rows)
+
+def index_vitals(db: Session, rounds, replace: bool = True) -> None:
+    """Rewrite the vitals rows of (round_id, patient_id, date, vital_signs JSON) tuples; the caller commits."""
+    table = models.RoundVitals.__table__
+    if replace and rounds:
+        round_ids = {round_id for round_id, *_ in rounds}
+        # A round moved to another patient leaves the first one's series too
+        record_vitals_write(db, db.execute(select(table.c.patient_id).where(table.c.round_id.in_(round_ids))).scalars())
+        db.execute(delete(table).where(table.c.round_id.in_(round_ids)))
+    rows = [row for row in (vitals_row(*round_values) for round_values in rounds) if row is not None]
+    if rows:
+        db.execute(insert(table), rows)
+        record_vitals_write(db, {row["patient_id"] for row in rows})
+
+def index_parsed_rows(db: Session, model, rows, created: bool = False) -> None:
+    """Rewrite the parsed allergy or vitals rows of written patients or rounds (objects or dicts)."""
+    if not rows:
+        return
+    get = (lambda row, field: row.get(field)) if isinstance(rows[0], dict) else (lambda row, field: getattr(row, field))
+    if model is models.InPatientRound:
+        index_vitals(db, [
+            (get(row, "id"), get(row, "patient_id"), get(row, "date"), get(row, "vital_signs")) for row in rows
+        ], replace=not created)
+    else:
+        index_allergies(db, SEARCH_SOURCES[model][0], [(get(row, "id"), get(row, "allergies")) for row in rows], replace=not created)
+
+# Change feed, published to after each commit: model -> (topic, schema of the event data)
+FEED_SOURCES = {
+    models.OutPatientAppointment: ("appointments", schemas.OutPatientAppointment),
+    models.InPatientAdmission: ("admissions", schemas.InPatientAdmission),
+}
+
+def fetch_feed_rows(db: Session, model, ids: List[str]) -> list:
+    """Rows written by a bulk statement, read back before commit for publish_changes."""
+    if model not in FEED_SOURCES or not ids:
+        return []
+    return db.query(model).filter(model.id.in_(ids)).all()
+
+def publish_changes(model, op: str, rows) -> None:
+    """Publish committed writes to the change feed: created/updated rows, or deleted ids."""
+    if model not in FEED_SOURCES or not rows:
+        return
+    topic, schema = FEED_SOURCES[model]
+    if op == "deleted":
+        change_feed.publish({"topic": topic, "op": op, "id": row_id, "data": None} for row_id in rows)
+    else:
+        change_feed.publish(
+            {"topic": topic, "op": op, "id": row.id, "data": schema.model_validate(row).model_dump(mode="json")}
+            for row in rows
+        )
 
 # User CRUD operations
 def get_user(db: Session, user_id: str) -> Optional[models.User]:
@@ -12,12 +261,17 @@ def get_user(db: Session, user_id: str) -> Optional[models.User]:
 def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[models.User]:
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_user_roles(db: Session) -> Dict[str, Tuple[str, str]]:
+    """(email, role) of every user by id, for checking trusted token claims."""
+    return {user_id: (email, role) for user_id, email, role in db.query(models.User.id, models.User.email, models.User.role)}
 
-def create_user(db: Session, user: schemas.UserCreate) -> models.User:
-    from .auth import get_password_hash
-    hashed_password = get_password_hash(user.password)
+def get_users(db: Session, after: Optional[CursorKey] = None, limit: int = 100, columns=None) -> dict:
+    return paginate(db.query(models.User), models.User, after=after, limit=limit, columns=columns)
+
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: Optional[str] = None) -> models.User:
+    if hashed_password is None:
+        from .auth import get_password_hash
+        hashed_password = get_password_hash(user.password)
     db_user = models.User(
         id=str(uuid.uuid4()),
         name=user.name,
@@ -27,39 +281,55 @@ def create_user(db: Session, user: schemas.UserCreate) -> models.User:
     )
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     return db_user
 
-def update_user(db: Session, user_id: str, user_update: schemas.UserUpdate) -> Optional[models.User]:
+def update_user(db: Session, user_id: str, user_update: schemas.UserUpdate, hashed_password: Optional[str] = None) -> Optional[models.User]:
     db_user = get_user(db, user_id)
     if not db_user:
         return None
     
+    previous_email = db_user.email
     update_data = user_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         if field == "password":
-            from .auth import get_password_hash
-            value = get_password_hash(value)
+            if hashed_password is None:
+                from .auth import get_password_hash
+                hashed_password = get_password_hash(value)
+            value = hashed_password
         setattr(db_user, field, value)
     
     db.commit()
-    db.refresh(db_user)
+    from .auth import invalidate_cached_user
+    invalidate_cached_user(previous_email)
+    invalidate_cached_user(db_user.email)
     return db_user
 
 def delete_user(db: Session, user_id: str) -> bool:
     db_user = get_user(db, user_id)
     if not db_user:
         return False
+    # The doctor's visits, rounds and appointments are detached (doctor_id set to NULL)
+    db.execute(delete(models.DoctorDailyWorkload).where(models.DoctorDailyWorkload.doctor_id == user_id))
     db.delete(db_user)
     db.commit()
+    from .auth import invalidate_cached_user
+    invalidate_cached_user(db_user.email)
     return True
 
 # Out-Patient CRUD operations
 def get_out_patient(db: Session, patient_id: str) -> Optional[models.OutPatient]:
     return db.query(models.OutPatient).filter(models.OutPatient.id == patient_id).first()
 
-def get_out_patients(db: Session, skip: int = 0, limit: int = 100) -> List[models.OutPatient]:
-    return db.query(models.OutPatient).offset(skip).limit(limit).all()
+def get_out_patient_chart(db: Session, patient_id: str) -> Optional[models.OutPatient]:
+    # Three queries (patient, visits joined with medications, appointments) however
+    # long the history; a nested selectinload would split into batches of 500 visits
+    return db.query(models.OutPatient).options(
+        selectinload(models.OutPatient.visits).joinedload(models.OutPatientVisit.medications),
+        selectinload(models.OutPatient.appointments)
+    ).filter(models.OutPatient.id == patient_id).first()
+
+def get_out_patients(db: Session, after: Optional[CursorKey] = None, limit: int = 100, columns=None) -> dict:
+    return paginate(db.query(models.OutPatient), models.OutPatient, after=after, limit=limit, columns=columns)
 
 def get_out_patients_by_doctor(db: Session, doctor_id: str) -> List[models.OutPatient]:
     return db.query(models.OutPatient).join(models.OutPatientVisit).filter(
@@ -72,40 +342,46 @@ def create_out_patient(db: Session, patient: schemas.OutPatientCreate) -> models
         **patient.dict()
     )
     db.add(db_patient)
+    db.flush()
+    index_search_rows(db, models.OutPatient, [db_patient], created=True)
+    index_parsed_rows(db, models.OutPatient, [db_patient], created=True)
     db.commit()
-    db.refresh(db_patient)
     return db_patient
 
 def update_out_patient(db: Session, patient_id: str, patient_update: schemas.OutPatientUpdate) -> Optional[models.OutPatient]:
-    db_patient = get_out_patient(db, patient_id)
-    if not db_patient:
-        return None
-    
-    update_data = patient_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_patient, field, value)
-    
-    db.commit()
-    db.refresh(db_patient)
-    return db_patient
+    return update_by_id(db, models.OutPatient, patient_id, patient_update.dict(exclude_unset=True))
 
 def delete_out_patient(db: Session, patient_id: str) -> bool:
     db_patient = get_out_patient(db, patient_id)
     if not db_patient:
         return False
+    # Visits and appointments go with the patient (ORM cascade)
+    record_workload(db, [(workload_key(models.OutPatientVisit, visit), -1) for visit in db_patient.visits] + [
+        (workload_key(models.OutPatientAppointment, appointment), -1) for appointment in db_patient.appointments
+    ])
+    unindex_patient(db, "out-patient", patient_id)
+    appointment_ids = [appointment.id for appointment in db_patient.appointments]
     db.delete(db_patient)
     db.commit()
+    publish_changes(models.OutPatientAppointment, "deleted", appointment_ids)
     return True
 
 # In-Patient CRUD operations
 def get_in_patient(db: Session, patient_id: str) -> Optional[models.InPatient]:
     return db.query(models.InPatient).filter(models.InPatient.id == patient_id).first()
 
-def get_in_patients(db: Session, skip: int = 0, limit: int = 100) -> List[models.InPatient]:
-    return db.query(models.InPatient).offset(skip).limit(limit).all()
+def get_in_patient_chart(db: Session, patient_id: str) -> Optional[models.InPatient]:
+    # Three queries (patient, rounds joined with medications, admissions) however long the history
+    return db.query(models.InPatient).options(
+        selectinload(models.InPatient.rounds).joinedload(models.InPatientRound.medications),
+        selectinload(models.InPatient.admissions)
+    ).filter(models.InPatient.id == patient_id).first()
 
-def get_admitted_in_patients(db: Session) -> List[models.InPatient]:
-    return db.query(models.InPatient).filter(models.InPatient.status == "admitted").all()
+def get_in_patients(db: Session, after: Optional[CursorKey] = None, limit: int = 100, columns=None) -> dict:
+    return paginate(db.query(models.InPatient), models.InPatient, after=after, limit=limit, columns=columns)
+
+def get_admitted_in_patients(db: Session, columns=None) -> List[models.InPatient]:
+    return db.query(*(columns or [models.InPatient])).filter(models.InPatient.status == "admitted").all()
 
 def get_in_patients_by_ward(db: Session, ward_type: str) -> List[models.InPatient]:
     return db.query(models.InPatient).filter(
@@ -121,51 +397,77 @@ def create_in_patient(db: Session, patient: schemas.InPatientCreate) -> models.I
         **patient.dict()
     )
     db.add(db_patient)
+    db.flush()
+    changes = []
+    key = bed_key(db_patient)
+    if key is not None:
+        try:
+            occupy_bed(db, db_patient.id, key)
+        except BedOccupiedError:
+            db.rollback()
+            raise
+        changes.append((key, db_patient.id))
+    index_search_rows(db, models.InPatient, [db_patient], created=True)
+    index_parsed_rows(db, models.InPatient, [db_patient], created=True)
     db.commit()
-    db.refresh(db_patient)
+    bed_index.apply(changes)
     return db_patient
 
-def update_in_patient(db: Session, patient_id: str, patient_update: schemas.InPatientUpdate) -> Optional[models.InPatient]:
-    db_patient = get_in_patient(db, patient_id)
-    if not db_patient:
+def update_in_patient_fields(db: Session, patient_id: str, values: dict) -> Optional[models.InPatient]:
+    """update_by_id for in-patients that also moves their bed when ward, room, bed or status change."""
+    if not values.keys() & BED_FIELDS:
+        return update_by_id(db, models.InPatient, patient_id, values)
+    db_patient = db.query(models.InPatient).filter(models.InPatient.id == patient_id).with_for_update().first()
+    if db_patient is None:
         return None
-    
-    update_data = patient_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
+    for field, value in values.items():
         setattr(db_patient, field, value)
-    
-    db.commit()
-    db.refresh(db_patient)
+    try:
+        changes = reassign_bed(db, patient_id, bed_key(db_patient))
+        if values.keys() & SEARCH_SOURCES[models.InPatient][2]:
+            db.flush()
+            index_search_rows(db, models.InPatient, [db_patient])
+        if values.keys() & PARSED_SOURCES[models.InPatient]:
+            index_parsed_rows(db, models.InPatient, [db_patient])
+        db.commit()
+    except BedOccupiedError:
+        db.rollback()
+        raise
+    bed_index.apply(changes)
     return db_patient
 
+def update_in_patient(db: Session, patient_id: str, patient_update: schemas.InPatientUpdate) -> Optional[models.InPatient]:
+    return update_in_patient_fields(db, patient_id, patient_update.dict(exclude_unset=True))
+
 def discharge_in_patient(db: Session, patient_id: str, discharge_diagnosis: str, discharge_doctor_id: str) -> Optional[models.InPatient]:
-    db_patient = get_in_patient(db, patient_id)
-    if not db_patient:
-        return None
-    
-    db_patient.status = "discharged"
-    db_patient.discharge_date = datetime.utcnow()
-    db_patient.discharge_diagnosis = discharge_diagnosis
-    db_patient.discharge_doctor_id = discharge_doctor_id
-    
-    db.commit()
-    db.refresh(db_patient)
-    return db_patient
+    return update_in_patient_fields(db, patient_id, {
+        "status": "discharged",
+        "discharge_date": datetime.utcnow(),
+        "discharge_diagnosis": discharge_diagnosis,
+        "discharge_doctor_id": discharge_doctor_id
+    })
 
 def delete_in_patient(db: Session, patient_id: str) -> bool:
     db_patient = get_in_patient(db, patient_id)
     if not db_patient:
         return False
+    # Rounds go with the patient (ORM cascade)
+    record_workload(db, [(workload_key(models.InPatientRound, round_obj), -1) for round_obj in db_patient.rounds])
+    changes = reassign_bed(db, patient_id, None)
+    unindex_patient(db, "in-patient", patient_id)
+    admission_ids = [admission.id for admission in db_patient.admissions]
     db.delete(db_patient)
     db.commit()
+    bed_index.apply(changes)
+    publish_changes(models.InPatientAdmission, "deleted", admission_ids)
     return True
 
 # Out-Patient Visit CRUD operations
 def get_out_patient_visit(db: Session, visit_id: str) -> Optional[models.OutPatientVisit]:
     return db.query(models.OutPatientVisit).filter(models.OutPatientVisit.id == visit_id).first()
 
-def get_out_patient_visits(db: Session, skip: int = 0, limit: int = 100) -> List[models.OutPatientVisit]:
-    return db.query(models.OutPatientVisit).offset(skip).limit(limit).all()
+def get_out_patient_visits(db: Session, after: Optional[CursorKey] = None, limit: int = 100) -> dict:
+    return paginate(db.query(models.OutPatientVisit), models.OutPatientVisit, after=after, limit=limit)
 
 def get_out_patient_visits_by_patient(db: Session, patient_id: str) -> List[models.OutPatientVisit]:
     return db.query(models.OutPatientVisit).filter(
@@ -177,34 +479,51 @@ def get_out_patient_visits_by_doctor(db: Session, doctor_id: str) -> List[models
         models.OutPatientVisit.doctor_id == doctor_id
     ).order_by(models.OutPatientVisit.date.desc()).all()
 
-def create_out_patient_visit(db: Session, visit: schemas.OutPatientVisitCreate) -> models.OutPatientVisit:
+def get_out_patient_visit_with_medications(db: Session, visit_id: str) -> Optional[models.OutPatientVisit]:
+    return db.query(models.OutPatientVisit).options(selectinload(models.OutPatientVisit.medications)).filter(
+        models.OutPatientVisit.id == visit_id
+    ).first()
+
+def create_out_patient_visit(
+    db: Session,
+    visit: schemas.OutPatientVisitCreate,
+    medications: List[schemas.OutPatientMedicationLine] = ()
+) -> Optional[models.OutPatientVisit]:
+    """Create a visit with its prescriptions in one transaction; None if the out-patient does not exist.
+
+    The visit and every medication line go out in a single flush, so the
+    lines are one batched INSERT and one commit rather than one per line.
+    """
+    db_patient = db.get(models.OutPatient, visit.patient_id)
+    if db_patient is None:
+        return None
     db_visit = models.OutPatientVisit(
         id=f"opv-{str(uuid.uuid4())[:8]}",
-        **visit.dict()
+        **visit.dict(exclude={"medications"})
     )
+    db_visit.medications = [
+        models.OutPatientMedication(patient_id=visit.patient_id, **line.dict(exclude={"visit_id"}))
+        for line in medications
+    ]
+    check_allergies(db_patient.allergies, db_visit.medications)
     db.add(db_visit)
+    record_workload(db, [(workload_key(models.OutPatientVisit, db_visit), 1)])
+    db.flush()
+    index_search_rows(db, models.OutPatientVisit, [db_visit])
     db.commit()
-    db.refresh(db_visit)
     return db_visit
 
 def update_out_patient_visit(db: Session, visit_id: str, visit_update: schemas.OutPatientVisitUpdate) -> Optional[models.OutPatientVisit]:
-    db_visit = get_out_patient_visit(db, visit_id)
-    if not db_visit:
-        return None
-    
-    update_data = visit_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_visit, field, value)
-    
-    db.commit()
-    db.refresh(db_visit)
-    return db_visit
+    return update_by_id(db, models.OutPatientVisit, visit_id, visit_update.dict(exclude_unset=True))
 
 def delete_out_patient_visit(db: Session, visit_id: str) -> bool:
     db_visit = get_out_patient_visit(db, visit_id)
     if not db_visit:
         return False
+    record_workload(db, [(workload_key(models.OutPatientVisit, db_visit), -1)])
     db.delete(db_visit)
+    db.flush()
+    index_search_rows(db, models.OutPatientVisit, [db_visit])
     db.commit()
     return True
 
@@ -212,8 +531,8 @@ def delete_out_patient_visit(db: Session, visit_id: str) -> bool:
 def get_in_patient_round(db: Session, round_id: str) -> Optional[models.InPatientRound]:
     return db.query(models.InPatientRound).filter(models.InPatientRound.id == round_id).first()
 
-def get_in_patient_rounds(db: Session, skip: int = 0, limit: int = 100) -> List[models.InPatientRound]:
-    return db.query(models.InPatientRound).offset(skip).limit(limit).all()
+def get_in_patient_rounds(db: Session, after: Optional[CursorKey] = None, limit: int = 100) -> dict:
+    return paginate(db.query(models.InPatientRound), models.InPatientRound, after=after, limit=limit)
 
 def get_in_patient_rounds_by_patient(db: Session, patient_id: str) -> List[models.InPatientRound]:
     return db.query(models.InPatientRound).filter(
@@ -225,37 +544,68 @@ def get_in_patient_rounds_by_doctor(db: Session, doctor_id: str) -> List[models.
         models.InPatientRound.doctor_id == doctor_id
     ).order_by(models.InPatientRound.date.desc()).all()
 
-def create_in_patient_round(db: Session, round_data: schemas.InPatientRoundCreate) -> models.InPatientRound:
+def get_in_patient_round_with_medications(db: Session, round_id: str) -> Optional[models.InPatientRound]:
+    return db.query(models.InPatientRound).options(selectinload(models.InPatientRound.medications)).filter(
+        models.InPatientRound.id == round_id
+    ).first()
+
+def create_in_patient_round(
+    db: Session,
+    round_data: schemas.InPatientRoundCreate,
+    medications: List[schemas.InPatientMedicationLine] = ()
+) -> Optional[models.InPatientRound]:
+    """Create a round with its medications in one transaction; None if the in-patient does not exist.
+
+    As for visits, the round and its medication lines are written by one flush.
+    """
+    db_patient = db.get(models.InPatient, round_data.patient_id)
+    if db_patient is None:
+        return None
     db_round = models.InPatientRound(
         id=f"ipr-{str(uuid.uuid4())[:8]}",
-        **round_data.dict()
+        **round_data.dict(exclude={"medications"})
     )
+    db_round.medications = [
+        models.InPatientMedication(**line.dict(exclude={"round_id"}, exclude_none=True))  # Unset start_date takes the server default
+        for line in medications
+    ]
+    check_allergies(db_patient.allergies, db_round.medications)
     db.add(db_round)
+    record_workload(db, [(workload_key(models.InPatientRound, db_round), 1)])
+    db.flush()
+    index_search_rows(db, models.InPatientRound, [db_round])
+    index_parsed_rows(db, models.InPatientRound, [db_round], created=True)
     db.commit()
-    db.refresh(db_round)
     return db_round
 
 def update_in_patient_round(db: Session, round_id: str, round_update: schemas.InPatientRoundUpdate) -> Optional[models.InPatientRound]:
-    db_round = get_in_patient_round(db, round_id)
-    if not db_round:
-        return None
-    
-    update_data = round_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_round, field, value)
-    
-    db.commit()
-    db.refresh(db_round)
-    return db_round
+    return update_by_id(db, models.InPatientRound, round_id, round_update.dict(exclude_unset=True))
 
 def delete_in_patient_round(db: Session, round_id: str) -> bool:
     db_round = get_in_patient_round(db, round_id)
     if not db_round:
         return False
+    record_workload(db, [(workload_key(models.InPatientRound, db_round), -1)])
     db.delete(db_round)
+    db.flush()
+    index_search_rows(db, models.InPatientRound, [db_round])
+    db.execute(delete(models.RoundVitals).where(models.RoundVitals.round_id == db_round.id))
+    record_vitals_write(db, [db_round.patient_id])
     db.commit()
     return True
 
+# Prescription safety
+def check_allergies(allergies: Optional[str], db_medications) -> None:
+    """Set allergy_warnings on new medication rows from the patient's allergies JSON.
+
+    The warnings are not stored: create endpoints return them with the
+    medications so the prescriber sees them, and the prescription is saved
+    either way.
+    """
+    warnings = allergy_checker.check_many(allergies, [db_medication.name for db_medication in db_medications])
+    for db_medication, medication_warnings in zip(db_medications, warnings):
+        db_medication.allergy_warnings = medication_warnings
+
 # Out-Patient Medication CRUD operations
 def get_out_patient_medication(db: Session, medication_id: int) -> Optional[models.OutPatientMedication]:
     return db.query(models.OutPatientMedication).filter(models.OutPatientMedication.id == medication_id).first()
@@ -265,33 +615,36 @@ def get_out_patient_medications_by_visit(db: Session, visit_id: str) -> List[mod
         models.OutPatientMedication.visit_id == visit_id
     ).all()
 
-def create_out_patient_medication(db: Session, medication: schemas.OutPatientMedicationCreate) -> models.OutPatientMedication:
-    db_medication = models.OutPatientMedication(**medication.dict())
-    db.add(db_medication)
+def create_out_patient_medications(
+    db: Session,
+    visit_id: str,
+    medications: List[schemas.OutPatientMedicationLine]
+) -> Optional[List[models.OutPatientMedication]]:
+    """Add prescription lines to an existing visit with one batched INSERT; None if the visit does not exist."""
+    patient = db.query(models.OutPatientVisit.patient_id, models.OutPatient.allergies).join(
+        models.OutPatient, models.OutPatient.id == models.OutPatientVisit.patient_id
+    ).filter(models.OutPatientVisit.id == visit_id).first()
+    if patient is None:
+        return None
+    db_medications = [
+        models.OutPatientMedication(visit_id=visit_id, patient_id=patient.patient_id, **line.dict(exclude={"visit_id"}))
+        for line in medications
+    ]
+    check_allergies(patient.allergies, db_medications)
+    db.add_all(db_medications)
     db.commit()
-    db.refresh(db_medication)
-    return db_medication
+    return db_medications
+
+def create_out_patient_medication(db: Session, medication: schemas.OutPatientMedicationCreate) -> Optional[models.OutPatientMedication]:
+    # patient_id is required by the table but taken from the visit rather than the request
+    db_medications = create_out_patient_medications(db, medication.visit_id, [medication])
+    return db_medications[0] if db_medications else None
 
 def update_out_patient_medication(db: Session, medication_id: int, medication_update: schemas.OutPatientMedicationUpdate) -> Optional[models.OutPatientMedication]:
-    db_medication = get_out_patient_medication(db, medication_id)
-    if not db_medication:
-        return None
-    
-    update_data = medication_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_medication, field, value)
-    
-    db.commit()
-    db.refresh(db_medication)
-    return db_medication
+    return update_by_id(db, models.OutPatientMedication, medication_id, medication_update.dict(exclude_unset=True))
 
 def delete_out_patient_medication(db: Session, medication_id: int) -> bool:
-    db_medication = get_out_patient_medication(db, medication_id)
-    if not db_medication:
-        return False
-    db.delete(db_medication)
-    db.commit()
-    return True
+    return delete_by_id(db, models.OutPatientMedication, medication_id)
 
 # In-Patient Medication CRUD operations
 def get_in_patient_medication(db: Session, medication_id: int) -> Optional[models.InPatientMedication]:
@@ -306,56 +659,131 @@ def get_active_in_patient_medications(db: Session, patient_id: str) -> List[mode
     return db.query(models.InPatientMedication).join(models.InPatientRound).filter(
         and_(
             models.InPatientRound.patient_id == patient_id,
-            models.InPatientMedication.status == "active"
+            models.ACTIVE_IN_PATIENT_MEDICATION
         )
     ).all()
 
-def create_in_patient_medication(db: Session, medication: schemas.InPatientMedicationCreate) -> models.InPatientMedication:
-    db_medication = models.InPatientMedication(**medication.dict())
-    db.add(db_medication)
+def medication_administration_query(ward_type: Optional[str] = None):
+    """SELECT of the active medications of every admitted patient, in one ward or the whole hospital.
+
+    Columns match schemas.MedicationAdministration. Admitted patients come
+    from the ward/status index and their active prescriptions from the
+    partial index on in_patient_medications, so discontinued and completed
+    history is never read.
+    """
+    patient = models.InPatient
+    medication = models.InPatientMedication
+    query = select(
+        patient.id.label("patient_id"),
+        patient.name.label("patient_name"),
+        patient.ward_type,
+        patient.room_number,
+        patient.bed_number,
+        medication.id.label("medication_id"),
+        medication.round_id,
+        medication.name,
+        medication.dosage,
+        medication.frequency,
+        medication.route,
+        medication.start_date,
+        medication.end_date
+    ).join(
+        models.InPatientRound, models.InPatientRound.patient_id == patient.id
+    ).join(
+        medication, medication.round_id == models.InPatientRound.id
+    ).where(
+        patient.status == "admitted",
+        models.ACTIVE_IN_PATIENT_MEDICATION
+    )
+    if ward_type is not None:
+        query = query.where(patient.ward_type == ward_type)
+    return query
+
+def _bed_order(row) -> tuple:
+    # Positional access: a fifth of the cost of Row attributes on a full-hospital list
+    patient_id, _, ward_type, room_number, bed_number, medication_id = row[:6]
+    return (ward_type or "", room_number or "", bed_number or "", patient_id, medication_id)
+
+def get_medication_administration_list(db: Session, ward_type: Optional[str] = None) -> list:
+    """The medication administration list for a ward round in one query, ordered by ward, room, bed and patient.
+
+    Returns column rows. They are sorted here rather than by the database: a
+    multi-column text sort of a full-hospital list costs PostgreSQL more than
+    the query itself, and the order is then the same on every database.
+    """
+    # Executed on the connection: plain column rows need none of the ORM result processing
+    rows = db.connection().execute(medication_administration_query(ward_type)).all()
+    rows.sort(key=_bed_order)
+    return rows
+
+def create_in_patient_medications(
+    db: Session,
+    round_id: str,
+    medications: List[schemas.InPatientMedicationLine]
+) -> Optional[List[models.InPatientMedication]]:
+    """Add medication lines to an existing round with one batched INSERT; None if the round does not exist."""
+    patient = db.query(models.InPatient.allergies).join(
+        models.InPatientRound, models.InPatientRound.patient_id == models.InPatient.id
+    ).filter(models.InPatientRound.id == round_id).first()
+    if patient is None:
+        return None
+    db_medications = [
+        models.InPatientMedication(round_id=round_id, **line.dict(exclude={"round_id"}, exclude_none=True))
+        for line in medications
+    ]
+    check_allergies(patient.allergies, db_medications)
+    db.add_all(db_medications)
     db.commit()
-    db.refresh(db_medication)
-    return db_medication
+    return db_medications
+
+def create_in_patient_medication(db: Session, medication: schemas.InPatientMedicationCreate) -> Optional[models.InPatientMedication]:
+    db_medications = create_in_patient_medications(db, medication.round_id, [medication])
+    return db_medications[0] if db_medications else None
 
 def update_in_patient_medication(db: Session, medication_id: int, medication_update: schemas.InPatientMedicationUpdate) -> Optional[models.InPatientMedication]:
-    db_medication = get_in_patient_medication(db, medication_id)
-    if not db_medication:
-        return None
-    
-    update_data = medication_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_medication, field, value)
-    
-    db.commit()
-    db.refresh(db_medication)
-    return db_medication
+    return update_by_id(db, models.InPatientMedication, medication_id, medication_update.dict(exclude_unset=True))
 
 def discontinue_medication(db: Session, medication_id: int) -> Optional[models.InPatientMedication]:
-    db_medication = get_in_patient_medication(db, medication_id)
-    if not db_medication:
-        return None
-    
-    db_medication.status = "discontinued"
-    db_medication.end_date = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(db_medication)
-    return db_medication
+    return update_by_id(db, models.InPatientMedication, medication_id, {
+        "status": "discontinued",
+        "end_date": datetime.utcnow()
+    })
 
 def delete_in_patient_medication(db: Session, medication_id: int) -> bool:
-    db_medication = get_in_patient_medication(db, medication_id)
-    if not db_medication:
-        return False
-    db.delete(db_medication)
-    db.commit()
-    return True
+    return delete_by_id(db, models.InPatientMedication, medication_id)
 
 # Out-Patient Appointment CRUD operations
 def get_out_patient_appointment(db: Session, appointment_id: str) -> Optional[models.OutPatientAppointment]:
     return db.query(models.OutPatientAppointment).filter(models.OutPatientAppointment.id == appointment_id).first()
 
-def get_out_patient_appointments(db: Session, skip: int = 0, limit: int = 100) -> List[models.OutPatientAppointment]:
-    return db.query(models.OutPatientAppointment).offset(skip).limit(limit).all()
+def get_out_patient_appointments(
+    db: Session,
+    after: Optional[CursorKey] = None,
+    limit: int = 100,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    doctor_id: Optional[str] = None,
+    status: Optional[str] = None,
+    columns=None
+) -> dict:
+    """List appointments, optionally within [date_from, date_to) for a doctor and/or status.
+
+    With a date bound the page is ordered by (date, id) so the composite
+    date indexes serve both the range and the order; otherwise by creation.
+    """
+    query = db.query(models.OutPatientAppointment)
+    if doctor_id:
+        query = query.filter(models.OutPatientAppointment.doctor_id == doctor_id)
+    if status:
+        query = query.filter(models.OutPatientAppointment.status == status)
+    if date_from is not None:
+        query = query.filter(models.OutPatientAppointment.date >= date_from)
+    if date_to is not None:
+        query = query.filter(models.OutPatientAppointment.date < date_to)
+    sort_column = None
+    if date_from is not None or date_to is not None:
+        sort_column = models.OutPatientAppointment.date
+    return paginate(query, models.OutPatientAppointment, after=after, limit=limit, sort_column=sort_column, columns=columns)
 
 def get_out_patient_appointments_by_patient(db: Session, patient_id: str) -> List[models.OutPatientAppointment]:
     return db.query(models.OutPatientAppointment).filter(
@@ -367,10 +795,12 @@ def get_out_patient_appointments_by_doctor(db: Session, doctor_id: str) -> List[
         models.OutPatientAppointment.doctor_id == doctor_id
     ).order_by(models.OutPatientAppointment.date).all()
 
-def get_todays_out_patient_appointments(db: Session) -> List[models.OutPatientAppointment]:
-    today = date.today()
-    return db.query(models.OutPatientAppointment).filter(
-        func.date(models.OutPatientAppointment.date) == today
+def get_todays_out_patient_appointments(db: Session, columns=None) -> List[models.OutPatientAppointment]:
+    # Half-open range on the indexed column; func.date() would scan every row
+    start = datetime.combine(date.today(), time.min)
+    return db.query(*(columns or [models.OutPatientAppointment])).filter(
+        models.OutPatientAppointment.date >= start,
+        models.OutPatientAppointment.date < start + timedelta(days=1)
     ).order_by(models.OutPatientAppointment.date).all()
 
 def create_out_patient_appointment(db: Session, appointment: schemas.OutPatientAppointmentCreate) -> models.OutPatientAppointment:
@@ -379,55 +809,34 @@ def create_out_patient_appointment(db: Session, appointment: schemas.OutPatientA
         **appointment.dict()
     )
     db.add(db_appointment)
+    record_workload(db, [(workload_key(models.OutPatientAppointment, db_appointment), 1)])
     db.commit()
-    db.refresh(db_appointment)
+    publish_changes(models.OutPatientAppointment, "created", [db_appointment])
     return db_appointment
 
 def update_out_patient_appointment(db: Session, appointment_id: str, appointment_update: schemas.OutPatientAppointmentUpdate) -> Optional[models.OutPatientAppointment]:
-    db_appointment = get_out_patient_appointment(db, appointment_id)
-    if not db_appointment:
-        return None
-    
-    update_data = appointment_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_appointment, field, value)
-    
-    db.commit()
-    db.refresh(db_appointment)
-    return db_appointment
+    return update_by_id(db, models.OutPatientAppointment, appointment_id, appointment_update.dict(exclude_unset=True))
 
 def cancel_out_patient_appointment(db: Session, appointment_id: str) -> Optional[models.OutPatientAppointment]:
-    db_appointment = get_out_patient_appointment(db, appointment_id)
-    if not db_appointment:
-        return None
-    
-    db_appointment.status = "cancelled"
-    db.commit()
-    db.refresh(db_appointment)
-    return db_appointment
+    return update_by_id(db, models.OutPatientAppointment, appointment_id, {"status": "cancelled"})
 
 def delete_out_patient_appointment(db: Session, appointment_id: str) -> bool:
-    db_appointment = get_out_patient_appointment(db, appointment_id)
-    if not db_appointment:
-        return False
-    db.delete(db_appointment)
-    db.commit()
-    return True
+    return delete_by_id(db, models.OutPatientAppointment, appointment_id)
 
 # In-Patient Admission CRUD operations
 def get_in_patient_admission(db: Session, admission_id: str) -> Optional[models.InPatientAdmission]:
     return db.query(models.InPatientAdmission).filter(models.InPatientAdmission.id == admission_id).first()
 
-def get_in_patient_admissions(db: Session, skip: int = 0, limit: int = 100) -> List[models.InPatientAdmission]:
-    return db.query(models.InPatientAdmission).offset(skip).limit(limit).all()
+def get_in_patient_admissions(db: Session, after: Optional[CursorKey] = None, limit: int = 100, columns=None) -> dict:
+    return paginate(db.query(models.InPatientAdmission), models.InPatientAdmission, after=after, limit=limit, columns=columns)
 
 def get_in_patient_admissions_by_patient(db: Session, patient_id: str) -> List[models.InPatientAdmission]:
     return db.query(models.InPatientAdmission).filter(
         models.InPatientAdmission.patient_id == patient_id
     ).order_by(models.InPatientAdmission.admission_date.desc()).all()
 
-def get_active_in_patient_admissions(db: Session) -> List[models.InPatientAdmission]:
-    return db.query(models.InPatientAdmission).filter(
+def get_active_in_patient_admissions(db: Session, columns=None) -> List[models.InPatientAdmission]:
+    return db.query(*(columns or [models.InPatientAdmission])).filter(
         models.InPatientAdmission.status == "admitted"
     ).all()
 
@@ -437,49 +846,68 @@ def create_in_patient_admission(db: Session, admission: schemas.InPatientAdmissi
         **admission.dict()
     )
     db.add(db_admission)
+    db.flush()
+    changes = []
+    key = admission_bed_key(db_admission)
+    if key is not None:
+        try:
+            changes = move_admission_bed(db, db_admission.patient_id, None, key)
+        except BedOccupiedError:
+            db.rollback()
+            raise
     db.commit()
-    db.refresh(db_admission)
+    bed_index.apply(changes)
+    publish_changes(models.InPatientAdmission, "created", [db_admission])
     return db_admission
 
-def update_in_patient_admission(db: Session, admission_id: str, admission_update: schemas.InPatientAdmissionUpdate) -> Optional[models.InPatientAdmission]:
-    db_admission = get_in_patient_admission(db, admission_id)
-    if not db_admission:
+def update_in_patient_admission_fields(db: Session, admission_id: str, values: dict) -> Optional[models.InPatientAdmission]:
+    """update_by_id for admissions that also moves the patient's bed when ward, room, bed or status change."""
+    if not values.keys() & BED_FIELDS:
+        return update_by_id(db, models.InPatientAdmission, admission_id, values)
+    db_admission = db.query(models.InPatientAdmission).filter(
+        models.InPatientAdmission.id == admission_id
+    ).with_for_update().first()
+    if db_admission is None:
         return None
-    
-    update_data = admission_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
+    old_key = admission_bed_key(db_admission)
+    for field, value in values.items():
         setattr(db_admission, field, value)
-    
-    db.commit()
-    db.refresh(db_admission)
+    try:
+        changes = move_admission_bed(db, db_admission.patient_id, old_key, admission_bed_key(db_admission))
+        db.commit()
+    except BedOccupiedError:
+        db.rollback()
+        raise
+    bed_index.apply(changes)
+    publish_changes(models.InPatientAdmission, "updated", [db_admission])
     return db_admission
 
+def update_in_patient_admission(db: Session, admission_id: str, admission_update: schemas.InPatientAdmissionUpdate) -> Optional[models.InPatientAdmission]:
+    return update_in_patient_admission_fields(db, admission_id, admission_update.dict(exclude_unset=True))
+
 def discharge_in_patient_admission(db: Session, admission_id: str) -> Optional[models.InPatientAdmission]:
-    db_admission = get_in_patient_admission(db, admission_id)
-    if not db_admission:
-        return None
-    
-    db_admission.status = "discharged"
-    db_admission.actual_discharge_date = datetime.utcnow()
-    
-    db.commit()
-    db.refresh(db_admission)
-    return db_admission
+    return update_in_patient_admission_fields(db, admission_id, {
+        "status": "discharged",
+        "actual_discharge_date": datetime.utcnow()
+    })
 
 def delete_in_patient_admission(db: Session, admission_id: str) -> bool:
     db_admission = get_in_patient_admission(db, admission_id)
     if not db_admission:
         return False
+    changes = move_admission_bed(db, db_admission.patient_id, admission_bed_key(db_admission), None)
     db.delete(db_admission)
     db.commit()
+    bed_index.apply(changes)
+    publish_changes(models.InPatientAdmission, "deleted", [admission_id])
     return True
 
 # Feedback CRUD operations
 def get_feedback(db: Session, feedback_id: str) -> Optional[models.Feedback]:
     return db.query(models.Feedback).filter(models.Feedback.id == feedback_id).first()
 
-def get_feedbacks(db: Session, skip: int = 0, limit: int = 100) -> List[models.Feedback]:
-    return db.query(models.Feedback).offset(skip).limit(limit).all()
+def get_feedbacks(db: Session, after: Optional[CursorKey] = None, limit: int = 100, columns=None) -> dict:
+    return paginate(db.query(models.Feedback), models.Feedback, after=after, limit=limit, columns=columns)
 
 def get_feedbacks_by_patient(db: Session, patient_id: str) -> List[models.Feedback]:
     return db.query(models.Feedback).filter(models.Feedback.patient_id == patient_id).all()
@@ -494,26 +922,634 @@ def create_feedback(db: Session, feedback: schemas.FeedbackCreate) -> models.Fee
     )
     db.add(db_feedback)
     db.commit()
-    db.refresh(db_feedback)
     return db_feedback
 
 def update_feedback(db: Session, feedback_id: str, feedback_update: schemas.FeedbackUpdate) -> Optional[models.Feedback]:
-    db_feedback = get_feedback(db, feedback_id)
-    if not db_feedback:
-        return None
-    
-    update_data = feedback_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_feedback, field, value)
-    
-    db.commit()
-    db.refresh(db_feedback)
-    return db_feedback
+    return update_by_id(db, models.Feedback, feedback_id, feedback_update.dict(exclude_unset=True))
 
 def delete_feedback(db: Session, feedback_id: str) -> bool:
-    db_feedback = get_feedback(db, feedback_id)
-    if not db_feedback:
-        return False
-    db.delete(db_feedback)
+    return delete_by_id(db, models.Feedback, feedback_id)
+
+# Doctor workload CRUD operations
+def get_doctor_workload(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    doctor_id: Optional[str] = None,
+    kind: Optional[str] = None
+) -> List[models.DoctorDailyWorkload]:
+    query = db.query(models.DoctorDailyWorkload).filter(models.DoctorDailyWorkload.count != 0)
+    if doctor_id:
+        query = query.filter(models.DoctorDailyWorkload.doctor_id == doctor_id)
+    if date_from is not None:
+        query = query.filter(models.DoctorDailyWorkload.day >= date_from)
+    if date_to is not None:
+        query = query.filter(models.DoctorDailyWorkload.day < date_to)
+    if kind:
+        query = query.filter(models.DoctorDailyWorkload.kind == kind)
+    return query.order_by(
+        models.DoctorDailyWorkload.day,
+        models.DoctorDailyWorkload.doctor_id,
+        models.DoctorDailyWorkload.kind,
+        models.DoctorDailyWorkload.status
+    ).all()
+
+def rebuild_doctor_workload(db: Session) -> int:
+    """Recompute doctor_daily_workload from the source tables and return its row count."""
+    table = models.DoctorDailyWorkload.__table__
+    db.execute(delete(models.DoctorDailyWorkload))
+    for model, (kind, status_field) in WORKLOAD_SOURCES.items():
+        day = func.date(model.date)
+        group_by = [model.doctor_id, day]
+        status = literal("", String)
+        if status_field:
+            status = getattr(model, status_field)
+            group_by.append(status)
+        db.execute(insert(table).from_select(
+            ["doctor_id", "day", "kind", "status", "count"],
+            select(model.doctor_id, day, literal(kind, String), status, func.count())
+            .where(model.doctor_id.isnot(None))
+            .group_by(*group_by)
+        ))
+    db.commit()
+    return db.query(models.DoctorDailyWorkload).count()
+
+# Bed occupancy operations
+BED_FIELDS = {"ward_type", "room_number", "bed_number", "status"}
+
+def bed_key(row) -> Optional[BedKey]:
+    """Bed an admitted in-patient (object or dict) occupies, or None."""
+    get = row.get if isinstance(row, dict) else lambda field: getattr(row, field, None)
+    status = get("status")
+    if getattr(status, "value", status) not in (None, "admitted"):
+        return None
+    ward, room, bed = (get(field) for field in ("ward_type", "room_number", "bed_number"))
+    if not (ward and room and bed):
+        return None
+    return (getattr(ward, "value", ward), room, bed)
+
+ADMISSION_BED_STATUSES = ("scheduled", "admitted")  # Admissions that hold their bed for the patient
+
+def admission_bed_key(row) -> Optional[BedKey]:
+    """Bed a scheduled or admitted admission (object or dict) holds for its patient, or None."""
+    get = row.get if isinstance(row, dict) else lambda field: getattr(row, field, None)
+    status = get("status")
+    if getattr(status, "value", status) not in ADMISSION_BED_STATUSES:
+        return None
+    return bed_key({field: get(field) for field in ("ward_type", "room_number", "bed_number")})
+
+def get_beds(db: Session) -> List[Tuple[BedKey, Optional[str]]]:
+    table = models.Bed.__table__
+    return [
+        ((ward, room, bed), patient_id)
+        for ward, room, bed, patient_id in db.execute(
+            select(table.c.ward_type, table.c.room_number, table.c.bed_number, table.c.patient_id)
+        )
+    ]
+
+def create_beds(db: Session, beds: List[schemas.BedCreate]) -> int:
+    """Register beds in the inventory, skipping ones already known; returns how many were added."""
+    table = models.Bed.__table__
+    keys = {(bed.ward_type.value, bed.room_number, bed.bed_number) for bed in beds}
+    known = set(db.execute(
+        select(table.c.ward_type, table.c.room_number, table.c.bed_number)
+        .where(tuple_(table.c.ward_type, table.c.room_number, table.c.bed_number).in_(keys))
+    ).tuples()) if keys else set()
+    new_keys = sorted(keys - known)
+    if new_keys:
+        db.execute(insert(table), [
+            {"ward_type": ward, "room_number": room, "bed_number": bed} for ward, room, bed in new_keys
+        ])
     db.commit()
-    return True 
\ No newline at end of file
+    bed_index.apply((key, None) for key in new_keys)
+    return len(new_keys)
+
+def occupy_bed(db: Session, patient_id: str, key: BedKey) -> None:
+    """Claim a free bed for a patient in the current transaction; the caller commits.
+
+    The conditional UPDATE is the compare-and-set that stops two concurrent
+    admissions taking the same bed. A bed missing from the inventory is added.
+    """
+    ward, room, bed = key
+    table = models.Bed.__table__
+    match = and_(table.c.ward_type == ward, table.c.room_number == room, table.c.bed_number == bed)
+    occupied_since = datetime.utcnow()
+    result = db.execute(
+        update(table).where(match, table.c.patient_id.is_(None))
+        .values(patient_id=patient_id, occupied_since=occupied_since)
+    )
+    if result.rowcount:
+        return
+    if db.execute(select(table.c.patient_id).where(match)).first() is not None:
+        raise BedOccupiedError(key)
+    try:
+        with db.begin_nested():
+            db.execute(insert(table).values(
+                ward_type=ward, room_number=room, bed_number=bed,
+                patient_id=patient_id, occupied_since=occupied_since
+            ))
+    except IntegrityError:
+        raise BedOccupiedError(key)
+
+def reassign_bed(db: Session, patient_id: str, key: Optional[BedKey]) -> List[Tuple[BedKey, Optional[str]]]:
+    """Free the patient's current bed and occupy `key` if given; returns the changes for bed_index."""
+    table = models.Bed.__table__
+    release = update(table).where(table.c.patient_id == patient_id).values(patient_id=None, occupied_since=None)
+    columns = (table.c.ward_type, table.c.room_number, table.c.bed_number)
+    if db.get_bind().dialect.update_returning:
+        released = db.execute(release.returning(*columns)).tuples().all()
+    else:
+        released = db.execute(select(*columns).where(table.c.patient_id == patient_id)).tuples().all()
+        db.execute(release)
+    changes = [(tuple(row), None) for row in released]
+    if key is not None:
+        occupy_bed(db, patient_id, key)
+        changes.append((key, patient_id))
+    return changes
+
+def release_bed(db: Session, patient_id: str, key: BedKey) -> List[Tuple[BedKey, Optional[str]]]:
+    """Free `key` if the patient holds it; returns the changes for bed_index."""
+    ward, room, bed = key
+    table = models.Bed.__table__
+    result = db.execute(
+        update(table).where(
+            table.c.ward_type == ward, table.c.room_number == room, table.c.bed_number == bed,
+            table.c.patient_id == patient_id
+        ).values(patient_id=None, occupied_since=None)
+    )
+    return [(key, None)] if result.rowcount else []
+
+def move_admission_bed(
+    db: Session, patient_id: str, old_key: Optional[BedKey], new_key: Optional[BedKey]
+) -> List[Tuple[BedKey, Optional[str]]]:
+    """Move the patient from the bed an admission held to the one it holds now; returns the changes for bed_index.
+
+    The in-patient record's ward, room and bed follow in the same transaction,
+    so ward lists read from it agree with the bed index.
+    """
+    if new_key == old_key:
+        return []
+    patient = models.InPatient.__table__
+    if new_key is not None:
+        changes = reassign_bed(db, patient_id, new_key)
+        ward, room, bed = new_key
+        db.execute(update(patient).where(patient.c.id == patient_id).values(
+            ward_type=ward, room_number=room, bed_number=bed
+        ))
+        return changes
+    changes = release_bed(db, patient_id, old_key)
+    if changes:
+        ward, room, bed = old_key
+        db.execute(update(patient).where(
+            patient.c.id == patient_id, patient.c.ward_type == ward,
+            patient.c.room_number == room, patient.c.bed_number == bed
+        ).values(room_number=None, bed_number=None))
+    return changes
+
+def find_bed_conflicts(
+    db: Session, rows: "BulkValues", key_of: Callable[[dict], Optional[BedKey]] = bed_key, occupant_field: str = "id"
+) -> Dict[int, str]:
+    """Rows of a batch whose bed is taken by another patient or by an earlier row of the batch.
+
+    Rows are in-patients by default; admissions pass admission_bed_key and "patient_id".
+    """
+    keys = {index: key_of(values) for index, values in rows}
+    wanted = {key for key in keys.values() if key is not None}
+    if not wanted:
+        return {}
+    table = models.Bed.__table__
+    occupants = {
+        (ward, room, bed): patient_id
+        for ward, room, bed, patient_id in db.execute(
+            select(table.c.ward_type, table.c.room_number, table.c.bed_number, table.c.patient_id)
+            .where(tuple_(table.c.ward_type, table.c.room_number, table.c.bed_number).in_(wanted))
+            .where(table.c.patient_id.isnot(None))
+        )
+    }
+    conflicts, claimed = {}, set()
+    for index, values in rows:
+        key = keys[index]
+        if key is None:
+            continue
+        occupant = occupants.get(key)
+        if key in claimed or (occupant is not None and occupant != values.get(occupant_field)):
+            conflicts[index] = str(BedOccupiedError(key))
+        claimed.add(key)
+    return conflicts
+
+def rebuild_bed_occupancy(db: Session) -> int:
+    """Re-derive bed occupancy from admitted in-patients, first admitted first, then from scheduled
+    and admitted admissions, which move their patient as they do when written; returns beds occupied."""
+    table = models.Bed.__table__
+    db.execute(update(table).values(patient_id=None, occupied_since=None))
+    admitted = db.query(models.InPatient).filter(models.InPatient.status == "admitted").order_by(
+        models.InPatient.admission_date, models.InPatient.id
+    ).all()
+    for db_patient in admitted:
+        key = bed_key(db_patient)
+        if key is None:
+            continue
+        try:
+            occupy_bed(db, db_patient.id, key)
+        except BedOccupiedError:
+            pass
+    admissions = db.query(models.InPatientAdmission).filter(
+        models.InPatientAdmission.status.in_(ADMISSION_BED_STATUSES)
+    ).order_by(models.InPatientAdmission.admission_date, models.InPatientAdmission.id).all()
+    for db_admission in admissions:
+        key = admission_bed_key(db_admission)
+        if key is None:
+            continue
+        try:
+            with db.begin_nested():
+                move_admission_bed(db, db_admission.patient_id, None, key)
+        except BedOccupiedError:
+            pass
+    occupied = db.execute(select(func.count()).select_from(table).where(table.c.patient_id.isnot(None))).scalar()
+    db.commit()
+    generation = bed_index.begin_load()
+    bed_index.finish_load(get_beds(db), generation)
+    return occupied
+
+# Patient search operations
+def search_patients(db: Session, q: str, kind: Optional[str] = None, limit: int = 20) -> List[dict]:
+    """Best matches for a typeahead query, ranked with name hits first.
+
+    Every word of q must start a word of the patient's name, phone, email or
+    diagnoses. Uses the FTS5 index on SQLite and the tsvector GIN index elsewhere.
+    Matches are ranked in the index query and only the best `limit` are joined
+    to their documents, so a short prefix still returns the best name hits.
+    """
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return []
+    table = models.PatientSearchDocument.__table__
+    if db.get_bind().dialect.name == "sqlite":
+        fts = sql_table("patient_search_fts", sql_column("rowid"), sql_column("kind"))
+        # bm25() is lower for better matches; weights follow the FTS5 column order
+        rank = func.bm25(literal_column(fts.name), 10.0, 4.0, 4.0, 4.0, 1.0)
+        candidates = select(fts.c.rowid.label("id"), (-rank).label("score")).where(
+            literal_column(fts.name).op("MATCH")(" ".join(f'"{term}"*' for term in terms))
+        ).order_by(rank, fts.c.rowid)
+        candidate_kind = fts.c.kind
+    else:
+        tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{term}:*" for term in terms))
+        vector = models.patient_search_vector(table.c.name, table.c.phone, table.c.phone_digits, table.c.email, table.c.diagnoses)
+        rank = func.ts_rank(vector, tsquery)
+        candidates = select(table.c.id, rank.label("score")).where(vector.op("@@")(tsquery)).order_by(rank.desc(), table.c.id)
+        candidate_kind = table.c.kind
+    if kind:
+        candidates = candidates.where(candidate_kind == kind)
+    candidates = candidates.limit(limit).subquery()
+    query = select(
+        table.c.patient_id.label("id"), table.c.kind, table.c.name, table.c.phone, table.c.email, candidates.c.score
+    ).join_from(candidates, table, table.c.id == candidates.c.id).order_by(
+        candidates.c.score.desc(), table.c.patient_id
+    ).limit(limit)
+    return [dict(row) for row in db.execute(query).mappings()]
+
+def rebuild_patient_search(db: Session) -> int:
+    """Recompute every patient search document from the patient, visit and round tables; returns the count."""
+    table = models.PatientSearchDocument.__table__
+    db.execute(delete(table))
+    for kind in SEARCH_PATIENTS:
+        db.execute(insert(table).from_select(
+            ["kind", "patient_id", "name", "phone", "phone_digits", "email", "diagnoses"],
+            search_documents(db, kind)
+        ))
+    db.commit()
+    return db.query(models.PatientSearchDocument).count()
+
+def iter_batches(db: Session, query, key_column, batch_size: int):
+    """Rows of query in key_column order, batch_size at a time, paged by key so writes can run between batches."""
+    last = None
+    while True:
+        page = query if last is None else query.where(key_column > last)
+        rows = db.execute(page.order_by(key_column).limit(batch_size)).all()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+def rebuild_patient_allergies(db: Session, batch_size: int = 5000) -> int:
+    """Re-parse every patient's allergies JSON into patient_allergies; returns the row count."""
+    db.execute(delete(models.PatientAllergy))
+    for model in (models.OutPatient, models.InPatient):
+        query = select(model.id, model.allergies).where(model.allergies.isnot(None))
+        for patients in iter_batches(db, query, model.id, batch_size):
+            index_allergies(db, SEARCH_SOURCES[model][0], patients, replace=False)
+    db.commit()
+    return db.query(models.PatientAllergy).count()
+
+def rebuild_round_vitals(db: Session, batch_size: int = 5000) -> int:
+    """Re-parse every round's vital_signs JSON into round_vitals; returns the row count."""
+    db.execute(delete(models.RoundVitals))
+    round_table = models.InPatientRound
+    query = select(round_table.id, round_table.patient_id, round_table.date, round_table.vital_signs).where(
+        round_table.vital_signs.isnot(None)
+    )
+    for rounds in iter_batches(db, query, round_table.id, batch_size):
+        index_vitals(db, rounds, replace=False)
+    db.info.pop("vitals_patients", None)
+    db.commit()
+    vitals_series.invalidate()
+    return db.query(models.RoundVitals).count()
+
+# Allergy and vital sign queries, served by the indexes of the parsed tables
+def get_patients_with_allergy(db: Session, allergen: str, kind: Optional[str] = None, limit: int = 100) -> list:
+    """Patients allergic to allergen, as column rows ordered by patient name.
+
+    When allergen names a drug or a drug class, patients with an allergy to
+    any member of the class match as well: "penicillin" also finds allergies
+    recorded as "Amoxicillin" or "beta-lactam".
+    """
+    table = models.PatientAllergy
+    key = normalize_allergen(allergen)
+    drug_class = allergy_checker.allergy_class(key)
+    matches = table.allergen == key if drug_class is None else or_(table.allergen == key, table.drug_class == drug_class)
+    queries = []
+    for model in (models.OutPatient, models.InPatient):
+        patient_kind = SEARCH_SOURCES[model][0]
+        if kind in (None, patient_kind):
+            queries.append(
+                select(
+                    table.kind, table.patient_id, model.name.label("patient_name"),
+                    table.name.label("allergy"), table.drug_class
+                ).join(model, model.id == table.patient_id).where(table.kind == patient_kind, matches)
+            )
+    query = union_all(*queries).subquery()
+    return db.connection().execute(
+        select(query).order_by(query.c.patient_name, query.c.patient_id, query.c.allergy).limit(limit)
+    ).all()
+
+def get_round_vitals(
+    db: Session,
+    ranges: Dict[str, Tuple[Optional[float], Optional[float]]],
+    patient_id: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = 100
+) -> list:
+    """Rounds whose readings fall strictly inside each (above, below) range, newest first, as column rows.
+
+    ranges maps round_vitals columns to bounds, either of which may be None:
+    {"spo2": (None, 92)} finds rounds with SpO2 under 92. Rounds without a
+    reading for a filtered column do not match.
+    """
+    table = models.RoundVitals
+    query = select(table.round_id, table.patient_id, table.date, *(getattr(table, column) for column in VITAL_COLUMNS))
+    for column, (above, below) in ranges.items():
+        if above is not None:
+            query = query.where(getattr(table, column) > above)
+        if below is not None:
+            query = query.where(getattr(table, column) < below)
+    if patient_id:
+        query = query.where(table.patient_id == patient_id)
+    if date_from is not None:
+        query = query.where(table.date >= date_from)
+    if date_to is not None:
+        query = query.where(table.date < date_to)
+    return db.connection().execute(query.order_by(table.date.desc(), table.round_id).limit(limit)).all()
+
+def get_vitals_rows(db: Session, patient_ids: Optional[Iterable[str]] = None) -> list:
+    """round_vitals as (patient_id, date, *VITAL_COLUMNS) rows in patient and date order, for the vitals series store."""
+    table = models.RoundVitals
+    query = select(table.patient_id, table.date, *(getattr(table, column) for column in VITAL_COLUMNS))
+    if patient_ids is not None:
+        query = query.where(table.patient_id.in_(list(patient_ids)))
+    return db.connection().execute(query.order_by(table.patient_id, table.date, table.round_id)).all()
+
+def get_admitted_beds(db: Session, ward_type: Optional[str] = None) -> list:
+    """(id, name, ward_type, room_number, bed_number) of admitted in-patients, for the deterioration board."""
+    patient = models.InPatient
+    query = select(patient.id, patient.name, patient.ward_type, patient.room_number, patient.bed_number).where(
+        patient.status == "admitted"
+    )
+    if ward_type:
+        query = query.where(patient.ward_type == ward_type)
+    return db.connection().execute(query).all()
+
+# Bulk operations
+BulkValues = List[Tuple[int, dict]]
+
+def find_missing_references(db: Session, rows: BulkValues, references: Dict[str, type]) -> Dict[int, str]:
+    """Check the foreign keys of a batch with one query per referenced table.
+
+    Returns an error message for each row index whose reference does not exist.
+    """
+    errors = {}
+    for column, target in references.items():
+        wanted = {values[column] for _, values in rows if values.get(column)}
+        if not wanted:
+            continue
+        found = {row_id for (row_id,) in db.query(target.id).filter(target.id.in_(wanted))}
+        for index, values in rows:
+            value = values.get(column)
+            if value and value not in found and index not in errors:
+                errors[index] = f"{column}: {value} does not exist"
+    return errors
+
+def bulk_create(
+    db: Session,
+    model,
+    id_prefix: str,
+    rows: BulkValues,
+    references: Optional[Dict[str, type]] = None,
+    before_commit: Optional[Callable[[Session, List[dict]], None]] = None
+) -> List[dict]:
+    """Insert a batch with one executemany in a single transaction and return per-row results.
+
+    before_commit, if given, runs in the same transaction with the inserted rows.
+    """
+    missing = find_missing_references(db, rows, references or {})
+    results, params = [], []
+    for index, values in rows:
+        if index in missing:
+            results.append({"index": index, "status": "invalid", "error": missing[index]})
+            continue
+        row_id = f"{id_prefix}-{str(uuid.uuid4())[:8]}"
+        params.append({"id": row_id, **values})
+        results.append({"index": index, "status": "created", "id": row_id})
+    if params:
+        db.execute(insert(model), params)
+        if model in WORKLOAD_SOURCES:
+            record_workload(db, [(workload_key(model, values), 1) for values in params])
+        if model in SEARCH_SOURCES:
+            index_search_rows(db, model, params, created=True)
+        if model in PARSED_SOURCES:
+            index_parsed_rows(db, model, params, created=True)
+        if before_commit is not None:
+            before_commit(db, params)
+        written = fetch_feed_rows(db, model, [values["id"] for values in params])
+        db.commit()
+        publish_changes(model, "created", written)
+    return results
+
+def bulk_update(
+    db: Session,
+    model,
+    rows: BulkValues,
+    references: Optional[Dict[str, type]] = None,
+    before_commit: Optional[Callable[[Session, List[dict]], None]] = None
+) -> List[dict]:
+    """Update a batch by primary key with executemany in a single transaction and return per-row results.
+
+    before_commit, if given, runs in the same transaction with the applied updates.
+    """
+    ids = {values["id"] for _, values in rows}
+    tracked = model in WORKLOAD_SOURCES and any(values.keys() & WORKLOAD_FIELDS for _, values in rows)
+    if not ids:
+        existing = {}
+    elif tracked:
+        # Current summary fields of each row, so moved counts can be adjusted
+        existing = {
+            db_obj.id: {field: getattr(db_obj, field, None) for field in WORKLOAD_FIELDS}
+            for db_obj in db.query(model).filter(model.id.in_(ids))
+        }
+    else:
+        existing = {row_id: None for (row_id,) in db.query(model.id).filter(model.id.in_(ids))}
+    missing = find_missing_references(db, rows, references or {})
+    results, params, changes = [], [], []
+    for index, values in rows:
+        if values["id"] not in existing:
+            results.append({"index": index, "status": "not_found", "id": values["id"], "error": "Row not found"})
+        elif index in missing:
+            results.append({"index": index, "status": "invalid", "id": values["id"], "error": missing[index]})
+        else:
+            if len(values) > 1:
+                params.append(values)
+            if tracked:
+                before = existing[values["id"]]
+                after = {**before, **{field: values[field] for field in WORKLOAD_FIELDS if field in values}}
+                changes += [(workload_key(model, before), -1), (workload_key(model, after), 1)]
+                existing[values["id"]] = after
+            results.append({"index": index, "status": "updated", "id": values["id"]})
+    if params:
+        db.execute(update(model), params)
+        record_workload(db, changes)
+        if model in SEARCH_SOURCES:
+            index_search_rows(db, model, [values for values in params if values.keys() & SEARCH_SOURCES[model][2]])
+        if model in PARSED_SOURCES:
+            index_parsed_rows(db, model, [values for values in params if values.keys() & PARSED_SOURCES[model]])
+        if before_commit is not None:
+            before_commit(db, params)
+        written = fetch_feed_rows(db, model, [values["id"] for values in params])
+        db.commit()
+        publish_changes(model, "updated", written)
+    return results
+
+def bulk_create_out_patients(db: Session, patients: List[Tuple[int, schemas.OutPatientCreate]]) -> List[dict]:
+    return bulk_create(db, models.OutPatient, "op", [(index, patient.dict()) for index, patient in patients])
+
+def bulk_update_out_patients(db: Session, patients: List[Tuple[int, schemas.OutPatientBulkUpdate]]) -> List[dict]:
+    return bulk_update(db, models.OutPatient, [(index, patient.dict(exclude_unset=True)) for index, patient in patients])
+
+def bulk_create_in_patients(db: Session, patients: List[Tuple[int, schemas.InPatientCreate]]) -> List[dict]:
+    rows = [(index, patient.dict()) for index, patient in patients]
+    conflicts = find_bed_conflicts(db, rows)
+    changes = []
+
+    def occupy_beds(db: Session, params: List[dict]) -> None:
+        for values in params:
+            key = bed_key(values)
+            if key is not None:
+                occupy_bed(db, values["id"], key)
+                changes.append((key, values["id"]))
+
+    results = bulk_create(db, models.InPatient, "ip", [row for row in rows if row[0] not in conflicts], references={
+        "admitting_doctor_id": models.User,
+        "discharge_doctor_id": models.User
+    }, before_commit=occupy_beds)
+    bed_index.apply(changes)
+    return results + [{"index": index, "status": "invalid", "error": error} for index, error in conflicts.items()]
+
+def bulk_update_in_patients(db: Session, patients: List[Tuple[int, schemas.InPatientBulkUpdate]]) -> List[dict]:
+    rows = [(index, patient.dict(exclude_unset=True)) for index, patient in patients]
+    # Bed fields after the update, for rows that may move bed
+    moving = {values["id"] for _, values in rows if values.keys() & BED_FIELDS}
+    current = {
+        db_patient.id: {field: getattr(db_patient, field) for field in BED_FIELDS}
+        for db_patient in db.query(models.InPatient).filter(models.InPatient.id.in_(moving))
+    } if moving else {}
+    for _, values in rows:
+        if values["id"] in current:
+            current[values["id"]].update((field, values[field]) for field in BED_FIELDS if field in values)
+    conflicts = find_bed_conflicts(db, [
+        (index, {"id": values["id"], **current[values["id"]]}) for index, values in rows if values["id"] in current
+    ])
+    changes = []
+
+    def move_beds(db: Session, params: List[dict]) -> None:
+        for values in params:
+            if values["id"] in current:
+                changes.extend(reassign_bed(db, values["id"], bed_key(current[values["id"]])))
+
+    results = bulk_update(db, models.InPatient, [row for row in rows if row[0] not in conflicts], references={
+        "admitting_doctor_id": models.User,
+        "discharge_doctor_id": models.User
+    }, before_commit=move_beds)
+    bed_index.apply(changes)
+    ids = {index: values["id"] for index, values in rows}
+    return results + [{"index": index, "status": "invalid", "id": ids[index], "error": error} for index, error in conflicts.items()]
+
+def bulk_create_out_patient_appointments(db: Session, appointments: List[Tuple[int, schemas.OutPatientAppointmentCreate]]) -> List[dict]:
+    return bulk_create(db, models.OutPatientAppointment, "op-apt", [(index, appointment.dict()) for index, appointment in appointments], references={
+        "patient_id": models.OutPatient,
+        "doctor_id": models.User
+    })
+
+def bulk_update_out_patient_appointments(db: Session, appointments: List[Tuple[int, schemas.OutPatientAppointmentBulkUpdate]]) -> List[dict]:
+    return bulk_update(db, models.OutPatientAppointment, [(index, appointment.dict(exclude_unset=True)) for index, appointment in appointments], references={
+        "doctor_id": models.User
+    })
+
+def bulk_create_in_patient_admissions(db: Session, admissions: List[Tuple[int, schemas.InPatientAdmissionCreate]]) -> List[dict]:
+    rows = [(index, admission.dict()) for index, admission in admissions]
+    conflicts = find_bed_conflicts(db, rows, admission_bed_key, "patient_id")
+    changes = []
+
+    def occupy_beds(db: Session, params: List[dict]) -> None:
+        for values in params:
+            key = admission_bed_key(values)
+            if key is not None:
+                changes.extend(move_admission_bed(db, values["patient_id"], None, key))
+
+    results = bulk_create(db, models.InPatientAdmission, "ip-adm", [row for row in rows if row[0] not in conflicts], references={
+        "patient_id": models.InPatient,
+        "admitting_doctor_id": models.User
+    }, before_commit=occupy_beds)
+    bed_index.apply(changes)
+    return results + [{"index": index, "status": "invalid", "error": error} for index, error in conflicts.items()]
+
+def bulk_update_in_patient_admissions(db: Session, admissions: List[Tuple[int, schemas.InPatientAdmissionBulkUpdate]]) -> List[dict]:
+    rows = [(index, admission.dict(exclude_unset=True)) for index, admission in admissions]
+    # Patient and bed fields before and after the update, for rows that may move bed
+    moving = {values["id"] for _, values in rows if values.keys() & BED_FIELDS}
+    before = {
+        db_admission.id: {field: getattr(db_admission, field) for field in BED_FIELDS | {"patient_id"}}
+        for db_admission in db.query(models.InPatientAdmission).filter(models.InPatientAdmission.id.in_(moving))
+    } if moving else {}
+    after = {admission_id: dict(fields) for admission_id, fields in before.items()}
+    for _, values in rows:
+        if values["id"] in after:
+            after[values["id"]].update((field, values[field]) for field in BED_FIELDS if field in values)
+    conflicts = find_bed_conflicts(db, [
+        (index, after[values["id"]]) for index, values in rows if values["id"] in after
+    ], admission_bed_key, "patient_id")
+    changes = []
+
+    def move_beds(db: Session, params: List[dict]) -> None:
+        for values in params:
+            admission_id = values["id"]
+            if admission_id in after:
+                changes.extend(move_admission_bed(
+                    db, after[admission_id]["patient_id"],
+                    admission_bed_key(before[admission_id]), admission_bed_key(after[admission_id])
+                ))
+
+    results = bulk_update(db, models.InPatientAdmission, [row for row in rows if row[0] not in conflicts], references={
+        "admitting_doctor_id": models.User
+    }, before_commit=move_beds)
+    bed_index.apply(changes)
+    ids = {index: values["id"] for index, values in rows}
+    return results + [{"index": index, "status": "invalid", "id": ids[index], "error": error} for index, error in conflicts.items()]
@@ -1,27 +1,121 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-import os
+from fastapi.concurrency import run_in_threadpool
+from . import config
+from .cache import table_versions
+from .metrics import query_metrics
 
 # Database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./hospital_management.db"
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+# Async drivers for the supported database URLs
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",  # psycopg 3 serves both sync and async engines
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Return the async-driver variant of a database URL."""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+def get_sqlite_pragmas() -> dict:
+    """PRAGMAs applied to every SQLite connection in the production profile."""
+    return {
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,  # Wait for locks instead of failing at once
+        "journal_mode": "WAL",  # Readers no longer block on the writer
+        "synchronous": "NORMAL",  # Durable at checkpoints; safe with WAL
+        "cache_size": -config.SQLITE_CACHE_SIZE_KB,  # Negative means KiB rather than pages
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Connect hook applying the production pragmas to each new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def create_database_engine(url: str, profile: str = config.DB_PROFILE, use_async: bool = False):
+    """Create the sync or async engine for a URL using the given engine profile."""
+    is_sqlite = url.startswith("sqlite")
+    options = {}
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    if profile == "production" or not is_sqlite:
+        options["pool_size"] = config.DB_POOL_SIZE
+        options["max_overflow"] = config.DB_MAX_OVERFLOW
+        options["pool_timeout"] = config.DB_POOL_TIMEOUT
+        options["pool_recycle"] = config.DB_POOL_RECYCLE
+        options["pool_pre_ping"] = config.DB_POOL_PRE_PING
+
+    if use_async:
+        db_engine = create_async_engine(get_async_database_url(url), **options)
+        sync_engine = db_engine.sync_engine
+    else:
+        db_engine = sync_engine = create_engine(url, **options)
+
+    if is_sqlite and profile == "production":
+        event.listen(sync_engine, "connect", set_sqlite_pragmas)
+    table_versions.track(sync_engine)  # Invalidates cached responses after each committed write
+    query_metrics.track(sync_engine)  # Per-route statement counts and times, slow-query log
+    return db_engine
 
 # Create SQLAlchemy engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine and session factory (only when DB_ASYNC is enabled)
+async_engine = None
+AsyncSessionLocal = None
+if config.DB_ASYNC:
+    async_engine = create_database_engine(SQLALCHEMY_DATABASE_URL, use_async=True)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 # Create Base class
 Base = declarative_base()
 
 # Dependency to get database session
-def get_db():
+async def get_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def _call_and_release(fn, db, *args, **kwargs):
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        # Return the connection to the pool before handing back to the event
+        # loop, so requests parked on the loop never pin a pooled connection
+        # that a threadpool worker is blocked waiting for. Loaded objects stay
+        # populated (detached) for serialization.
+        db.close()
+
+async def run_in_session(db, fn, *args, **kwargs):
+    """Run a synchronous crud function without blocking the event loop.
+
+    Async sessions run it on their own connection via ``run_sync``; plain
+    sessions run it in the threadpool. Each call is its own unit of work.
+    """
+    if isinstance(db, AsyncSession):
+        try:
+            return await db.run_sync(fn, *args, **kwargs)
+        finally:
+            await db.close()
+    return await run_in_threadpool(_call_and_release, fn, db, *args, **kwargs)
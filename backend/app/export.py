@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Iterator, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from . import config
+from .database import SessionLocal
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _encode_ndjson(columns, rows) -> str:
+    return "".join(
+        json.dumps({column: _encode_value(value) for column, value in zip(columns, row)}) + "\n"
+        for row in rows
+    )
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_encode_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+def iter_export(model, format: str, since: Optional[datetime] = None, batch_size: int = config.EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Yield a table as NDJSON or CSV text, one chunk per batch of rows.
+
+    Selects plain columns (no ORM objects) in (created_at, id) order and reads
+    them with yield_per, which uses a server-side cursor where the driver has
+    one, so memory stays constant however large the table is. The session is
+    owned by the generator because the response outlives the request handler.
+    """
+    columns = [column.name for column in model.__table__.columns]
+    query = select(*model.__table__.columns).order_by(model.created_at, model.id)
+    if since is not None:
+        query = query.where(model.created_at >= since)
+
+    if format == "csv":
+        yield _encode_csv([columns])
+
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield _encode_csv(rows) if format == "csv" else _encode_ndjson(columns, rows)
+
+def export_response(model, format: str, since: Optional[datetime] = None) -> StreamingResponse:
+    """Stream an export of a table as a file download."""
+    return StreamingResponse(
+        iter_export(model, format, since=since),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{model.__tablename__}.{format}"'}
+    )
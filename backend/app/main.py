@@ -1,13 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .database import engine
 from . import models
-from .routers import auth, users, out_patients, in_patients, appointments, feedback
+from . import auth as auth_utils
+from .beds import BedOccupiedError
+from .metrics import MetricsMiddleware, render_metrics
+from .migrations import run_migrations
+from .routers import auth, users, out_patients, in_patients, visits, rounds, appointments, feedback, workload, beds, search, changes, allergies, vitals
 import uvicorn
 
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
+run_migrations()
 
 # Create FastAPI app
 app = FastAPI(
@@ -25,13 +31,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and SQL statement metrics, served at /api/metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(out_patients.router, prefix="/api/out-patients", tags=["Out-Patients"])
 app.include_router(in_patients.router, prefix="/api/in-patients", tags=["In-Patients"])
+app.include_router(visits.router, prefix="/api/visits", tags=["Visits"])
+app.include_router(rounds.router, prefix="/api/rounds", tags=["Rounds"])
 app.include_router(appointments.router, prefix="/api/appointments", tags=["Appointments"])
 app.include_router(feedback.router, prefix="/api/feedback", tags=["Feedback"])
+app.include_router(workload.router, prefix="/api/workload", tags=["Workload"])
+app.include_router(beds.router, prefix="/api/beds", tags=["Beds"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
+app.include_router(changes.router, prefix="/api/changes", tags=["Changes"])
+app.include_router(allergies.router, prefix="/api/allergies", tags=["Allergies"])
+app.include_router(vitals.router, prefix="/api/vitals", tags=["Vitals"])
+
+@app.exception_handler(BedOccupiedError)
+async def bed_occupied_handler(request: Request, exc: BedOccupiedError):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
 
 @app.get("/")
 async def root():
@@ -44,7 +65,16 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "message": "API is running"} 
+    return {
+        "status": "healthy",
+        "message": "API is running",
+        "password_hash_queue_depth": auth_utils.password_hash_pool.queue_depth
+    }
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request latency, status and SQL statement metrics in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 
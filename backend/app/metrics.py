@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from . import config
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)  # Statements per request
+UNMATCHED_ROUTE = "unmatched"  # Label for requests no route matched, so stray URLs don't each get a series
+NO_ROUTE = "none"  # Label for queries run outside a request (startup, background threads)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """A labelled counter in the Prometheus text format."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_number(value)}" for key, value in values]
+
+class Histogram:
+    """A labelled histogram with fixed buckets in the Prometheus text format."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (non-cumulative, last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [[0] * (len(self.buckets) + 1), 0]
+            counts[0][index] += 1
+            counts[1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        label_names = self.labels + ("le",)
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_number(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(label_names, key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_number(float(total))}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+class Registry:
+    """The metrics served by /api/metrics, in registration order."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+http_requests = registry.register(Counter(
+    "hms_http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+))
+http_latency = registry.register(Histogram(
+    "hms_http_request_duration_seconds", "Time from request to the end of the response body", LATENCY_BUCKETS, ("method", "route")
+))
+request_queries = registry.register(Histogram(
+    "hms_http_request_db_queries", "SQL statements executed per request", QUERY_COUNT_BUCKETS, ("method", "route")
+))
+request_query_time = registry.register(Histogram(
+    "hms_http_request_db_seconds", "Time spent in SQL statements per request", LATENCY_BUCKETS, ("method", "route")
+))
+db_queries = registry.register(Counter(
+    "hms_db_queries_total", "SQL statements executed, by the route that ran them", ("route",)
+))
+slow_queries = registry.register(Counter(
+    "hms_db_slow_queries_total", f"SQL statements slower than SLOW_QUERY_MS ({config.SLOW_QUERY_MS} ms)", ("route",)
+))
+
+class RequestStats:
+    """SQL statements and time of one request, shared with the threads and greenlets serving it."""
+
+    __slots__ = ("scope", "queries", "query_time")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.query_time = 0.0
+
+    @property
+    def route(self) -> str:
+        # The router records the matched route in the scope before calling the endpoint
+        return _route_label(self.scope)
+
+# Set by MetricsMiddleware; copied into threadpool workers and run_sync greenlets with the context
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+class QueryMetrics:
+    """SQLAlchemy cursor hooks counting and timing statements, and logging slow ones."""
+
+    def track(self, engine) -> None:
+        """Instrument a (sync) engine; for an async engine pass its sync_engine."""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @staticmethod
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    @staticmethod
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = current_request.get()
+        route = stats.route if stats is not None else NO_ROUTE
+        if stats is not None:
+            stats.queries += 1
+            stats.query_time += elapsed
+        db_queries.inc((route,))
+        if elapsed * 1000 >= config.SLOW_QUERY_MS:
+            slow_queries.inc((route,))
+            # Statement text only: parameters can hold patient data
+            logger.warning(
+                "Slow query (%.1f ms, route %s%s): %s",
+                elapsed * 1000, route, ", executemany" if executemany else "", " ".join(statement.split())[:config.SLOW_QUERY_LOG_CHARS]
+            )
+
+query_metrics = QueryMetrics()
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL statements per route.
+
+    Routes are labelled with their path template (``/api/out-patients/{patient_id}``),
+    read from the matched route after the app has handled the request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            labels = (scope["method"], stats.route)
+            http_requests.inc(labels + (str(status_code[0]),))
+            http_latency.observe(labels, elapsed)
+            request_queries.observe(labels, stats.queries)
+            request_query_time.observe(labels, stats.query_time)
+
+def _route_label(scope) -> str:
+    # FastAPI releases that keep included routers intact record the prefixed
+    # route under scope["fastapi"]; older ones put it straight in scope["route"]
+    route = (scope.get("fastapi") or {}).get("effective_route_context") or scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    return getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,134 @@
+import logging
+from sqlalchemy import func, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from . import crud, models
+from .database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL advisory lock key, so workers starting together migrate one at a time
+MIGRATION_LOCK_KEY = 4_718_402
+
+def index_is_covered(index, existing: dict, columns: set) -> bool:
+    """Whether the database already has this index, or one on the same columns (schema.sql names them idx_)."""
+    if index.name in existing or "idx_" + index.name[len("ix_"):] in existing:
+        return True
+    if any(index.dialect_options[dialect].get("where") is not None for dialect in ("sqlite", "postgresql")):
+        return False
+    names = tuple(column.name for column in index.columns)
+    return names in existing.values() or names == columns
+
+def create_missing_indexes(conn: Connection) -> None:
+    """CREATE INDEX for every model index the database lacks.
+
+    create_all skips tables that already exist, so indexes added to existing
+    tables (keyset pagination, appointment date ranges, ward listings, the
+    active-medication partial index) reach an upgraded database only here.
+    Indexes on columns an older schema does not have are skipped with a warning.
+    """
+    inspector = inspect(conn)
+    for table in models.Base.metadata.sorted_tables:
+        existing = {
+            found["name"]: tuple(found["column_names"])
+            for found in inspector.get_indexes(table.name) + inspector.get_unique_constraints(table.name)
+        }
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        primary_key = tuple(column.name for column in table.primary_key.columns)
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            only_on = getattr(index, "_ddl_if", None)  # Set by Index.ddl_if(dialect=...)
+            if only_on is not None and only_on.dialect not in (None, conn.dialect.name):
+                continue
+            if index_is_covered(index, existing, primary_key):
+                continue
+            missing = {column.name for column in index.columns if column.table is table} - present
+            if missing:
+                logger.warning("Skipping index %s: %s lacks %s", index.name, table.name, ", ".join(sorted(missing)))
+                continue
+            index.create(conn)
+            logger.info("Created index %s", index.name)
+
+def has_rows(db: Session, query) -> bool:
+    return db.execute(query.limit(1)).first() is not None
+
+def backfill_patient_search(db: Session) -> None:
+    """Index the existing patients when the search table was added to a populated database."""
+    if has_rows(db, select(models.PatientSearchDocument.id)):
+        return
+    if not (has_rows(db, select(models.OutPatient.id)) or has_rows(db, select(models.InPatient.id))):
+        return
+    logger.info("Indexed %d patients for search", crud.rebuild_patient_search(db))
+
+def backfill_patient_allergies(db: Session) -> None:
+    """Parse the existing patients' allergies when patient_allergies was added to a populated database."""
+    if has_rows(db, select(models.PatientAllergy.patient_id)):
+        return
+    if not any(has_rows(db, select(model.id).where(model.allergies.isnot(None))) for model in (models.OutPatient, models.InPatient)):
+        return
+    logger.info("Parsed %d patient allergies", crud.rebuild_patient_allergies(db))
+
+def backfill_round_vitals(db: Session) -> None:
+    """Parse the existing rounds' vital signs when round_vitals was added to a populated database."""
+    if has_rows(db, select(models.RoundVitals.round_id)):
+        return
+    if not has_rows(db, select(models.InPatientRound.id).where(models.InPatientRound.vital_signs.isnot(None))):
+        return
+    logger.info("Parsed vital signs of %d rounds", crud.rebuild_round_vitals(db))
+
+def backfill_bed_occupancy(db: Session) -> None:
+    """Derive occupancy when the beds table was added to a database with admitted patients."""
+    if has_rows(db, select(models.Bed.ward_type)):
+        return
+    patient, admission = models.InPatient, models.InPatientAdmission
+    placed = (
+        select(patient.id).where(patient.status == "admitted", patient.bed_number.isnot(None)),
+        select(admission.id).where(admission.status.in_(crud.ADMISSION_BED_STATUSES), admission.bed_number.isnot(None)),
+    )
+    if not any(has_rows(db, query) for query in placed):
+        return
+    logger.info("Derived occupancy of %d beds", crud.rebuild_bed_occupancy(db))
+
+def backfill_doctor_workload(db: Session) -> None:
+    """Count the existing history when the workload summary was added to a populated database."""
+    if has_rows(db, select(models.DoctorDailyWorkload.doctor_id)):
+        return
+    if not any(has_rows(db, select(model.id).where(model.doctor_id.isnot(None))) for model in crud.WORKLOAD_SOURCES):
+        return
+    logger.info("Built %d doctor workload rows", crud.rebuild_doctor_workload(db))
+
+BACKFILLS = [
+    backfill_patient_search,
+    backfill_patient_allergies,
+    backfill_round_vitals,
+    backfill_bed_occupancy,
+    backfill_doctor_workload,
+]
+
+def run_migrations() -> None:
+    """Bring an existing database up to date after create_all; each step is a no-op once applied.
+
+    Creates the indexes the database lacks, then fills every table derived
+    from the patient tables that is still empty while its sources are not.
+    """
+    with engine.connect() as lock:
+        postgres = engine.dialect.name == "postgresql"
+        if postgres:
+            lock.execute(select(func.pg_advisory_lock(MIGRATION_LOCK_KEY)))
+        try:
+            create_missing_indexes(lock)
+            lock.commit()
+            db = SessionLocal()
+            try:
+                for backfill in BACKFILLS:
+                    backfill(db)
+            finally:
+                db.close()
+        finally:
+            if postgres:
+                lock.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_KEY)))
+                lock.commit()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    models.Base.metadata.create_all(bind=engine)
+    run_migrations()
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer, ForeignKey, Date, CheckConstraint
+from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer, Float, ForeignKey, Date, CheckConstraint, Index, UniqueConstraint, DDL, event
+from sqlalchemy.dialects import postgresql  # noqa: F401 - registers to_tsvector() and friends for patient search
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 from .database import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),  # Keyset pagination order
+    )
     
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -23,6 +27,9 @@ class User(Base):
 
 class OutPatient(Base):
     __tablename__ = "out_patients"
+    __table_args__ = (
+        Index("ix_out_patients_created_at_id", "created_at", "id"),  # Keyset pagination order
+    )
 
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -40,13 +47,17 @@ class OutPatient(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    visits = relationship("OutPatientVisit", back_populates="patient", cascade="all, delete-orphan")
-    appointments = relationship("OutPatientAppointment", back_populates="patient", cascade="all, delete-orphan")
+    visits = relationship("OutPatientVisit", back_populates="patient", cascade="all, delete-orphan", order_by="OutPatientVisit.date")
+    appointments = relationship("OutPatientAppointment", back_populates="patient", cascade="all, delete-orphan", order_by="OutPatientAppointment.date")
     medications = relationship("OutPatientMedication", back_populates="patient", cascade="all, delete-orphan")  # Ensure this line is present
 
 
 class InPatient(Base):
     __tablename__ = "in_patients"
+    __table_args__ = (
+        Index("ix_in_patients_created_at_id", "created_at", "id"),  # Keyset pagination order
+        Index("ix_in_patients_ward_type_status", "ward_type", "status"),  # Ward listings
+    )
     
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -74,8 +85,8 @@ class InPatient(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    rounds = relationship("InPatientRound", back_populates="patient", cascade="all, delete-orphan")
-    admissions = relationship("InPatientAdmission", back_populates="patient", cascade="all, delete-orphan")
+    rounds = relationship("InPatientRound", back_populates="patient", cascade="all, delete-orphan", order_by="InPatientRound.date")
+    admissions = relationship("InPatientAdmission", back_populates="patient", cascade="all, delete-orphan", order_by="InPatientAdmission.admission_date")
     admitting_doctor = relationship("User", foreign_keys=[admitting_doctor_id], back_populates="admitting_in_patients")
     discharge_doctor = relationship("User", foreign_keys=[discharge_doctor_id], back_populates="discharging_in_patients")
 
@@ -105,6 +116,9 @@ class Patient(Base):
 
 class OutPatientVisit(Base):
     __tablename__ = "out_patient_visits"
+    __table_args__ = (
+        Index("ix_out_patient_visits_created_at_id", "created_at", "id"),  # Keyset pagination order
+    )
     
     id = Column(String, primary_key=True, index=True)
     patient_id = Column(String, ForeignKey("out_patients.id"), nullable=False, index=True)
@@ -124,6 +138,9 @@ class OutPatientVisit(Base):
 
 class InPatientRound(Base):
     __tablename__ = "in_patient_rounds"
+    __table_args__ = (
+        Index("ix_in_patient_rounds_created_at_id", "created_at", "id"),  # Keyset pagination order
+    )
     
     id = Column(String, primary_key=True, index=True)
     patient_id = Column(String, ForeignKey("in_patients.id"), nullable=False, index=True)
@@ -192,6 +209,16 @@ class InPatientMedication(Base):
     # Relationships
     round = relationship("InPatientRound", back_populates="medications")
 
+# A literal rather than a bound parameter, so SQLite can match the partial index below
+ACTIVE_IN_PATIENT_MEDICATION = InPatientMedication.status == literal_column("'active'")
+# Medication rounds only read active prescriptions, a small share of the table
+Index(
+    "ix_in_patient_medications_active_round_id",
+    InPatientMedication.round_id,
+    sqlite_where=ACTIVE_IN_PATIENT_MEDICATION,
+    postgresql_where=ACTIVE_IN_PATIENT_MEDICATION
+)
+
 class Medication(Base):
     __tablename__ = "medications"
     
@@ -208,6 +235,12 @@ class Medication(Base):
 
 class OutPatientAppointment(Base):
     __tablename__ = "out_patient_appointments"
+    __table_args__ = (
+        Index("ix_out_patient_appointments_created_at_id", "created_at", "id"),  # Keyset pagination order
+        Index("ix_out_patient_appointments_date_id", "date", "id"),  # Date range queries
+        Index("ix_out_patient_appointments_doctor_id_date", "doctor_id", "date", "id"),
+        Index("ix_out_patient_appointments_status_date", "status", "date", "id"),
+    )
     
     id = Column(String, primary_key=True, index=True)
     patient_id = Column(String, ForeignKey("out_patients.id"), nullable=False, index=True)
@@ -226,6 +259,9 @@ class OutPatientAppointment(Base):
 
 class InPatientAdmission(Base):
     __tablename__ = "in_patient_admissions"
+    __table_args__ = (
+        Index("ix_in_patient_admissions_created_at_id", "created_at", "id"),  # Keyset pagination order
+    )
     
     id = Column(String, primary_key=True, index=True)
     patient_id = Column(String, ForeignKey("in_patients.id"), nullable=False, index=True)
@@ -263,6 +299,9 @@ class Appointment(Base):
 
 class Feedback(Base):
     __tablename__ = "feedback"
+    __table_args__ = (
+        Index("ix_feedback_created_at_id", "created_at", "id"),  # Keyset pagination order
+    )
     
     id = Column(String, primary_key=True, index=True)
     patient_id = Column(String, ForeignKey("patients.id"), nullable=False, index=True)
@@ -277,4 +316,133 @@ class Feedback(Base):
     
     # Relationships
     patient = relationship("Patient", back_populates="feedback")
-    appointment = relationship("Appointment", back_populates="feedback") 
\ No newline at end of file
+    appointment = relationship("Appointment", back_populates="feedback")
+
+# Bed inventory and occupancy; a bed with a patient_id is occupied
+class Bed(Base):
+    __tablename__ = "beds"
+
+    ward_type = Column(String, primary_key=True)
+    room_number = Column(String, primary_key=True)
+    bed_number = Column(String, primary_key=True)
+    patient_id = Column(String, ForeignKey("in_patients.id"), unique=True)  # A patient holds at most one bed
+    occupied_since = Column(DateTime)
+
+# Per-doctor daily counts of visits, rounds and appointments, kept current by crud on every write
+class DoctorDailyWorkload(Base):
+    __tablename__ = "doctor_daily_workload"
+    __table_args__ = (
+        Index("ix_doctor_daily_workload_day", "day"),  # All-doctor dashboards by date
+    )
+
+    doctor_id = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    kind = Column(String, primary_key=True)  # visit, round or appointment
+    status = Column(String, primary_key=True, default="")  # Appointment status; empty for visits and rounds
+    count = Column(Integer, nullable=False, default=0)
+
+def patient_search_vector(name, phone, phone_digits, email, diagnoses):
+    """PostgreSQL tsvector of a search document, weighted name > contact details > diagnoses.
+
+    Constants are inlined so queries match the expression of the GIN index exactly.
+    Punctuation in contact details becomes spaces, so "example" finds "jo@example.com"
+    as it does with the SQLite tokenizer.
+    """
+    def concat(columns):
+        text = func.coalesce(columns[0], literal_column("''"))
+        for column in columns[1:]:
+            text = text.op("||")(literal_column("' '")).op("||")(func.coalesce(column, literal_column("''")))
+        return text
+
+    def weighted(text, weight):
+        return func.setweight(func.to_tsvector(literal_column("'simple'::regconfig"), text), literal_column(f"'{weight}'"))
+
+    contact = func.translate(concat([phone, phone_digits, email]), literal_column("'@.-_()+'"), literal_column("'       '"))
+    return weighted(concat([name]), "A").op("||")(weighted(contact, "B")).op("||")(weighted(concat([diagnoses]), "C"))
+
+# Search documents for patient lookup: one row per patient with its name, contact
+# details and diagnoses, rewritten by crud on every write that changes them
+class PatientSearchDocument(Base):
+    __tablename__ = "patient_search"
+
+    id = Column(Integer, primary_key=True)  # Stable rowid for the SQLite FTS5 index
+    kind = Column(String, nullable=False)  # out-patient or in-patient
+    patient_id = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    phone = Column(String)
+    phone_digits = Column(String)  # Phone without punctuation, so "5550100" finds "555-0100"
+    email = Column(String)
+    diagnoses = Column(Text)  # Visit/round diagnoses, plus admission and discharge diagnoses
+
+    __table_args__ = (
+        UniqueConstraint("kind", "patient_id", name="uq_patient_search_kind_patient_id"),
+        # PostgreSQL full-text index; SQLite uses the FTS5 table below instead
+        Index(
+            "ix_patient_search_document",
+            patient_search_vector(name, phone, phone_digits, email, diagnoses),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
+# SQLite searches an external-content FTS5 table over patient_search, kept in
+# sync by triggers; prefix indexes make 2-4 character typeahead lookups cheap
+PATIENT_SEARCH_FTS_COLUMNS = "name, phone, phone_digits, email, diagnoses, kind"
+PATIENT_SEARCH_FTS_NEW = "new.id, new.name, new.phone, new.phone_digits, new.email, new.diagnoses, new.kind"
+PATIENT_SEARCH_FTS_OLD = "old.id, old.name, old.phone, old.phone_digits, old.email, old.diagnoses, old.kind"
+PATIENT_SEARCH_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS patient_search_fts USING fts5("
+    "name, phone, phone_digits, email, diagnoses, kind UNINDEXED, "
+    "content='patient_search', content_rowid='id', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS patient_search_ai AFTER INSERT ON patient_search BEGIN "
+    f"INSERT INTO patient_search_fts(rowid, {PATIENT_SEARCH_FTS_COLUMNS}) VALUES ({PATIENT_SEARCH_FTS_NEW}); END",
+    "CREATE TRIGGER IF NOT EXISTS patient_search_ad AFTER DELETE ON patient_search BEGIN "
+    f"INSERT INTO patient_search_fts(patient_search_fts, rowid, {PATIENT_SEARCH_FTS_COLUMNS}) VALUES ('delete', {PATIENT_SEARCH_FTS_OLD}); END",
+    "CREATE TRIGGER IF NOT EXISTS patient_search_au AFTER UPDATE ON patient_search BEGIN "
+    f"INSERT INTO patient_search_fts(patient_search_fts, rowid, {PATIENT_SEARCH_FTS_COLUMNS}) VALUES ('delete', {PATIENT_SEARCH_FTS_OLD}); "
+    f"INSERT INTO patient_search_fts(rowid, {PATIENT_SEARCH_FTS_COLUMNS}) VALUES ({PATIENT_SEARCH_FTS_NEW}); END",
+]
+for statement in PATIENT_SEARCH_FTS_DDL:
+    event.listen(PatientSearchDocument.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    PatientSearchDocument.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS patient_search_fts").execute_if(dialect="sqlite")
+)
+
+# Patients' allergies, one row per allergy parsed from the allergies JSON text;
+# rewritten by crud on every write that changes it, so allergy lookups are indexed
+class PatientAllergy(Base):
+    __tablename__ = "patient_allergies"
+    __table_args__ = (
+        Index("ix_patient_allergies_allergen", "allergen", "kind", "patient_id"),
+        Index("ix_patient_allergies_drug_class", "drug_class", "kind", "patient_id"),
+        Index("ix_patient_allergies_kind_patient_id", "kind", "patient_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)  # out-patient or in-patient
+    patient_id = Column(String, nullable=False)
+    name = Column(String, nullable=False)  # As recorded
+    allergen = Column(String, nullable=False)  # Lower case, single-spaced
+    drug_class = Column(String)  # Class the allergy covers (app/allergies.py), if known
+
+# Numeric readings of each round's vital_signs JSON text, rewritten by crud on
+# every write that changes it, so vital sign ranges are indexed queries
+class RoundVitals(Base):
+    __tablename__ = "round_vitals"
+    __table_args__ = (
+        Index("ix_round_vitals_patient_id_date", "patient_id", "date"),
+        Index("ix_round_vitals_spo2", "spo2"),
+        Index("ix_round_vitals_pulse", "pulse"),
+        Index("ix_round_vitals_temperature", "temperature"),
+        Index("ix_round_vitals_bp_systolic", "bp_systolic"),
+    )
+
+    round_id = Column(String, primary_key=True)
+    patient_id = Column(String, nullable=False)
+    date = Column(DateTime, nullable=False)  # Date of the round
+    bp_systolic = Column(Float)
+    bp_diastolic = Column(Float)
+    pulse = Column(Float)
+    temperature = Column(Float)  # Celsius; Fahrenheit readings are converted when parsed
+    spo2 = Column(Float)
+    respiratory_rate = Column(Float)
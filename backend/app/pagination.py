@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, Query, status
+from sqlalchemy import and_, or_, func, select
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Position of the last row on a page: (sort key, id)
+CursorKey = Tuple[Optional[datetime], str]
+
+def encode_cursor(sort_key: Optional[datetime], row_id: str) -> str:
+    """Encode a row's sort key into an opaque cursor string."""
+    payload = json.dumps([sort_key.isoformat() if sort_key else None, row_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """Decode a cursor string back into a sort key. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, row_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Malformed cursor")
+    if not isinstance(row_id, str):
+        raise ValueError("Malformed cursor")
+    return (datetime.fromisoformat(sort_key) if sort_key else None, row_id)
+
+class PageParams:
+    def __init__(self, after: Optional[CursorKey], limit: int):
+        self.after = after
+        self.limit = limit
+
+def get_page_params(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+) -> PageParams:
+    """Dependency to read the cursor and page size of a list request."""
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return PageParams(after=after, limit=limit)
+
+def paginate(query, model, after: Optional[CursorKey] = None, limit: int = DEFAULT_PAGE_SIZE, sort_column=None, columns=None) -> dict:
+    """Return one keyset page of a query ordered by (sort_column, id).
+
+    sort_column defaults to created_at. With columns, the page holds row
+    tuples of just those columns (which must include id and the sort column)
+    instead of ORM objects. The previous page's last row is
+    located by primary key, so the comparison uses its stored sort key exactly
+    as the database has it; the timestamp in the cursor is only a fallback for
+    when that row has since been deleted.
+    """
+    if sort_column is None:
+        sort_column = model.created_at
+    if after is not None:
+        sort_key, row_id = after
+        anchor = select(sort_column).where(model.id == row_id).scalar_subquery()
+        key = func.coalesce(anchor, sort_key)
+        # The leading >= is what lets the (sort_column, id) index seek straight
+        # to the page instead of scanning every earlier row.
+        query = query.filter(
+            and_(
+                sort_column >= key,
+                or_(sort_column > key, model.id > row_id)
+            )
+        )
+
+    if columns:
+        query = query.with_entities(*columns)
+    rows = query.order_by(sort_column, model.id).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], sort_column.key), rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
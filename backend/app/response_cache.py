@@ -0,0 +1,54 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Hashable, Optional, Sequence, Tuple
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from . import config
+from .cache import TTLCache, table_versions
+from .serialization import encode_rows
+
+# (path, query, *key) -> (table versions, ETag, JSON body)
+response_cache = TTLCache(maxsize=config.RESPONSE_CACHE_SIZE, ttl=config.RESPONSE_CACHE_TTL)
+
+CACHE_HEADERS = {"Cache-Control": "private, no-cache"}  # Browsers keep the body but revalidate every time
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header names the ETag (weak comparison)."""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+async def cached_response(
+    request: Request,
+    models: Sequence[Any],
+    load: Callable[[], Awaitable[Any]],
+    response_model: Any,
+    key: Tuple[Hashable, ...] = (),
+    columns: Optional[tuple] = None
+) -> Response:
+    """Serve a read-heavy JSON list from the response cache, answering If-None-Match with 304.
+
+    An entry is reused while the version counters of the tables it was read
+    from (``models``) are unchanged and it is younger than RESPONSE_CACHE_TTL,
+    so a repeated poll costs neither a query nor serialization. Counters are
+    read before loading, so a write committed meanwhile invalidates the entry.
+    Pass the fast-path ``columns`` that ``load`` selects to encode its row
+    tuples directly instead of validating ORM objects against response_model.
+    """
+    tables = [model.__tablename__ for model in models]
+    versions = table_versions.get(*tables)
+    cache_key = (request.url.path, request.url.query, *key)
+    entry = response_cache.get(cache_key)
+    if entry is not None and entry[0] == versions:
+        _, etag, body = entry
+    else:
+        if columns is not None:
+            body = encode_rows(await load())
+        else:
+            adapter = TypeAdapter(response_model)
+            body = adapter.dump_json(adapter.validate_python(await load(), from_attributes=True))
+        etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        response_cache.set(cache_key, (versions, etag, body))
+
+    headers = {"ETag": etag, **CACHE_HEADERS}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from .. import config, crud, schemas, auth
+from ..database import get_db, run_in_session
+from ..serialization import encode_rows
+
+router = APIRouter()
+
+@router.get("/patients", response_model=List[schemas.PatientAllergyMatch])
+async def read_patients_with_allergy(
+    allergen: str = Query(..., min_length=1, max_length=100),
+    kind: Optional[schemas.PatientKind] = None,
+    limit: int = Query(100, ge=1, le=config.CLINICAL_FILTER_MAX_RESULTS),
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Patients allergic to allergen, or to any drug in the class allergen names or belongs to."""
+    rows = await run_in_session(
+        db, crud.get_patients_with_allergy, allergen=allergen, kind=kind.value if kind else None, limit=limit
+    )
+    return Response(content=encode_rows(rows), media_type="application/json")
+
+@router.post("/rebuild", response_model=schemas.AllergyRebuild)
+async def rebuild_patient_allergies(
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Re-parse every patient's allergies into the patient_allergies table (admin only)."""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    allergies = await run_in_session(db, crud.rebuild_patient_allergies)
+    return {"allergies": allergies}
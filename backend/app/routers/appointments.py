@@ -1,23 +1,58 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from .. import crud, schemas, auth
-from ..database import get_db
+from .. import crud, models, schemas, auth
+from ..bulk import bulk_result, read_bulk_rows, validate_rows
+from ..database import get_db, run_in_session
+from ..pagination import PageParams, get_page_params
+from ..response_cache import cached_response
+from ..serialization import fast_columns, list_response
 
 router = APIRouter()
 
 # Out-Patient Appointments
-@router.get("/out-patients", response_model=List[schemas.OutPatientAppointment])
-async def read_out_patient_appointments(skip: int = 0, limit: int = 100, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.get_out_patient_appointments(db, skip=skip, limit=limit)
+@router.get("/out-patients", response_model=schemas.Page[schemas.OutPatientAppointment])
+async def read_out_patient_appointments(
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    doctor_id: Optional[str] = None,
+    status: Optional[schemas.AppointmentStatus] = None,
+    page: PageParams = Depends(get_page_params),
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    return await list_response("appointments/out-patients", models.OutPatientAppointment, schemas.OutPatientAppointment, lambda columns: run_in_session(
+        db, crud.get_out_patient_appointments, after=page.after, limit=page.limit,
+        date_from=date_from, date_to=date_to, doctor_id=doctor_id, status=status.value if status else None, columns=columns
+    ))
 
 @router.get("/out-patients/today", response_model=List[schemas.OutPatientAppointment])
-async def read_todays_out_patient_appointments(current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.get_todays_out_patient_appointments(db)
+async def read_todays_out_patient_appointments(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    columns = fast_columns("appointments/out-patients/today", models.OutPatientAppointment, schemas.OutPatientAppointment)
+    return await cached_response(
+        request, [models.OutPatientAppointment], lambda: run_in_session(db, crud.get_todays_out_patient_appointments, columns=columns),
+        List[schemas.OutPatientAppointment], key=(date.today(),), columns=columns
+    )
+
+@router.post("/out-patients/bulk", response_model=schemas.BulkResult)
+async def bulk_create_out_patient_appointments(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.OutPatientAppointmentCreate)
+    for _, row in rows:
+        if not row.doctor_id:
+            row.doctor_id = current_user.id
+    results = await run_in_session(db, crud.bulk_create_out_patient_appointments, appointments=rows)
+    return bulk_result(errors + results)
+
+@router.put("/out-patients/bulk", response_model=schemas.BulkResult)
+async def bulk_update_out_patient_appointments(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.OutPatientAppointmentBulkUpdate)
+    results = await run_in_session(db, crud.bulk_update_out_patient_appointments, appointments=rows)
+    return bulk_result(errors + results)
 
 @router.get("/out-patients/{appointment_id}", response_model=schemas.OutPatientAppointment)
 async def read_out_patient_appointment(appointment_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    appointment = crud.get_out_patient_appointment(db, appointment_id=appointment_id)
+    appointment = await run_in_session(db, crud.get_out_patient_appointment, appointment_id=appointment_id)
     if appointment is None:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return appointment
@@ -26,41 +61,62 @@ async def read_out_patient_appointment(appointment_id: str, current_user: schema
 async def create_out_patient_appointment(appointment: schemas.OutPatientAppointmentCreate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
     if not appointment.doctor_id:
         appointment.doctor_id = current_user.id
-    return crud.create_out_patient_appointment(db=db, appointment=appointment)
+    return await run_in_session(db, crud.create_out_patient_appointment, appointment=appointment)
 
 @router.put("/out-patients/{appointment_id}", response_model=schemas.OutPatientAppointment)
 async def update_out_patient_appointment(appointment_id: str, appointment_update: schemas.OutPatientAppointmentUpdate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    appointment = crud.update_out_patient_appointment(db=db, appointment_id=appointment_id, appointment_update=appointment_update)
+    appointment = await run_in_session(db, crud.update_out_patient_appointment, appointment_id=appointment_id, appointment_update=appointment_update)
     if appointment is None:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return appointment
 
 @router.post("/out-patients/{appointment_id}/cancel", response_model=schemas.OutPatientAppointment)
 async def cancel_out_patient_appointment(appointment_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    appointment = crud.cancel_out_patient_appointment(db=db, appointment_id=appointment_id)
+    appointment = await run_in_session(db, crud.cancel_out_patient_appointment, appointment_id=appointment_id)
     if appointment is None:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return appointment
 
 @router.delete("/out-patients/{appointment_id}")
 async def delete_out_patient_appointment(appointment_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    success = crud.delete_out_patient_appointment(db=db, appointment_id=appointment_id)
+    success = await run_in_session(db, crud.delete_out_patient_appointment, appointment_id=appointment_id)
     if not success:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return {"message": "Appointment deleted successfully"}
 
 # In-Patient Admissions
-@router.get("/in-patients", response_model=List[schemas.InPatientAdmission])
-async def read_in_patient_admissions(skip: int = 0, limit: int = 100, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.get_in_patient_admissions(db, skip=skip, limit=limit)
+@router.get("/in-patients", response_model=schemas.Page[schemas.InPatientAdmission])
+async def read_in_patient_admissions(page: PageParams = Depends(get_page_params), current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    return await list_response("appointments/in-patients", models.InPatientAdmission, schemas.InPatientAdmission, lambda columns: run_in_session(
+        db, crud.get_in_patient_admissions, after=page.after, limit=page.limit, columns=columns
+    ))
 
 @router.get("/in-patients/active", response_model=List[schemas.InPatientAdmission])
-async def read_active_in_patient_admissions(current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.get_active_in_patient_admissions(db)
+async def read_active_in_patient_admissions(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    columns = fast_columns("appointments/in-patients/active", models.InPatientAdmission, schemas.InPatientAdmission)
+    return await cached_response(
+        request, [models.InPatientAdmission], lambda: run_in_session(db, crud.get_active_in_patient_admissions, columns=columns),
+        List[schemas.InPatientAdmission], columns=columns
+    )
+
+@router.post("/in-patients/bulk", response_model=schemas.BulkResult)
+async def bulk_create_in_patient_admissions(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.InPatientAdmissionCreate)
+    for _, row in rows:
+        if not row.admitting_doctor_id:
+            row.admitting_doctor_id = current_user.id
+    results = await run_in_session(db, crud.bulk_create_in_patient_admissions, admissions=rows)
+    return bulk_result(errors + results)
+
+@router.put("/in-patients/bulk", response_model=schemas.BulkResult)
+async def bulk_update_in_patient_admissions(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.InPatientAdmissionBulkUpdate)
+    results = await run_in_session(db, crud.bulk_update_in_patient_admissions, admissions=rows)
+    return bulk_result(errors + results)
 
 @router.get("/in-patients/{admission_id}", response_model=schemas.InPatientAdmission)
 async def read_in_patient_admission(admission_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    admission = crud.get_in_patient_admission(db, admission_id=admission_id)
+    admission = await run_in_session(db, crud.get_in_patient_admission, admission_id=admission_id)
     if admission is None:
         raise HTTPException(status_code=404, detail="Admission not found")
     return admission
@@ -69,25 +125,25 @@ async def read_in_patient_admission(admission_id: str, current_user: schemas.Use
 async def create_in_patient_admission(admission: schemas.InPatientAdmissionCreate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
     if not admission.admitting_doctor_id:
         admission.admitting_doctor_id = current_user.id
-    return crud.create_in_patient_admission(db=db, admission=admission)
+    return await run_in_session(db, crud.create_in_patient_admission, admission=admission)
 
 @router.put("/in-patients/{admission_id}", response_model=schemas.InPatientAdmission)
 async def update_in_patient_admission(admission_id: str, admission_update: schemas.InPatientAdmissionUpdate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    admission = crud.update_in_patient_admission(db=db, admission_id=admission_id, admission_update=admission_update)
+    admission = await run_in_session(db, crud.update_in_patient_admission, admission_id=admission_id, admission_update=admission_update)
     if admission is None:
         raise HTTPException(status_code=404, detail="Admission not found")
     return admission
 
 @router.post("/in-patients/{admission_id}/discharge", response_model=schemas.InPatientAdmission)
 async def discharge_in_patient_admission(admission_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    admission = crud.discharge_in_patient_admission(db=db, admission_id=admission_id)
+    admission = await run_in_session(db, crud.discharge_in_patient_admission, admission_id=admission_id)
     if admission is None:
         raise HTTPException(status_code=404, detail="Admission not found")
     return admission
 
 @router.delete("/in-patients/{admission_id}")
 async def delete_in_patient_admission(admission_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    success = crud.delete_in_patient_admission(db=db, admission_id=admission_id)
+    success = await run_in_session(db, crud.delete_in_patient_admission, admission_id=admission_id)
     if not success:
         raise HTTPException(status_code=404, detail="Admission not found")
     return {"message": "Admission deleted successfully"} 
\ No newline at end of file
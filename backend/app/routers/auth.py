@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from .. import crud, schemas, auth
-from ..database import get_db
+from ..database import get_db, run_in_session
 
 router = APIRouter()
 
@@ -13,7 +13,7 @@ async def login_for_access_token(
     db: Session = Depends(get_db)
 ):
     """Login endpoint to get access token."""
-    user = auth.authenticate_user(db, form_data.username, form_data.password)
+    user = await auth.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -23,7 +23,7 @@ async def login_for_access_token(
     
     access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = auth.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=auth.get_token_claims(user), expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -35,14 +35,15 @@ async def register_user(
 ):
     """Register a new user."""
     # Check if user already exists
-    db_user = crud.get_user_by_email(db, email=user.email)
+    db_user = await run_in_session(db, crud.get_user_by_email, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    return crud.create_user(db=db, user=user)
+    hashed_password = await auth.get_password_hash_async(user.password)
+    return await run_in_session(db, crud.create_user, user=user, hashed_password=hashed_password)
 
 @router.get("/me", response_model=schemas.User)
 async def read_users_me(current_user: schemas.User = Depends(auth.get_current_active_user)):
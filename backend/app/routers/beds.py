@@ -0,0 +1,62 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from .. import crud, schemas, auth
+from ..beds import bed_index
+from ..database import get_db, run_in_session
+
+router = APIRouter()
+
+async def load_bed_index(db: Session):
+    """Reload the in-memory bed map from the beds table once it has gone stale."""
+    if bed_index.is_stale():
+        generation = bed_index.begin_load()
+        bed_index.finish_load(await run_in_session(db, crud.get_beds), generation)
+
+@router.get("/wards", response_model=List[schemas.WardOccupancy])
+async def read_ward_occupancy(
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Bed, occupied and free counts per ward."""
+    await load_bed_index(db)
+    return bed_index.summary()
+
+@router.get("/wards/{ward_type}/free", response_model=List[schemas.FreeBed])
+async def read_free_beds(
+    ward_type: schemas.WardType,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Free beds in one ward."""
+    await load_bed_index(db)
+    return [{"room_number": room, "bed_number": bed} for room, bed in bed_index.free_beds(ward_type.value)]
+
+@router.post("/", response_model=schemas.BedsAdded)
+async def create_beds(
+    beds: List[schemas.BedCreate],
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Register beds in the ward inventory (admin only)."""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    added = await run_in_session(db, crud.create_beds, beds=beds)
+    return {"added": added}
+
+@router.post("/rebuild", response_model=schemas.BedRebuild)
+async def rebuild_bed_occupancy(
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Re-derive bed occupancy from admitted in-patients (admin only)."""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    occupied = await run_in_session(db, crud.rebuild_bed_occupancy)
+    return {"occupied": occupied}
@@ -0,0 +1,48 @@
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+from .. import config, schemas, auth
+from ..change_feed import RESET, change_feed
+
+router = APIRouter()
+
+def format_event(event: dict) -> str:
+    """Encode a change event as a server-sent event."""
+    if event is RESET:
+        return "event: reset\ndata: {}\n\n"
+    data = json.dumps({"op": event["op"], "id": event["id"], "data": event["data"]})
+    return f"id: {event['seq']}\nevent: {event['topic']}\ndata: {data}\n\n"
+
+@router.get("/stream")
+async def stream_changes(
+    topics: List[schemas.ChangeTopic] = Query(default=list(schemas.ChangeTopic)),
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[int] = Header(default=None, alias="Last-Event-ID"),
+    current_user: schemas.User = Depends(auth.get_current_stream_user)
+):
+    """Stream appointment and admission changes as server-sent events.
+
+    Each event is named after its topic and carries {"op", "id", "data"}.
+    Reconnecting clients resume after Last-Event-ID; a "reset" event means
+    changes were missed and lists should be refetched.
+    """
+    resume_after = last_event_id_header if last_event_id_header is not None else last_event_id
+
+    async def events():
+        async with change_feed.subscribe([topic.value for topic in topics], last_event_id=resume_after) as sub:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.get(), config.CHANGE_FEED_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,47 +1,86 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from .. import crud, schemas, auth
-from ..database import get_db
+from .. import crud, models, schemas, auth
+from ..bulk import bulk_result, read_bulk_rows, validate_rows
+from ..database import get_db, run_in_session
+from ..export import export_response
+from ..pagination import PageParams, get_page_params
+from ..response_cache import cached_response
+from ..serialization import fast_columns, list_response
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.InPatient])
-async def read_in_patients(skip: int = 0, limit: int = 100, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.get_in_patients(db, skip=skip, limit=limit)
+@router.get("/", response_model=schemas.Page[schemas.InPatient])
+async def read_in_patients(page: PageParams = Depends(get_page_params), current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    return await list_response("in-patients", models.InPatient, schemas.InPatient, lambda columns: run_in_session(
+        db, crud.get_in_patients, after=page.after, limit=page.limit, columns=columns
+    ))
 
 @router.get("/admitted", response_model=List[schemas.InPatient])
-async def read_admitted_in_patients(current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.get_admitted_in_patients(db)
+async def read_admitted_in_patients(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    columns = fast_columns("in-patients/admitted", models.InPatient, schemas.InPatient)
+    return await cached_response(
+        request, [models.InPatient], lambda: run_in_session(db, crud.get_admitted_in_patients, columns=columns),
+        List[schemas.InPatient], columns=columns
+    )
+
+@router.get("/export")
+async def export_in_patients(format: schemas.ExportFormat = schemas.ExportFormat.ndjson, since: Optional[datetime] = None, current_user: schemas.User = Depends(auth.get_current_active_user)):
+    return export_response(models.InPatient, format.value, since=since)
+
+@router.get("/rounds/export")
+async def export_in_patient_rounds(format: schemas.ExportFormat = schemas.ExportFormat.ndjson, since: Optional[datetime] = None, current_user: schemas.User = Depends(auth.get_current_active_user)):
+    return export_response(models.InPatientRound, format.value, since=since)
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+async def bulk_create_in_patients(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.InPatientCreate)
+    results = await run_in_session(db, crud.bulk_create_in_patients, patients=rows)
+    return bulk_result(errors + results)
+
+@router.put("/bulk", response_model=schemas.BulkResult)
+async def bulk_update_in_patients(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.InPatientBulkUpdate)
+    results = await run_in_session(db, crud.bulk_update_in_patients, patients=rows)
+    return bulk_result(errors + results)
 
 @router.get("/{patient_id}", response_model=schemas.InPatient)
 async def read_in_patient(patient_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    in_patient = crud.get_in_patient(db, patient_id=patient_id)
+    in_patient = await run_in_session(db, crud.get_in_patient, patient_id=patient_id)
     if in_patient is None:
         raise HTTPException(status_code=404, detail="In-patient not found")
     return in_patient
 
+@router.get("/{patient_id}/chart", response_model=schemas.InPatientChart)
+async def read_in_patient_chart(patient_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    chart = await run_in_session(db, crud.get_in_patient_chart, patient_id=patient_id)
+    if chart is None:
+        raise HTTPException(status_code=404, detail="In-patient not found")
+    return chart
+
 @router.post("/", response_model=schemas.InPatient)
 async def create_in_patient(in_patient: schemas.InPatientCreate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.create_in_patient(db=db, patient=in_patient)
+    return await run_in_session(db, crud.create_in_patient, patient=in_patient)
 
 @router.put("/{patient_id}", response_model=schemas.InPatient)
 async def update_in_patient(patient_id: str, in_patient_update: schemas.InPatientUpdate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    in_patient = crud.update_in_patient(db=db, patient_id=patient_id, patient_update=in_patient_update)
+    in_patient = await run_in_session(db, crud.update_in_patient, patient_id=patient_id, patient_update=in_patient_update)
     if in_patient is None:
         raise HTTPException(status_code=404, detail="In-patient not found")
     return in_patient
 
 @router.post("/{patient_id}/discharge", response_model=schemas.InPatient)
 async def discharge_in_patient(patient_id: str, discharge_diagnosis: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    in_patient = crud.discharge_in_patient(db=db, patient_id=patient_id, discharge_diagnosis=discharge_diagnosis, discharge_doctor_id=current_user.id)
+    in_patient = await run_in_session(db, crud.discharge_in_patient, patient_id=patient_id, discharge_diagnosis=discharge_diagnosis, discharge_doctor_id=current_user.id)
     if in_patient is None:
         raise HTTPException(status_code=404, detail="In-patient not found")
     return in_patient
 
 @router.delete("/{patient_id}")
 async def delete_in_patient(patient_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    success = crud.delete_in_patient(db=db, patient_id=patient_id)
+    success = await run_in_session(db, crud.delete_in_patient, patient_id=patient_id)
     if not success:
         raise HTTPException(status_code=404, detail="In-patient not found")
     return {"message": "In-patient deleted successfully"} 
\ No newline at end of file
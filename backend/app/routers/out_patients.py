@@ -1,36 +1,70 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from .. import crud, schemas, auth
-from ..database import get_db
+from .. import crud, models, schemas, auth
+from ..bulk import bulk_result, read_bulk_rows, validate_rows
+from ..database import get_db, run_in_session
+from ..export import export_response
+from ..pagination import PageParams, get_page_params
+from ..serialization import list_response
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.OutPatient])
-async def read_out_patients(skip: int = 0, limit: int = 100, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.get_out_patients(db, skip=skip, limit=limit)
+@router.get("/", response_model=schemas.Page[schemas.OutPatient])
+async def read_out_patients(page: PageParams = Depends(get_page_params), current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    return await list_response("out-patients", models.OutPatient, schemas.OutPatient, lambda columns: run_in_session(
+        db, crud.get_out_patients, after=page.after, limit=page.limit, columns=columns
+    ))
+
+@router.get("/export")
+async def export_out_patients(format: schemas.ExportFormat = schemas.ExportFormat.ndjson, since: Optional[datetime] = None, current_user: schemas.User = Depends(auth.get_current_active_user)):
+    return export_response(models.OutPatient, format.value, since=since)
+
+@router.get("/visits/export")
+async def export_out_patient_visits(format: schemas.ExportFormat = schemas.ExportFormat.ndjson, since: Optional[datetime] = None, current_user: schemas.User = Depends(auth.get_current_active_user)):
+    return export_response(models.OutPatientVisit, format.value, since=since)
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+async def bulk_create_out_patients(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.OutPatientCreate)
+    results = await run_in_session(db, crud.bulk_create_out_patients, patients=rows)
+    return bulk_result(errors + results)
+
+@router.put("/bulk", response_model=schemas.BulkResult)
+async def bulk_update_out_patients(request: Request, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    rows, errors = validate_rows(await read_bulk_rows(request), schemas.OutPatientBulkUpdate)
+    results = await run_in_session(db, crud.bulk_update_out_patients, patients=rows)
+    return bulk_result(errors + results)
 
 @router.get("/{patient_id}", response_model=schemas.OutPatient)
 async def read_out_patient(patient_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    out_patient = crud.get_out_patient(db, patient_id=patient_id)
+    out_patient = await run_in_session(db, crud.get_out_patient, patient_id=patient_id)
     if out_patient is None:
         raise HTTPException(status_code=404, detail="Out-patient not found")
     return out_patient
 
+@router.get("/{patient_id}/chart", response_model=schemas.OutPatientChart)
+async def read_out_patient_chart(patient_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
+    chart = await run_in_session(db, crud.get_out_patient_chart, patient_id=patient_id)
+    if chart is None:
+        raise HTTPException(status_code=404, detail="Out-patient not found")
+    return chart
+
 @router.post("/", response_model=schemas.OutPatient)
 async def create_out_patient(out_patient: schemas.OutPatientCreate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    return crud.create_out_patient(db=db, patient=out_patient)
+    return await run_in_session(db, crud.create_out_patient, patient=out_patient)
 
 @router.put("/{patient_id}", response_model=schemas.OutPatient)
 async def update_out_patient(patient_id: str, out_patient_update: schemas.OutPatientUpdate, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    out_patient = crud.update_out_patient(db=db, patient_id=patient_id, patient_update=out_patient_update)
+    out_patient = await run_in_session(db, crud.update_out_patient, patient_id=patient_id, patient_update=out_patient_update)
     if out_patient is None:
         raise HTTPException(status_code=404, detail="Out-patient not found")
     return out_patient
 
 @router.delete("/{patient_id}")
 async def delete_out_patient(patient_id: str, current_user: schemas.User = Depends(auth.get_current_active_user), db: Session = Depends(get_db)):
-    success = crud.delete_out_patient(db=db, patient_id=patient_id)
+    success = await run_in_session(db, crud.delete_out_patient, patient_id=patient_id)
     if not success:
         raise HTTPException(status_code=404, detail="Out-patient not found")
     return {"message": "Out-patient deleted successfully"} 
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+from .. import crud, schemas, auth
+from ..database import get_db, run_in_session
+from ..serialization import encode_rows
+
+router = APIRouter()
+
+@router.get("/medications/administration", response_model=List[schemas.MedicationAdministration])
+async def read_medication_administration_list(
+    ward_type: Optional[schemas.WardType] = None,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Active medications of every admitted patient in a ward, or the whole hospital without ward_type."""
+    rows = await run_in_session(
+        db, crud.get_medication_administration_list, ward_type=ward_type.value if ward_type else None
+    )
+    # Rows are already shaped like the response model, so they are encoded directly
+    return Response(content=encode_rows(rows), media_type="application/json")
+
+@router.get("/{round_id}", response_model=schemas.InPatientRoundWithMedications)
+async def read_round(
+    round_id: str,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """An in-patient round with its medications."""
+    db_round = await run_in_session(db, crud.get_in_patient_round_with_medications, round_id=round_id)
+    if db_round is None:
+        raise HTTPException(status_code=404, detail="Round not found")
+    return db_round
+
+@router.post("/", response_model=schemas.InPatientRoundPrescribed)
+async def create_round(
+    round_data: schemas.InPatientRoundWithMedicationsCreate,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Record a round together with its medications; all or nothing is saved.
+
+    Each medication comes back with allergy_warnings for the patient's recorded allergies.
+    """
+    if not round_data.doctor_id:
+        round_data.doctor_id = current_user.id
+    db_round = await run_in_session(db, crud.create_in_patient_round, round_data=round_data, medications=round_data.medications)
+    if db_round is None:
+        raise HTTPException(status_code=404, detail="In-patient not found")
+    return db_round
+
+@router.put("/{round_id}", response_model=schemas.InPatientRound)
+async def update_round(
+    round_id: str,
+    round_update: schemas.InPatientRoundUpdate,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    db_round = await run_in_session(db, crud.update_in_patient_round, round_id=round_id, round_update=round_update)
+    if db_round is None:
+        raise HTTPException(status_code=404, detail="Round not found")
+    return db_round
+
+@router.delete("/{round_id}")
+async def delete_round(
+    round_id: str,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a round and its medications."""
+    success = await run_in_session(db, crud.delete_in_patient_round, round_id=round_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Round not found")
+    return {"message": "Round deleted successfully"}
+
+@router.post("/{round_id}/medications", response_model=List[schemas.InPatientMedicationChecked])
+async def create_round_medications(
+    round_id: str,
+    medications: List[schemas.InPatientMedicationLine],
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Add medication lines to an existing round in one transaction, with their allergy warnings."""
+    db_medications = await run_in_session(db, crud.create_in_patient_medications, round_id=round_id, medications=medications)
+    if db_medications is None:
+        raise HTTPException(status_code=404, detail="Round not found")
+    return db_medications
+
+@router.put("/medications/{medication_id}", response_model=schemas.InPatientMedication)
+async def update_round_medication(
+    medication_id: int,
+    medication_update: schemas.InPatientMedicationUpdate,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    medication = await run_in_session(
+        db, crud.update_in_patient_medication, medication_id=medication_id, medication_update=medication_update
+    )
+    if medication is None:
+        raise HTTPException(status_code=404, detail="Medication not found")
+    return medication
+
+@router.delete("/medications/{medication_id}")
+async def delete_round_medication(
+    medication_id: int,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    success = await run_in_session(db, crud.delete_in_patient_medication, medication_id=medication_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Medication not found")
+    return {"message": "Medication deleted successfully"}
+
+@router.post("/medications/{medication_id}/discontinue", response_model=schemas.InPatientMedication)
+async def discontinue_round_medication(
+    medication_id: int,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Stop a medication now, keeping it on the chart as discontinued."""
+    medication = await run_in_session(db, crud.discontinue_medication, medication_id=medication_id)
+    if medication is None:
+        raise HTTPException(status_code=404, detail="Medication not found")
+    return medication
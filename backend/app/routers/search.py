@@ -0,0 +1,32 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from .. import config, crud, schemas, auth
+from ..database import get_db, run_in_session
+
+router = APIRouter()
+
+@router.get("/patients", response_model=List[schemas.PatientSearchResult])
+async def search_patients(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[schemas.PatientKind] = None,
+    limit: int = Query(20, ge=1, le=config.SEARCH_MAX_RESULTS),
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Out- and in-patients whose name, phone, email or diagnoses start with each word of q."""
+    return await run_in_session(db, crud.search_patients, q=q, kind=kind.value if kind else None, limit=limit)
+
+@router.post("/rebuild", response_model=schemas.SearchRebuild)
+async def rebuild_patient_search(
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Recompute the patient search index from the patient, visit and round tables (admin only)."""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    documents = await run_in_session(db, crud.rebuild_patient_search)
+    return {"documents": documents}
@@ -1,15 +1,16 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from .. import crud, schemas, auth
-from ..database import get_db
+from .. import crud, models, schemas, auth
+from ..database import get_db, run_in_session
+from ..pagination import PageParams, get_page_params
+from ..serialization import list_response
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.User])
+@router.get("/", response_model=schemas.Page[schemas.User])
 async def read_users(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(get_page_params),
     current_user: schemas.User = Depends(auth.get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -19,8 +20,9 @@ async def read_users(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    users = crud.get_users(db, skip=skip, limit=limit)
-    return users
+    return await list_response("users", models.User, schemas.User, lambda columns: run_in_session(
+        db, crud.get_users, after=page.after, limit=page.limit, columns=columns
+    ))
 
 @router.get("/{user_id}", response_model=schemas.User)
 async def read_user(
@@ -36,7 +38,7 @@ async def read_user(
             detail="Not enough permissions"
         )
     
-    user = crud.get_user(db, user_id=user_id)
+    user = await run_in_session(db, crud.get_user, user_id=user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -54,11 +56,12 @@ async def create_user(
             detail="Not enough permissions"
         )
     
-    db_user = crud.get_user_by_email(db, email=user.email)
+    db_user = await run_in_session(db, crud.get_user_by_email, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    return crud.create_user(db=db, user=user)
+    hashed_password = await auth.get_password_hash_async(user.password)
+    return await run_in_session(db, crud.create_user, user=user, hashed_password=hashed_password)
 
 @router.put("/{user_id}", response_model=schemas.User)
 async def update_user(
@@ -75,7 +78,10 @@ async def update_user(
             detail="Not enough permissions"
         )
     
-    user = crud.update_user(db=db, user_id=user_id, user_update=user_update)
+    hashed_password = None
+    if user_update.password is not None:
+        hashed_password = await auth.get_password_hash_async(user_update.password)
+    user = await run_in_session(db, crud.update_user, user_id=user_id, user_update=user_update, hashed_password=hashed_password)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -93,7 +99,7 @@ async def delete_user(
             detail="Not enough permissions"
         )
     
-    success = crud.delete_user(db=db, user_id=user_id)
+    success = await run_in_session(db, crud.delete_user, user_id=user_id)
     if not success:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -0,0 +1,98 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from .. import crud, schemas, auth
+from ..database import get_db, run_in_session
+
+router = APIRouter()
+
+@router.get("/{visit_id}", response_model=schemas.OutPatientVisitWithMedications)
+async def read_visit(
+    visit_id: str,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """An out-patient visit with its prescriptions."""
+    visit = await run_in_session(db, crud.get_out_patient_visit_with_medications, visit_id=visit_id)
+    if visit is None:
+        raise HTTPException(status_code=404, detail="Visit not found")
+    return visit
+
+@router.post("/", response_model=schemas.OutPatientVisitPrescribed)
+async def create_visit(
+    visit: schemas.OutPatientVisitWithMedicationsCreate,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Record a visit together with its prescriptions; all or nothing is saved.
+
+    Each medication comes back with allergy_warnings for the patient's recorded allergies.
+    """
+    if not visit.doctor_id:
+        visit.doctor_id = current_user.id
+    db_visit = await run_in_session(db, crud.create_out_patient_visit, visit=visit, medications=visit.medications)
+    if db_visit is None:
+        raise HTTPException(status_code=404, detail="Out-patient not found")
+    return db_visit
+
+@router.put("/{visit_id}", response_model=schemas.OutPatientVisit)
+async def update_visit(
+    visit_id: str,
+    visit_update: schemas.OutPatientVisitUpdate,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    visit = await run_in_session(db, crud.update_out_patient_visit, visit_id=visit_id, visit_update=visit_update)
+    if visit is None:
+        raise HTTPException(status_code=404, detail="Visit not found")
+    return visit
+
+@router.delete("/{visit_id}")
+async def delete_visit(
+    visit_id: str,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Delete a visit and its prescriptions."""
+    success = await run_in_session(db, crud.delete_out_patient_visit, visit_id=visit_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Visit not found")
+    return {"message": "Visit deleted successfully"}
+
+@router.post("/{visit_id}/medications", response_model=List[schemas.OutPatientMedicationChecked])
+async def create_visit_medications(
+    visit_id: str,
+    medications: List[schemas.OutPatientMedicationLine],
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Add prescription lines to an existing visit in one transaction, with their allergy warnings."""
+    db_medications = await run_in_session(db, crud.create_out_patient_medications, visit_id=visit_id, medications=medications)
+    if db_medications is None:
+        raise HTTPException(status_code=404, detail="Visit not found")
+    return db_medications
+
+@router.put("/medications/{medication_id}", response_model=schemas.OutPatientMedication)
+async def update_visit_medication(
+    medication_id: int,
+    medication_update: schemas.OutPatientMedicationUpdate,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    medication = await run_in_session(
+        db, crud.update_out_patient_medication, medication_id=medication_id, medication_update=medication_update
+    )
+    if medication is None:
+        raise HTTPException(status_code=404, detail="Medication not found")
+    return medication
+
+@router.delete("/medications/{medication_id}")
+async def delete_visit_medication(
+    medication_id: int,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    success = await run_in_session(db, crud.delete_out_patient_medication, medication_id=medication_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Medication not found")
+    return {"message": "Medication deleted successfully"}
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from .. import config, crud, schemas, auth
+from ..database import get_db, run_in_session
+from ..serialization import dumps, encode_rows
+from ..vitals_series import vitals_series
+
+router = APIRouter()
+
+async def load_vitals_series(db: Session):
+    """Reload the vitals series once stale, else re-read the patients whose rounds changed since."""
+    if vitals_series.is_stale():
+        vitals_series.take_dirty()
+        vitals_series.load(await run_in_session(db, crud.get_vitals_rows))
+        return
+    patient_ids = vitals_series.take_dirty()
+    if patient_ids:
+        vitals_series.update(patient_ids, await run_in_session(db, crud.get_vitals_rows, patient_ids=patient_ids))
+
+@router.get("/board", response_model=List[schemas.VitalsBoardEntry])
+async def read_deterioration_board(
+    ward_type: Optional[schemas.WardType] = None,
+    min_score: int = Query(0, ge=0),
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """NEWS2 early warning scores of every admitted patient, or one ward's, highest first."""
+    await load_vitals_series(db)
+    patients = await run_in_session(db, crud.get_admitted_beds, ward_type=ward_type.value if ward_type else None)
+    return Response(content=dumps(vitals_series.board(patients, min_score=min_score)), media_type="application/json")
+
+@router.get("/patients/{patient_id}/series", response_model=schemas.VitalsSeries)
+async def read_vitals_series(
+    patient_id: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    points: int = Query(200, ge=1, le=config.VITALS_SERIES_MAX_POINTS),
+    window: int = Query(config.VITALS_ROLLING_WINDOW, ge=1, le=100),
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """A patient's vital signs over time, downsampled to at most `points` buckets, with rolling statistics."""
+    await load_vitals_series(db)
+    series = vitals_series.series(patient_id, date_from=date_from, date_to=date_to, points=points, window=window)
+    if series is None:
+        raise HTTPException(status_code=404, detail="No vital signs recorded for this patient")
+    return Response(content=dumps(series), media_type="application/json")
+
+@router.get("/rounds", response_model=List[schemas.RoundVitalsReading])
+async def read_round_vitals(
+    patient_id: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    spo2_below: Optional[float] = None,
+    spo2_above: Optional[float] = None,
+    pulse_below: Optional[float] = None,
+    pulse_above: Optional[float] = None,
+    temperature_below: Optional[float] = None,
+    temperature_above: Optional[float] = None,
+    bp_systolic_below: Optional[float] = None,
+    bp_systolic_above: Optional[float] = None,
+    limit: int = Query(100, ge=1, le=config.CLINICAL_FILTER_MAX_RESULTS),
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Rounds whose recorded vital signs are strictly below or above the given values (temperature in °C), newest first."""
+    ranges = {
+        column: (above, below)
+        for column, above, below in (
+            ("spo2", spo2_above, spo2_below),
+            ("pulse", pulse_above, pulse_below),
+            ("temperature", temperature_above, temperature_below),
+            ("bp_systolic", bp_systolic_above, bp_systolic_below),
+        )
+        if above is not None or below is not None
+    }
+    rows = await run_in_session(
+        db, crud.get_round_vitals,
+        ranges=ranges, patient_id=patient_id, date_from=date_from, date_to=date_to, limit=limit
+    )
+    return Response(content=encode_rows(rows), media_type="application/json")
+
+@router.post("/rebuild", response_model=schemas.VitalsRebuild)
+async def rebuild_round_vitals(
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Re-parse every round's vital signs into the round_vitals table (admin only)."""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    rounds = await run_in_session(db, crud.rebuild_round_vitals)
+    return {"rounds": rounds}
@@ -0,0 +1,45 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from .. import crud, schemas, auth
+from ..database import get_db, run_in_session
+
+router = APIRouter()
+
+@router.get("/doctors", response_model=List[schemas.DoctorWorkload])
+async def read_doctor_workload(
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    doctor_id: Optional[str] = None,
+    kind: Optional[schemas.WorkloadKind] = None,
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Visits, rounds and appointments per doctor per day in [from, to), by status."""
+    # Doctors see their own workload; admins can see every doctor's
+    if current_user.role != "admin":
+        if doctor_id and doctor_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        doctor_id = current_user.id
+    return await run_in_session(
+        db, crud.get_doctor_workload, date_from=date_from, date_to=date_to,
+        doctor_id=doctor_id, kind=kind.value if kind else None
+    )
+
+@router.post("/rebuild", response_model=schemas.WorkloadRebuild)
+async def rebuild_doctor_workload(
+    current_user: schemas.User = Depends(auth.get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Recompute the workload summary from the visit, round and appointment tables (admin only)."""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    rows = await run_in_session(db, crud.rebuild_doctor_workload)
+    return {"rows": rows}
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Dict, Generic, Optional, List, TypeVar
 from datetime import datetime, date
 from enum import Enum
 
@@ -86,6 +86,15 @@ class FeedbackCategory(str, Enum):
     facilities = "facilities"
     overall = "overall"
 
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+class WorkloadKind(str, Enum):
+    visit = "visit"
+    round = "round"
+    appointment = "appointment"
+
 # Base schemas
 class UserBase(BaseModel):
     name: str
@@ -328,6 +337,45 @@ class InPatientMedication(InPatientMedicationBase):
     class Config:
         from_attributes = True
 
+# Prescription lines sent together with their visit or round
+class OutPatientMedicationLine(BaseModel):
+    name: str
+    dosage: str
+    frequency: str
+    duration: str
+
+class InPatientMedicationLine(BaseModel):
+    name: str
+    dosage: str
+    frequency: str
+    duration: str
+    route: MedicationRoute = MedicationRoute.oral
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    status: MedicationStatus = MedicationStatus.active
+
+class OutPatientVisitWithMedicationsCreate(OutPatientVisitCreate):
+    medications: List[OutPatientMedicationLine] = []
+
+class InPatientRoundWithMedicationsCreate(InPatientRoundCreate):
+    medications: List[InPatientMedicationLine] = []
+
+# One active prescription of an admitted patient, as listed for a ward medication round
+class MedicationAdministration(BaseModel):
+    patient_id: str
+    patient_name: str
+    ward_type: Optional[str] = None
+    room_number: Optional[str] = None
+    bed_number: Optional[str] = None
+    medication_id: int
+    round_id: str
+    name: str
+    dosage: str
+    frequency: str
+    route: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
 # Appointment schemas
 class OutPatientAppointmentBase(BaseModel):
     patient_id: str
@@ -438,6 +486,180 @@ class OutPatientVisitWithMedications(OutPatientVisit):
 class InPatientRoundWithMedications(InPatientRound):
     medications: List[InPatientMedication] = []
 
+# Create responses: each new medication with the allergy warnings raised when it was prescribed
+class AllergyWarning(BaseModel):
+    allergy: str  # As recorded on the patient
+    drug_class: Optional[str] = None
+    severity: str  # contraindicated or caution (cross-reactive class)
+    message: str
+
+class OutPatientMedicationChecked(OutPatientMedication):
+    allergy_warnings: List[AllergyWarning] = []
+
+class InPatientMedicationChecked(InPatientMedication):
+    allergy_warnings: List[AllergyWarning] = []
+
+class OutPatientVisitPrescribed(OutPatientVisit):
+    medications: List[OutPatientMedicationChecked] = []
+
+class InPatientRoundPrescribed(InPatientRound):
+    medications: List[InPatientMedicationChecked] = []
+
+# Patient charts: full history with nested medications
+class OutPatientChart(OutPatient):
+    visits: List[OutPatientVisitWithMedications] = []
+    appointments: List[OutPatientAppointment] = []
+
+class InPatientChart(InPatient):
+    rounds: List[InPatientRoundWithMedications] = []
+    admissions: List[InPatientAdmission] = []
+
+# Patient search schemas
+class PatientKind(str, Enum):
+    out_patient = "out-patient"
+    in_patient = "in-patient"
+
+class PatientSearchResult(BaseModel):
+    id: str
+    kind: PatientKind
+    name: str
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    score: float
+
+class SearchRebuild(BaseModel):
+    documents: int
+
+# Allergy and vital sign filter schemas
+class PatientAllergyMatch(BaseModel):
+    kind: PatientKind
+    patient_id: str
+    patient_name: str
+    allergy: str  # As recorded on the patient
+    drug_class: Optional[str] = None
+
+class AllergyRebuild(BaseModel):
+    allergies: int
+
+class RoundVitalsReading(BaseModel):
+    round_id: str
+    patient_id: str
+    date: datetime
+    bp_systolic: Optional[float] = None
+    bp_diastolic: Optional[float] = None
+    pulse: Optional[float] = None
+    temperature: Optional[float] = None
+    spo2: Optional[float] = None
+    respiratory_rate: Optional[float] = None
+
+class VitalsRebuild(BaseModel):
+    rounds: int
+
+class VitalsBoardEntry(BaseModel):
+    patient_id: str
+    patient_name: str
+    ward_type: Optional[str] = None
+    room_number: Optional[str] = None
+    bed_number: Optional[str] = None
+    observed_at: Optional[datetime] = None  # Latest round with vitals; None when none are recorded
+    news2: Optional[int] = None  # From each metric's latest reading within VITALS_MAX_AGE_HOURS of now; None without one
+    risk: Optional[str] = None  # low, low-medium, medium or high
+    red_flag: Optional[bool] = None  # A single metric scored 3
+    news2_previous: Optional[int] = None  # As of the round before
+    news2_rolling_mean: Optional[float] = None
+    bp_systolic: Optional[float] = None
+    bp_diastolic: Optional[float] = None
+    pulse: Optional[float] = None
+    temperature: Optional[float] = None
+    spo2: Optional[float] = None
+    respiratory_rate: Optional[float] = None
+
+class VitalsSeriesMetric(BaseModel):
+    mean: List[Optional[float]]
+    min: List[Optional[float]]
+    max: List[Optional[float]]
+    rolling_mean: List[Optional[float]]
+    rolling_std: List[Optional[float]]
+
+class VitalsSeries(BaseModel):
+    patient_id: str
+    times: List[datetime]  # First reading of each bucket
+    readings: List[int]  # Rounds in each bucket
+    news2: List[int]  # Highest score in each bucket
+    metrics: Dict[str, VitalsSeriesMetric]
+
+# Bed occupancy schemas
+class BedCreate(BaseModel):
+    ward_type: WardType
+    room_number: str
+    bed_number: str
+
+class FreeBed(BaseModel):
+    room_number: str
+    bed_number: str
+
+class WardOccupancy(BaseModel):
+    ward_type: str
+    beds: int
+    occupied: int
+    free: int
+
+class BedsAdded(BaseModel):
+    added: int
+
+class BedRebuild(BaseModel):
+    occupied: int
+
+# Doctor workload schemas
+class DoctorWorkload(BaseModel):
+    doctor_id: str
+    day: date
+    kind: WorkloadKind
+    status: str  # Appointment status; empty for visits and rounds
+    count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class WorkloadRebuild(BaseModel):
+    rows: int
+
+# Change feed schemas
+class ChangeTopic(str, Enum):
+    appointments = "appointments"
+    admissions = "admissions"
+
+# Bulk import schemas
+class OutPatientBulkUpdate(OutPatientUpdate):
+    id: str
+
+class InPatientBulkUpdate(InPatientUpdate):
+    id: str
+
+class OutPatientAppointmentBulkUpdate(OutPatientAppointmentUpdate):
+    id: str
+
+class InPatientAdmissionBulkUpdate(InPatientAdmissionUpdate):
+    id: str
+
+class BulkRowResult(BaseModel):
+    index: int  # Position of the row in the request
+    status: str  # created, updated, invalid or not_found
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    results: List[BulkRowResult]
+
+# Paginated list response
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to fetch the next page
+
 # Token schemas
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,83 @@
+import json
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, List, Optional
+from fastapi import Response
+from . import config
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+def _encode_value(value):
+    # Matches pydantic, which writes a zero UTC offset as "Z"
+    if isinstance(value, datetime) and value.utcoffset() is not None and not value.utcoffset():
+        return value.replace(tzinfo=None).isoformat() + "Z"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Encode plain Python data (dicts, lists, str, numbers, dates) as compact JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_encode_value, separators=(",", ":"), ensure_ascii=False).encode()
+
+@lru_cache(maxsize=None)
+def schema_columns(model, schema) -> tuple:
+    """The model's table columns for each field of a response schema, in field order.
+
+    Raises ValueError if the schema has a field that is not a plain column
+    (a relationship or a computed value), which the fast path cannot serve.
+    """
+    columns = model.__table__.columns
+    missing = [field for field in schema.model_fields if field not in columns]
+    if missing:
+        raise ValueError(f"{schema.__name__} fields {missing} are not columns of {model.__tablename__}")
+    return tuple(columns[field] for field in schema.model_fields)
+
+def fast_columns(route: str, model, schema) -> Optional[tuple]:
+    """Columns to select for a list route on the fast path, or None when the route uses ORM objects.
+
+    Routes are enabled by name (e.g. "out-patients", "appointments/in-patients/active")
+    in FAST_SERIALIZATION_ROUTES; "*" enables every route.
+    """
+    routes = config.FAST_SERIALIZATION_ROUTES
+    if "*" not in routes and route not in routes:
+        return None
+    return schema_columns(model, schema)
+
+def _row_dicts(rows) -> list:
+    # Row._asdict() rebuilds the key list for every row; zip the shared field names instead.
+    # Names of columns selected from a subquery are str subclasses, which orjson rejects as keys.
+    if not rows:
+        return []
+    fields = [str(field) for field in rows[0]._fields]
+    return [dict(zip(fields, row)) for row in rows]
+
+def encode_rows(result) -> bytes:
+    """JSON for a list of column-only rows, or a page dict of them ({"items", "next_cursor"})."""
+    if isinstance(result, dict):
+        return dumps({**result, "items": _row_dicts(result["items"])})
+    return dumps(_row_dicts(result))
+
+async def list_response(
+    route: str,
+    model,
+    schema,
+    load: Callable[[Optional[tuple]], Awaitable[Any]]
+):
+    """Serve a list route, building the JSON from row tuples when the route is on the fast path.
+
+    ``load`` receives the columns to select (None for ORM objects) and
+    returns a list or page of rows. On the fast path no ORM entities are
+    built and response_model validation is skipped: rows are turned into
+    dicts and encoded with orjson. Otherwise the ORM result is returned for
+    FastAPI to validate and serialize as before.
+    """
+    columns = fast_columns(route, model, schema)
+    result = await load(columns)
+    if columns is None:
+        return result
+    return Response(content=encode_rows(result), media_type="application/json")
@@ -0,0 +1,67 @@
+import json
+import re
+from typing import Dict, Optional
+
+# round_vitals columns, in response order
+VITAL_COLUMNS = ("bp_systolic", "bp_diastolic", "pulse", "temperature", "spo2", "respiratory_rate")
+
+# Keys used in rounds' vital_signs JSON -> round_vitals column
+VITAL_KEYS = {
+    "systolic": "bp_systolic",
+    "diastolic": "bp_diastolic",
+    "pulse": "pulse",
+    "hr": "pulse",
+    "heart_rate": "pulse",
+    "temp": "temperature",
+    "temperature": "temperature",
+    "spo2": "spo2",
+    "o2_sat": "spo2",
+    "oxygen_saturation": "spo2",
+    "rr": "respiratory_rate",
+    "resp_rate": "respiratory_rate",
+    "respiratory_rate": "respiratory_rate",
+}
+BLOOD_PRESSURE_KEYS = ("bp", "blood_pressure")  # "120/80"
+FAHRENHEIT_ABOVE = 45.0  # Temperatures above this were recorded in Fahrenheit (the sample data does)
+
+_NUMBER = re.compile(r"\s*(-?\d+(?:\.\d+)?)")
+
+def reading(value) -> Optional[float]:
+    """The leading number of a recorded value ("98", "98%", "99.2 F"), or None."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _NUMBER.match(value) if isinstance(value, str) else None
+    return float(match.group(1)) if match else None
+
+def parse_vital_signs(vital_signs: Optional[str]) -> Dict[str, float]:
+    """Numeric readings of a round's vital_signs JSON by round_vitals column.
+
+    Keys are matched case-insensitively; values that are missing or not
+    numbers are left out rather than failing the write. Temperatures are
+    returned in Celsius whichever unit they were recorded in.
+    """
+    if not vital_signs:
+        return {}
+    try:
+        recorded = json.loads(vital_signs)
+    except ValueError:
+        return {}
+    if not isinstance(recorded, dict):
+        return {}
+    readings = {}
+    for key, value in recorded.items():
+        key = str(key).strip().lower()
+        if key in BLOOD_PRESSURE_KEYS and isinstance(value, str) and "/" in value:
+            systolic, _, diastolic = value.partition("/")
+            for column, part in (("bp_systolic", systolic), ("bp_diastolic", diastolic)):
+                number = reading(part)
+                if number is not None:
+                    readings[column] = number
+        elif key in VITAL_KEYS:
+            number = reading(value)
+            if number is not None:
+                readings[VITAL_KEYS[key]] = number
+    temperature = readings.get("temperature")
+    if temperature is not None and temperature > FAHRENHEIT_ABOVE:
+        readings["temperature"] = round((temperature - 32) * 5 / 9, 2)
+    return readings
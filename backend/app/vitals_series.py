@@ -0,0 +1,324 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from . import config
+from .vitals import FAHRENHEIT_ABOVE, VITAL_COLUMNS
+
+# Row of each metric in a (metric, reading) matrix
+METRIC_ROW = {column: row for row, column in enumerate(VITAL_COLUMNS)}
+
+# NEWS2 (Royal College of Physicians, 2017) bands per metric: upper bounds of
+# each band and the score of each band, the last one for readings above them
+NEWS2_BANDS = {
+    "respiratory_rate": ((8, 11, 20, 24), (3, 1, 0, 2, 3)),
+    "spo2": ((91, 93, 95), (3, 2, 1, 0)),  # Scale 1
+    "bp_systolic": ((90, 100, 110, 219), (3, 2, 1, 0, 3)),
+    "pulse": ((40, 50, 90, 110, 130), (3, 1, 0, 1, 2, 3)),
+    "temperature": ((35.0, 36.0, 38.0, 39.0), (3, 1, 0, 1, 2)),  # Celsius
+}
+
+def news2(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """NEWS2 score and red flag (one metric scoring 3) for each column of a (metric, reading) matrix.
+
+    Missing readings score 0. Rounds do not record supplemental oxygen or
+    consciousness, so those two parameters are never scored.
+    """
+    total = np.zeros(values.shape[1], dtype=np.int16)
+    red_flag = np.zeros(values.shape[1], dtype=bool)
+    for metric, (bounds, scores) in NEWS2_BANDS.items():
+        readings = values[METRIC_ROW[metric]]
+        score = np.asarray(scores, dtype=np.int16)[np.digitize(readings, bounds, right=True)]
+        score[np.isnan(readings)] = 0
+        total += score
+        red_flag |= score == 3
+    return total, red_flag
+
+def news2_risk(score: np.ndarray, red_flag: np.ndarray) -> np.ndarray:
+    """Clinical risk band of each NEWS2 score."""
+    return np.select(
+        [score >= 7, score >= 5, red_flag], ["high", "medium", "low-medium"], default="low"
+    )
+
+def forward_fill(
+    values: np.ndarray, segment_start: np.ndarray, times: np.ndarray, max_age: np.timedelta64
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Each metric's latest reading at every column, carried forward within a patient's segment, and its time.
+
+    ``segment_start`` flags the first column of each patient. A metric not
+    yet recorded in the segment, or last recorded more than ``max_age``
+    before the column's time, is NaN with a NaT time.
+    """
+    positions = np.where(~np.isnan(values) | segment_start, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(positions, axis=1, out=positions)
+    filled = np.take_along_axis(values, positions, axis=1)
+    observed = times[positions]
+    filled[observed < times - max_age] = np.nan
+    observed[np.isnan(filled)] = np.datetime64("NaT")
+    return filled, observed
+
+def rolling_stats(values: np.ndarray, window: int, first: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and standard deviation of the last ``window`` readings at each column, skipping missing ones.
+
+    ``values`` is one series or a (metric, reading) matrix; ``first`` gives
+    the first column of each column's patient, so windows never span two
+    patients. Windows without a reading are NaN.
+    """
+    values = np.atleast_2d(values).astype(np.float64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    zero = np.zeros((values.shape[0], 1))
+    sums = np.concatenate((zero, np.cumsum(filled, axis=1)), axis=1)
+    squares = np.concatenate((zero, np.cumsum(filled * filled, axis=1)), axis=1)
+    counts = np.concatenate((zero, np.cumsum(valid, axis=1)), axis=1)
+    end = np.arange(1, values.shape[1] + 1)
+    begin = np.maximum(end - window, 0 if first is None else first)
+    count = counts[:, end] - counts[:, begin]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sums[:, end] - sums[:, begin]) / count
+        variance = (squares[:, end] - squares[:, begin]) / count - mean * mean
+    return mean, np.sqrt(np.maximum(variance, 0.0))
+
+def _floats(values: np.ndarray) -> List[Optional[float]]:
+    return np.where(np.isnan(values), None, np.round(values.astype(np.float64), 2)).tolist()
+
+class PatientVitals(NamedTuple):
+    times: np.ndarray  # datetime64[s] of each round, ascending
+    values: np.ndarray  # float32 (metric, reading), NaN where a round did not record the metric
+    news2: np.ndarray  # int16 score at each round, from each metric's latest reading so far
+    latest: np.ndarray  # float32 latest reading of each metric, NaN when older than max_age before the latest round
+    latest_at: np.ndarray  # datetime64[s] when each latest reading was taken, NaT where NaN
+    observed_at: datetime  # Latest round
+    news2_previous: Optional[int]  # Score as of the round before it
+    news2_mean: float  # Rolling mean of the score over the last window rounds
+
+def build_series(rows: Sequence[tuple], window: int, max_age: float) -> Dict[str, PatientVitals]:
+    """Series per patient from (patient_id, date, *VITAL_COLUMNS) rows in patient and date order.
+
+    Every step runs over all patients' readings at once; each patient's
+    series are then views into the shared arrays. Scores use each metric's
+    latest reading up to ``max_age`` hours before the round.
+    """
+    if not rows:
+        return {}
+    patient_ids, dates, *readings = zip(*rows)
+    ids = np.array(patient_ids, dtype=object)
+    times = np.array(dates, dtype="datetime64[s]")
+    values = np.array(readings, dtype=np.float32)  # None becomes NaN
+    # Rows parsed before round_vitals stored Celsius, until POST /api/vitals/rebuild
+    temperature = values[METRIC_ROW["temperature"]]
+    np.putmask(temperature, temperature > FAHRENHEIT_ABOVE, (temperature - 32) * 5 / 9)
+    segment_start = np.ones(len(ids), dtype=bool)
+    segment_start[1:] = ids[1:] != ids[:-1]
+    starts = np.flatnonzero(segment_start)
+    first = np.repeat(starts, np.diff(np.append(starts, len(ids))))
+    filled, observed = forward_fill(values, segment_start, times, np.timedelta64(int(max_age * 3600), "s"))
+    scores, _ = news2(filled)
+    score_means = rolling_stats(scores.astype(np.float64), window, first)[0][0]
+    series = {}
+    for start, end in zip(starts.tolist(), np.append(starts[1:], len(ids)).tolist()):
+        series[ids[start]] = PatientVitals(
+            times[start:end], values[:, start:end], scores[start:end], filled[:, end - 1].copy(),
+            observed[:, end - 1].copy(), times[end - 1].item(), int(scores[end - 2]) if end - start > 1 else None,
+            round(float(score_means[end - 1]), 2)
+        )
+    return series
+
+class VitalsSeriesStore:
+    """In-memory vital sign time series of every patient, one array per metric.
+
+    Built from the round_vitals table (the source of truth) with all the
+    parsing and scoring done once, vectorized over every patient's rounds.
+    Transactions that write round_vitals note the patients they touched
+    (``record_vitals_write``); once they commit, those patients are re-read
+    on the next request, and the whole store is reloaded once it is older
+    than ``ttl`` seconds, which picks up writes made by other processes.
+    Safe to share between the event loop and threadpool workers.
+    """
+
+    def __init__(self, ttl: float = 300.0, window: int = 6, max_age: float = 12.0):
+        self.ttl = ttl
+        self.window = window
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._patients: Dict[str, PatientVitals] = {}
+        self._dirty: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self) -> None:
+        """Reload every patient on the next request."""
+        self._loaded_at = None
+
+    def mark(self, patient_ids: Iterable[str]) -> None:
+        """Note patients whose committed rounds changed, to re-read on the next request."""
+        with self._lock:
+            self._dirty.update(patient_ids)
+
+    def take_dirty(self) -> Set[str]:
+        """The patients to re-read, clearing the set; commits made meanwhile mark theirs again."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def load(self, rows: Sequence[tuple]) -> None:
+        """Replace every series with rows read from round_vitals, after a ``take_dirty``."""
+        series = build_series(rows, self.window, self.max_age)
+        with self._lock:
+            self._patients = series
+            self._loaded_at = time.monotonic()
+
+    def update(self, patient_ids: Set[str], rows: Sequence[tuple]) -> None:
+        """Replace the series of some patients with their rows; patients without rows are dropped."""
+        series = build_series(rows, self.window, self.max_age)
+        with self._lock:
+            for patient_id in patient_ids:
+                if patient_id in series:
+                    self._patients[patient_id] = series[patient_id]
+                else:
+                    self._patients.pop(patient_id, None)
+
+    def get(self, patient_id: str) -> Optional[PatientVitals]:
+        return self._patients.get(patient_id)
+
+    def series(
+        self,
+        patient_id: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        points: int = 200,
+        window: Optional[int] = None
+    ) -> Optional[dict]:
+        """A patient's readings in [date_from, date_to), downsampled to at most ``points`` time buckets.
+
+        Each bucket has the mean, min and max of each metric, the rolling mean
+        and standard deviation over the last ``window`` rounds as of its last
+        reading, and its highest NEWS2 score. Returns None for a patient
+        without recorded vitals.
+        """
+        patient = self._patients.get(patient_id)
+        if patient is None:
+            return None
+        window = window or self.window
+        times = patient.times
+        low = 0 if date_from is None else int(np.searchsorted(times, np.datetime64(date_from, "s")))
+        high = len(times) if date_to is None else int(np.searchsorted(times, np.datetime64(date_to, "s")))
+        # Windows reach back before date_from, so roll over the whole series up to date_to
+        rolling_mean, rolling_std = rolling_stats(patient.values[:, :high], window)
+        times, values, scores = times[low:high], patient.values[:, low:high], patient.news2[low:high]
+        result = {"patient_id": patient_id, "times": [], "readings": [], "news2": [], "metrics": {}}
+        if not len(times):
+            result["metrics"] = {metric: {key: [] for key in ("mean", "min", "max", "rolling_mean", "rolling_std")}
+                                 for metric in VITAL_COLUMNS}
+            return result
+        if len(times) <= points:
+            starts = np.arange(len(times))
+        else:
+            seconds = (times - times[0]).astype(np.int64)
+            width = max(1, -(-int(seconds[-1] + 1) // points))
+            bucket = seconds // width
+            starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.append(starts[1:], len(times))
+        valid = ~np.isnan(values)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=1) / np.add.reduceat(valid, starts, axis=1)
+        lows = np.fmin.reduceat(values, starts, axis=1)
+        highs = np.fmax.reduceat(values, starts, axis=1)
+        last = low + ends - 1
+        result["times"] = times[starts].tolist()
+        result["readings"] = (ends - starts).tolist()
+        result["news2"] = np.maximum.reduceat(scores, starts).tolist()
+        for metric, row in METRIC_ROW.items():
+            result["metrics"][metric] = {
+                "mean": _floats(means[row]),
+                "min": _floats(lows[row]),
+                "max": _floats(highs[row]),
+                "rolling_mean": _floats(rolling_mean[row, last]),
+                "rolling_std": _floats(rolling_std[row, last]),
+            }
+        return result
+
+    def board(self, patients: Sequence[tuple], min_score: int = 0, now: Optional[datetime] = None) -> List[dict]:
+        """Deterioration board rows for (patient_id, name, ward_type, room_number, bed_number) patients.
+
+        Scores every patient's latest readings at once, leaving out readings
+        taken more than ``max_age`` hours before ``now`` (default: the current
+        UTC time). Rows are ordered by NEWS2 score, highest first; patients
+        without a reading that recent come last, unscored, and are left out
+        when ``min_score`` is above 0.
+        """
+        cutoff = np.datetime64(now or datetime.utcnow(), "s") - np.timedelta64(int(self.max_age * 3600), "s")
+        with self._lock:
+            found = [(patient, self._patients.get(patient[0])) for patient in patients]
+        recorded = [(patient, vitals) for patient, vitals in found if vitals is not None]
+        rows, scored = [], []
+        if recorded:
+            latest = np.stack([vitals.latest for _, vitals in recorded], axis=1)
+            latest[np.stack([vitals.latest_at for _, vitals in recorded], axis=1) < cutoff] = np.nan
+            current = ~np.isnan(latest).all(axis=0)
+            scored = [recorded[index] for index in np.flatnonzero(current).tolist()]
+            latest = latest[:, current]
+        if scored:
+            scores, red_flags = news2(latest)
+            order = np.argsort(-scores, kind="stable")
+            order = order[scores[order] >= min_score]
+            # Plain lists from here: indexing numpy arrays one element at a time is slow
+            risks = news2_risk(scores, red_flags)[order].tolist()
+            readings = np.where(np.isnan(latest), None, np.round(latest.astype(np.float64), 1)).T[order].tolist()
+            for index, score, red_flag, risk, reading in zip(
+                order.tolist(), scores[order].tolist(), red_flags[order].tolist(), risks, readings
+            ):
+                (patient_id, name, ward_type, room_number, bed_number), vitals = scored[index]
+                rows.append({
+                    "patient_id": patient_id,
+                    "patient_name": name,
+                    "ward_type": ward_type,
+                    "room_number": room_number,
+                    "bed_number": bed_number,
+                    "observed_at": vitals.observed_at,
+                    "news2": score,
+                    "risk": risk,
+                    "red_flag": red_flag,
+                    "news2_previous": vitals.news2_previous,
+                    "news2_rolling_mean": vitals.news2_mean,
+                    **dict(zip(VITAL_COLUMNS, reading)),
+                })
+        if min_score <= 0:
+            unscored = dict.fromkeys(("news2", "risk", "red_flag", "news2_previous", "news2_rolling_mean"))
+            unscored.update(dict.fromkeys(VITAL_COLUMNS))
+            current_ids = {patient[0] for patient, _ in scored}
+            for (patient_id, name, ward_type, room_number, bed_number), vitals in found:
+                if patient_id not in current_ids:
+                    rows.append({
+                        "patient_id": patient_id,
+                        "patient_name": name,
+                        "ward_type": ward_type,
+                        "room_number": room_number,
+                        "bed_number": bed_number,
+                        "observed_at": vitals.observed_at if vitals is not None else None,
+                        **unscored,
+                    })
+        return rows
+
+vitals_series = VitalsSeriesStore(
+    ttl=config.VITALS_SERIES_TTL, window=config.VITALS_ROLLING_WINDOW, max_age=config.VITALS_MAX_AGE_HOURS
+)
+
+def record_vitals_write(db: Session, patient_ids: Iterable[str]) -> None:
+    """Note patients whose round_vitals rows the session wrote; they are re-read once it commits."""
+    db.info.setdefault("vitals_patients", set()).update(patient_ids)
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session: Session) -> None:
+    patient_ids = session.info.pop("vitals_patients", None)
+    if patient_ids:
+        vitals_series.mark(patient_ids)
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop("vitals_patients", None)
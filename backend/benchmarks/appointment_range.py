@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Appointment date-range query benchmark.
+
+Seeds a throwaway database with out-patient appointments (one million by
+default) spread over two years, then times the legacy func.date() lookup of
+today's appointments against the half-open range query and the filtered
+range API, printing each query plan.
+
+Usage (from the backend directory):
+    python -m benchmarks.appointment_range
+    python -m benchmarks.appointment_range --rows 200000 --repeat 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+APPOINTMENT_STATUSES = ["scheduled", "completed", "cancelled", "no-show"]
+
+def seed(engine, rows: int, doctors: int):
+    """Insert synthetic appointments in batches with executemany."""
+    from app import models
+
+    rng = random.Random(42)
+    today = datetime.combine(date.today(), dt_time.min)
+    table = models.OutPatientAppointment.__table__
+    batch_size = 50000
+    with engine.begin() as conn:
+        for start in range(0, rows, batch_size):
+            conn.execute(table.insert(), [
+                {
+                    "id": f"op-apt-{i:09d}",
+                    "patient_id": f"op-{i % 50000:08d}",
+                    "date": today + timedelta(minutes=rng.randrange(-365 * 24 * 60, 365 * 24 * 60)),
+                    "type": "walk-in",
+                    "status": rng.choice(APPOINTMENT_STATUSES),
+                    "doctor_id": f"doc-{rng.randrange(doctors):04d}",
+                }
+                for i in range(start, min(start + batch_size, rows))
+            ])
+
+def time_query(fn, repeat: int) -> float:
+    """Return the median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def explain(db, query) -> str:
+    """Return the SQLite query plan for an ORM query, or an empty string elsewhere."""
+    from sqlalchemy import text
+
+    if db.get_bind().dialect.name != "sqlite":
+        return ""
+    statement = query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return "; ".join(row[-1] for row in plan)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="appointments to seed")
+    parser.add_argument("--doctors", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per query")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from sqlalchemy import func
+    from app import crud, models
+    from app.database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    seed(engine, args.rows, args.doctors)
+    print(f"seeded {args.rows} appointments in {time.perf_counter() - start:.1f}s")
+
+    Appointment = models.OutPatientAppointment
+    today = datetime.combine(date.today(), dt_time.min)
+    week_end = today + timedelta(days=7)
+    db = SessionLocal()
+    try:
+        legacy = db.query(Appointment).filter(func.date(Appointment.date) == date.today()).order_by(Appointment.date)
+        today_range = db.query(Appointment).filter(Appointment.date >= today, Appointment.date < today + timedelta(days=1)).order_by(Appointment.date)
+        cases = [
+            ("today, func.date() (before)", lambda: legacy.all(), legacy),
+            ("today, half-open range", lambda: crud.get_todays_out_patient_appointments(db), today_range),
+            ("week, doctor_id", lambda: crud.get_out_patient_appointments(db, date_from=today, date_to=week_end, doctor_id="doc-0007"),
+             db.query(Appointment).filter(Appointment.doctor_id == "doc-0007", Appointment.date >= today, Appointment.date < week_end).order_by(Appointment.date, Appointment.id)),
+            ("week, status", lambda: crud.get_out_patient_appointments(db, date_from=today, date_to=week_end, status="scheduled"),
+             db.query(Appointment).filter(Appointment.status == "scheduled", Appointment.date >= today, Appointment.date < week_end).order_by(Appointment.date, Appointment.id)),
+        ]
+        print(f"{'query':<30} {'median ms':>10}  plan")
+        for label, fn, query in cases:
+            print(f"{label:<30} {time_query(fn, args.repeat):>10.2f}  {explain(db, query)}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Patient chart query-count benchmark.
+
+Seeds out-patients and in-patients with growing histories (visits/rounds
+with medications, appointments/admissions), then counts the SQL statements
+and time needed to load and serialize each chart, eager-loaded through
+crud.get_*_chart versus plain lazy loading. Exits non-zero if the
+eager-loaded query count changes with history size.
+
+Usage (from the backend directory):
+    python -m benchmarks.chart_queries
+    python -m benchmarks.chart_queries --sizes 1 10 100 1000 --medications 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+def seed(engine, history: int, medications: int):
+    """Insert one out-patient and one in-patient with `history` entries each."""
+    from app import models
+
+    now = datetime.utcnow()
+    op_id, ip_id = f"op-h{history}", f"ip-h{history}"
+    with engine.begin() as conn:
+        conn.execute(models.OutPatient.__table__.insert(), [{
+            "id": op_id, "name": "Chart Patient", "phone": "555-0100", "email": "chart@example.com",
+            "gender": "female", "date_of_birth": date(1980, 1, 1)
+        }])
+        conn.execute(models.InPatient.__table__.insert(), [{
+            "id": ip_id, "name": "Chart Patient", "phone": "555-0101", "email": "chart@example.com",
+            "gender": "male", "date_of_birth": date(1970, 1, 1), "admission_date": now, "status": "admitted"
+        }])
+        visits = [{"id": f"{op_id}-v{i}", "patient_id": op_id, "date": now - timedelta(days=i),
+                   "chief_complaints": "cough", "diagnosis": "bronchitis"} for i in range(history)]
+        rounds = [{"id": f"{ip_id}-r{i}", "patient_id": ip_id, "date": now - timedelta(hours=i),
+                   "chief_complaints": "fever", "diagnosis": "sepsis"} for i in range(history)]
+        conn.execute(models.OutPatientVisit.__table__.insert(), visits)
+        conn.execute(models.InPatientRound.__table__.insert(), rounds)
+        conn.execute(models.OutPatientMedication.__table__.insert(), [
+            {"visit_id": visit["id"], "patient_id": op_id, "name": f"Drug {m}", "dosage": "5mg", "frequency": "bd", "duration": "5d"}
+            for visit in visits for m in range(medications)
+        ])
+        conn.execute(models.InPatientMedication.__table__.insert(), [
+            {"round_id": round_row["id"], "name": f"Drug {m}", "dosage": "5mg", "frequency": "bd", "duration": "5d"}
+            for round_row in rounds for m in range(medications)
+        ])
+        conn.execute(models.OutPatientAppointment.__table__.insert(), [
+            {"id": f"{op_id}-a{i}", "patient_id": op_id, "date": now + timedelta(days=i), "type": "walk-in", "status": "scheduled"}
+            for i in range(history)
+        ])
+        conn.execute(models.InPatientAdmission.__table__.insert(), [
+            {"id": f"{ip_id}-a{i}", "patient_id": ip_id, "admission_date": now - timedelta(days=i), "admission_type": "emergency", "status": "discharged"}
+            for i in range(history)
+        ])
+    return op_id, ip_id
+
+def measure(engine, load, schema, patient_id: str):
+    """Return (statements, ms) to load and serialize one chart."""
+    from sqlalchemy import event
+    from app.database import SessionLocal
+
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        schema.model_validate(load(db, patient_id)).model_dump()
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", count)
+    return statements[0], elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="visits/rounds per patient")
+    parser.add_argument("--medications", type=int, default=3, help="medications per visit/round")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app import crud, models, schemas
+    from app.database import engine
+
+    models.Base.metadata.create_all(bind=engine)
+    cases = [
+        ("out-patient eager", crud.get_out_patient_chart, schemas.OutPatientChart, 0),
+        ("out-patient lazy", crud.get_out_patient, schemas.OutPatientChart, 0),
+        ("in-patient eager", crud.get_in_patient_chart, schemas.InPatientChart, 1),
+        ("in-patient lazy", crud.get_in_patient, schemas.InPatientChart, 1),
+    ]
+
+    eager_counts = {}
+    print(f"{'chart':<20} {'history':>8} {'queries':>8} {'ms':>9}")
+    for history in args.sizes:
+        patient_ids = seed(engine, history, args.medications)
+        for label, load, schema, which in cases:
+            statements, elapsed = measure(engine, load, schema, patient_ids[which])
+            print(f"{label:<20} {history:>8} {statements:>8} {elapsed:>9.1f}")
+            if label.endswith("eager"):
+                eager_counts.setdefault(label, set()).add(statements)
+
+    if any(len(counts) > 1 for counts in eager_counts.values()):
+        print("FAIL: eager-loaded chart query count grows with history")
+        sys.exit(1)
+    print("OK: eager-loaded chart query count is constant")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for capacity planning and benchmark runs.
+
+Fills all fourteen tables (users, out-patients, in-patients and general
+patients with their visits, rounds, medications, appointments, admissions
+and feedback) plus the beds, doctor workload, patient search, patient
+allergy and round vitals tables with a production-sized, foreign-key
+consistent hospital (see benchmarks/hospital.py).
+Sizes grow with --out-patients: the defaults give about 19 rows per
+out-patient, so 100000 out-patients is roughly 1.9 million rows. Each entity
+can be overridden on its own.
+
+Rows are streamed a chunk of patients at a time and written with batched
+executemany calls in a single transaction, with fsync, journalling and
+foreign key checks relaxed and secondary indexes rebuilt once at the end.
+The same arguments always produce the same data. Works with any
+DATABASE_URL the app supports; the tables are created if missing and must
+be empty unless --reset is given.
+
+Usage (from the backend directory):
+    python -m benchmarks.generate_data
+    python -m benchmarks.generate_data --out-patients 1000000 --reset
+    DATABASE_URL=sqlite:///./capacity.db python -m benchmarks.generate_data --in-patients 200000
+    DATABASE_URL=postgresql://... python -m benchmarks.generate_data --out-patients 500000 --reset
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.hospital import COLUMNS, DEFAULT_SIZES, DOCTOR_PASSWORD, scaled_sizes
+
+class Progress:
+    """Prints the running row count and rate every ``every`` rows."""
+
+    def __init__(self, every: int):
+        self.every = every
+        self.rows = 0
+        self.start = time.perf_counter()
+        self._next = every
+
+    def __call__(self, table: str, rows: int) -> None:
+        self.rows += rows
+        if self.rows >= self._next:
+            elapsed = time.perf_counter() - self.start
+            print(f"  {self.rows:>12,} rows  {self.rows / elapsed:>10,.0f} rows/s  ({table})", flush=True)
+            self._next += self.every
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out-patients", type=int, default=100000, help="out-patients; the other entities scale with it")
+    for name in DEFAULT_SIZES:
+        if name != "out_patients":
+            flag = name.replace("_", "-")
+            parser.add_argument(f"--{flag}", type=int, help=f"override the {flag.replace('-', ' ')} size (see benchmarks/hospital.py)")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the generated values")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--keep-indexes", action="store_true", help="update indexes row by row instead of rebuilding them")
+    parser.add_argument("--no-relax", action="store_true", help="keep the normal durability settings during the load")
+    parser.add_argument("--skip-derived", action="store_true", help="do not rebuild the workload, search, allergy and vitals tables")
+    parser.add_argument("--progress", type=int, default=1000000, help="print progress every this many rows (0 disables)")
+    args = parser.parse_args()
+
+    from sqlalchemy import func, select
+    from app import auth, models
+    from app.database import engine
+    from benchmarks.hospital import hospital_rows, load_rows, rebuild_derived
+
+    sizes = scaled_sizes(args.out_patients, **{name: getattr(args, name) for name in DEFAULT_SIZES if name != "out_patients"})
+    if args.reset:
+        models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        filled = [
+            name for name in COLUMNS
+            if conn.execute(select(func.count()).select_from(models.Base.metadata.tables[name])).scalar()
+        ]
+    if filled:
+        print(f"Tables already hold data ({', '.join(filled)}); rerun with --reset to replace it")
+        sys.exit(1)
+
+    print(f"database={engine.dialect.name} seed={args.seed} " + " ".join(f"{name}={value}" for name, value in sizes.items()))
+    password = auth.get_password_hash(DOCTOR_PASSWORD)  # Every account logs in with the benchmark password
+    start = time.perf_counter()
+    counts = load_rows(
+        engine, hospital_rows(sizes, password, args.seed), relax=not args.no_relax,
+        drop_indexes=not args.keep_indexes, progress=Progress(args.progress) if args.progress else None
+    )
+    loaded = time.perf_counter() - start
+    total = sum(counts.values())
+    for name, count in counts.items():
+        print(f"  {name:<26} {count:>12,}")
+    print(f"loaded {total:,} rows in {loaded:.1f}s ({total / loaded:,.0f} rows/s, indexes included)")
+
+    if not args.skip_derived:
+        start = time.perf_counter()
+        rebuild_derived(engine)
+        print(f"rebuilt doctor workload and patient search in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,476 @@
+"""
+Synthetic hospital for the benchmarks and for large-scale seeding.
+
+hospital_rows() generates doctors; out-patients with visits, medications and
+appointments; in-patients with admissions, rounds, medications and beds; and
+general patients with visits, medications, appointments and feedback. Rows
+come out a chunk of patients at a time, parents before children, so millions
+of rows never sit in memory at once and every foreign key points at a row
+already written. load_rows() inserts them with batched executemany calls in
+one transaction, with durability relaxed and secondary indexes dropped for
+the load. seed_hospital() combines the two and rebuilds the derived tables
+(doctor workload, patient search).
+
+Every value comes from a random generator seeded with ``seed``, so the same
+sizes and seed always produce the same hospital and benchmark runs stay
+comparable.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DOCTOR_PASSWORD = "bench-password"
+ADMIN_EMAIL = "admin@hospital.example"
+
+# Rows per entity; per-patient counts are averages drawn around the given value
+DEFAULT_SIZES = {
+    "doctors": 40,
+    "out_patients": 5000,
+    "in_patients": 500,
+    "patients": 2000,  # General (legacy) patients, who carry the feedback
+    "visits": 3,  # Per out-patient and per general patient
+    "rounds": 6,  # Per in-patient
+    "medications": 2,  # Per visit and per round
+    "appointments": 2,  # Per out-patient and per general patient
+    "feedback": 2000,  # About this many, on completed general appointments
+}
+# Entities that grow with scaled_sizes(); the per-patient averages stay fixed
+SCALED_ENTITIES = ("doctors", "out_patients", "in_patients", "patients", "feedback")
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "Aarav", "Priya", "Wei", "Mei", "Oluwaseun", "Amara", "Mateo", "Sofia", "Yusuf", "Fatima",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Taylor",
+    "Sharma", "Patel", "Chen", "Wang", "Okafor", "Adeyemi", "Silva", "Rossi", "Khan", "Ahmed",
+]
+DIAGNOSES = [
+    "hypertension", "type 2 diabetes", "asthma", "bronchitis", "migraine", "pneumonia", "gastritis",
+    "urinary tract infection", "osteoarthritis", "anaemia", "sepsis", "cellulitis", "appendicitis",
+]
+DRUGS = ["Paracetamol", "Amoxicillin", "Metformin", "Amlodipine", "Salbutamol", "Omeprazole", "Ceftriaxone", "Heparin"]
+ALLERGIES = ["Penicillin", "Aspirin", "Sulfa", "Latex", "Ibuprofen", "Codeine"]
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "AB+", "AB-", "O+", "O-"]
+INSURERS = ["Star Health", "ICICI Lombard", "Bajaj Allianz", "HDFC Ergo", None]
+WARDS = ["general", "semi-private", "private", "icu", "emergency"]
+APPOINTMENT_TYPES = ["walk-in", "phone-call", "video-call"]
+PAST_APPOINTMENT_STATUSES = ["completed", "completed", "cancelled", "no-show"]
+ADMISSION_TYPES = ["emergency", "elective", "transfer"]
+RATINGS = ["happy", "satisfied", "not-satisfied"]
+FEEDBACK_CATEGORIES = ["service", "wait-time", "treatment", "facilities", "overall"]
+BEDS_PER_ROOM = 4
+CHUNK_PATIENTS = 2000  # Patients generated before their rows are handed to the loader
+
+# Columns written per table, in insertion order: parents before children.
+# Omitted columns take their defaults (created_at is set by the database).
+COLUMNS = {
+    "users": ("id", "name", "email", "role", "password"),
+    "out_patients": (
+        "id", "name", "phone", "email", "gender", "date_of_birth", "blood_group", "address", "allergies",
+        "insurance_provider", "insurance_number",
+    ),
+    "out_patient_visits": (
+        "id", "patient_id", "date", "chief_complaints", "diagnosis", "notes", "follow_up_date", "doctor_id", "visit_type",
+    ),
+    "out_patient_medications": ("visit_id", "patient_id", "name", "dosage", "frequency", "duration", "prescription_date"),
+    "out_patient_appointments": ("id", "patient_id", "date", "type", "status", "reminder_sent", "doctor_id", "appointment_type"),
+    "in_patients": (
+        "id", "name", "phone", "email", "gender", "date_of_birth", "blood_group", "address", "allergies",
+        "admission_date", "discharge_date", "room_number", "bed_number", "ward_type", "admitting_doctor_id",
+        "discharge_doctor_id", "admission_diagnosis", "discharge_diagnosis", "status",
+    ),
+    "in_patient_admissions": (
+        "id", "patient_id", "admission_date", "expected_discharge_date", "actual_discharge_date", "status",
+        "admission_type", "room_number", "bed_number", "ward_type", "admitting_doctor_id",
+    ),
+    "in_patient_rounds": (
+        "id", "patient_id", "date", "chief_complaints", "diagnosis", "doctor_id", "round_type", "vital_signs", "treatment_plan",
+    ),
+    "in_patient_medications": ("round_id", "name", "dosage", "frequency", "duration", "route", "start_date", "end_date", "status"),
+    "beds": ("ward_type", "room_number", "bed_number", "patient_id", "occupied_since"),
+    "patients": ("id", "name", "phone", "email", "gender", "date_of_birth", "blood_group", "address", "allergies", "patient_type"),
+    "visits": ("id", "patient_id", "date", "chief_complaints", "diagnosis", "notes", "follow_up_date"),
+    "medications": ("visit_id", "name", "dosage", "frequency", "duration"),
+    "appointments": ("id", "patient_id", "date", "type", "status", "reminder_sent"),
+    "feedback": (
+        "id", "patient_id", "patient_name", "appointment_id", "visit_date", "rating", "comments", "submitted_date", "category",
+    ),
+}
+
+# Durability and checking SQLite can skip while a throwaway dataset is loaded
+RELAXED_SQLITE_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -262144,  # 256 MiB
+    "temp_store": "MEMORY",
+    "locking_mode": "EXCLUSIVE",
+    "foreign_keys": "OFF",  # Rows are generated consistent; the checks only slow the load
+}
+RELAXED_POSTGRES_SETTINGS = {
+    "synchronous_commit": "off",
+    "maintenance_work_mem": "'512MB'",  # For rebuilding the dropped indexes
+}
+# Skips the foreign key triggers, which halve PostgreSQL's load rate; superusers only
+POSTGRES_SUPERUSER_SETTINGS = {"session_replication_role": "replica"}
+
+Batch = Tuple[str, List[tuple]]
+
+class _Draw:
+    """Draws from one seeded generator, built on random() alone.
+
+    random.Random's below() and pick() cost several times more than
+    random() itself, which dominates generation at millions of rows.
+    """
+
+    __slots__ = ("rng", "random")
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.random = self.rng.random
+
+    def below(self, n: int) -> int:
+        return int(self.random() * n)
+
+    def pick(self, items):
+        return items[int(self.random() * len(items))]
+
+    def around(self, mean: int) -> int:
+        """A count spread evenly over [0, 2 * mean]."""
+        return int(self.random() * (2 * mean + 1)) if mean > 0 else 0
+
+def sizes_with(**overrides) -> Dict[str, int]:
+    """DEFAULT_SIZES with the given entries replaced (None values are ignored)."""
+    return {**DEFAULT_SIZES, **{name: value for name, value in overrides.items() if value is not None}}
+
+def scaled_sizes(out_patients: int, **overrides) -> Dict[str, int]:
+    """DEFAULT_SIZES grown in proportion to the number of out-patients, then overridden."""
+    factor = out_patients / DEFAULT_SIZES["out_patients"]
+    sizes = {**DEFAULT_SIZES, **{name: max(1, round(DEFAULT_SIZES[name] * factor)) for name in SCALED_ENTITIES}}
+    return {**sizes, **{name: value for name, value in overrides.items() if value is not None}}
+
+class _Clock:
+    """Timestamps around today in the text SQLAlchemy stores for DateTime on SQLite.
+
+    PostgreSQL parses the same text. Formatting datetimes is the costliest
+    part of generating a row, so each day and each minute of the day is
+    formatted once and a timestamp is two strings joined.
+    """
+
+    def __init__(self, today: date, days_back: int = 800, days_ahead: int = 400):
+        self.first = -days_back
+        self.days = [(today + timedelta(days=offset)).isoformat() for offset in range(-days_back, days_ahead + 1)]
+        self.minutes = [f" {minute // 60:02d}:{minute % 60:02d}:00.000000" for minute in range(1440)]
+
+    def day(self, offset: int) -> str:
+        """A date ``offset`` days from today."""
+        return self.days[offset - self.first]
+
+    def at(self, offset: int, minute: int) -> str:
+        """The timestamp ``minute`` minutes after midnight, ``offset`` days from today."""
+        extra, minute = divmod(minute, 1440)
+        return self.days[offset + extra - self.first] + self.minutes[minute]
+
+def _person(draw: _Draw, i: int, prefix: str) -> tuple:
+    """(name, phone, email, gender, date_of_birth, blood_group, address, allergies)."""
+    first, last = draw.pick(FIRST_NAMES), draw.pick(LAST_NAMES)
+    allergies = f'["{draw.pick(ALLERGIES)}"]' if draw.random() < 0.2 else "[]"
+    return (
+        f"{first} {last}", f"555-{draw.below(10000):04d}-{i % 1000:03d}", f"{first}.{last}.{prefix}{i}@example.com".lower(),
+        "male" if draw.random() < 0.5 else "female", (date(1940, 1, 1) + timedelta(days=draw.below(30000))).isoformat(),
+        draw.pick(BLOOD_GROUPS), f"{1 + draw.below(998)} {last} Street", allergies,
+    )
+
+def hospital_rows(sizes: Dict[str, int], password: str, seed: int = 42) -> Iterator[Batch]:
+    """Yield (table name, row tuples in COLUMNS order) batches for a whole hospital.
+
+    ``password`` is the stored hash given to every account. Batches for a
+    table never contain rows whose parents come in a later batch. Visits
+    reach two years back, appointments two weeks either side of today at
+    9:00, and in-patients were admitted during the last 30 days.
+    """
+    draw = _Draw(seed)
+    clock = _Clock(date.today())
+    yield from _user_rows(draw, sizes, password)
+    doctor_ids = [f"doc-{i:05d}" for i in range(sizes["doctors"])] or ["admin"]
+    for start in range(0, sizes["out_patients"], CHUNK_PATIENTS):
+        chunk = range(start, min(start + CHUNK_PATIENTS, sizes["out_patients"]))
+        yield from _out_patient_rows(draw, clock, sizes, doctor_ids, chunk)
+    beds = []
+    rooms_per_ward = max(1, -(-sizes["in_patients"] // (len(WARDS) * BEDS_PER_ROOM)))
+    for ward in WARDS:
+        for room in range(rooms_per_ward):
+            beds.extend([ward, f"{ward[:3]}-{room}", str(bed), None, None] for bed in range(BEDS_PER_ROOM))
+    free_beds = list(beds)
+    draw.rng.shuffle(free_beds)
+    for start in range(0, sizes["in_patients"], CHUNK_PATIENTS):
+        chunk = range(start, min(start + CHUNK_PATIENTS, sizes["in_patients"]))
+        yield from _in_patient_rows(draw, clock, sizes, doctor_ids, chunk, free_beds)
+    yield "beds", [tuple(bed) for bed in beds]
+    # Feedback is left on about sizes["feedback"] of the completed general appointments
+    feedback_rate = min(1.0, sizes["feedback"] / max(1, sizes["patients"] * sizes["appointments"] * 0.75))
+    for start in range(0, sizes["patients"], CHUNK_PATIENTS):
+        chunk = range(start, min(start + CHUNK_PATIENTS, sizes["patients"]))
+        yield from _general_rows(draw, clock, sizes, chunk, feedback_rate)
+
+def _user_rows(draw: _Draw, sizes: Dict[str, int], password: str) -> Iterator[Batch]:
+    users = [
+        (f"doc-{i:05d}", f"Dr {draw.pick(LAST_NAMES)}", f"doctor{i}@hospital.example", "doctor", password)
+        for i in range(sizes["doctors"])
+    ]
+    users.append(("admin", "Bench Admin", ADMIN_EMAIL, "admin", password))
+    yield "users", users
+
+def _out_patient_rows(draw: _Draw, clock: _Clock, sizes, doctor_ids, chunk) -> Iterator[Batch]:
+    patients, visits, medications, appointments = [], [], [], []
+    below, pick, around, random_, at = draw.below, draw.pick, draw.around, draw.random, clock.at
+    visit_mean, medication_mean, appointment_mean = sizes["visits"], sizes["medications"], sizes["appointments"]
+    for i in chunk:
+        patient_id = f"op-{i:08d}"
+        insurer = pick(INSURERS)
+        patients.append((patient_id, *_person(draw, i, "op"), insurer, f"INS{i:09d}" if insurer else None))
+        for v in range(around(visit_mean)):
+            visit_id = f"{patient_id}-v{v}"
+            day, minute = -below(720), 60 + below(480)
+            stamp = at(day, minute)
+            visits.append((
+                visit_id, patient_id, stamp, "review", pick(DIAGNOSES), None,
+                at(day + 14, minute) if random_() < 0.3 else None, pick(doctor_ids), "consultation",
+            ))
+            for _ in range(around(medication_mean)):
+                medications.append((visit_id, patient_id, pick(DRUGS), "500mg", "bd", "5 days", stamp))
+        for a in range(around(appointment_mean)):
+            day = below(29) - 14
+            appointments.append((
+                f"{patient_id}-a{a}", patient_id, at(day, 540 + 15 * below(32)), pick(APPOINTMENT_TYPES),
+                "scheduled" if day >= 0 else pick(PAST_APPOINTMENT_STATUSES),
+                random_() < 0.5, pick(doctor_ids), "consultation",
+            ))
+    yield "out_patients", patients
+    yield "out_patient_visits", visits
+    yield "out_patient_medications", medications
+    yield "out_patient_appointments", appointments
+
+def _in_patient_rows(draw: _Draw, clock: _Clock, sizes, doctor_ids, chunk, free_beds) -> Iterator[Batch]:
+    patients, admissions, rounds, medications = [], [], [], []
+    below, pick, around, random_, at = draw.below, draw.pick, draw.around, draw.random, clock.at
+    round_mean, medication_mean = sizes["rounds"], sizes["medications"]
+    for i in chunk:
+        patient_id = f"ip-{i:08d}"
+        day, minute = -below(30), 540 - 60 * below(24)
+        admitted_at = at(day, minute)
+        admitted = bool(free_beds) and random_() < 0.7
+        if admitted:
+            bed = free_beds.pop()
+            bed[3], bed[4] = patient_id, admitted_at
+            ward, room, bed_number = bed[0], bed[1], bed[2]
+        else:
+            ward, room, bed_number = pick(WARDS), None, None
+        doctor_id = pick(doctor_ids)
+        diagnosis = pick(DIAGNOSES)
+        status = "admitted" if admitted else "discharged"
+        discharged_at = None if admitted else at(day + 1 + below(10), minute)
+        patients.append((
+            patient_id, *_person(draw, i, "ip"), admitted_at, discharged_at, room, bed_number, ward, doctor_id,
+            None if admitted else doctor_id, diagnosis, None if admitted else diagnosis, status,
+        ))
+        admissions.append((
+            f"{patient_id}-adm", patient_id, admitted_at, at(day + 5, minute), discharged_at,
+            status, pick(ADMISSION_TYPES), room, bed_number, ward, doctor_id,
+        ))
+        for r in range(around(round_mean)):
+            round_id = f"{patient_id}-r{r}"
+            stamp = at(day, minute + 480 * r)
+            vital_signs = (
+                f'{{"bp": "{100 + below(61)}/{60 + below(41)}", "pulse": "{55 + below(66)}", '
+                f'"temp": "{97 + random_() * 5:.1f}", "spo2": "{90 + below(11)}"}}'
+            )
+            rounds.append((
+                round_id, patient_id, stamp, "ward round", diagnosis, doctor_id, "morning" if r % 2 == 0 else "evening",
+                vital_signs, "Continue current management",
+            ))
+            for _ in range(around(medication_mean)):
+                medications.append((
+                    round_id, pick(DRUGS), "1g", "tds", "3 days", "oral" if random_() < 0.5 else "iv", stamp,
+                    discharged_at, "active" if admitted else "completed",
+                ))
+    yield "in_patients", patients
+    yield "in_patient_admissions", admissions
+    yield "in_patient_rounds", rounds
+    yield "in_patient_medications", medications
+
+def _general_rows(draw: _Draw, clock: _Clock, sizes, chunk, feedback_rate) -> Iterator[Batch]:
+    patients, visits, medications, appointments, feedback = [], [], [], [], []
+    below, pick, around, random_, at = draw.below, draw.pick, draw.around, draw.random, clock.at
+    visit_mean, medication_mean, appointment_mean = sizes["visits"], sizes["medications"], sizes["appointments"]
+    for i in chunk:
+        patient_id = f"pt-{i:08d}"
+        person = _person(draw, i, "pt")
+        patients.append((patient_id, *person, "general"))
+        for v in range(around(visit_mean)):
+            visit_id = f"{patient_id}-v{v}"
+            visits.append((
+                visit_id, patient_id, at(-below(720), 60 + below(480)), "review", pick(DIAGNOSES), None, None,
+            ))
+            for _ in range(around(medication_mean)):
+                medications.append((visit_id, pick(DRUGS), "500mg", "bd", "5 days"))
+        for a in range(around(appointment_mean)):
+            appointment_id = f"{patient_id}-a{a}"
+            day = 30 - below(396)
+            completed = day < 0 and random_() < 0.8
+            status = "completed" if completed else ("scheduled" if day >= 0 else "cancelled")
+            appointments.append((appointment_id, patient_id, at(day, 540 + 15 * below(32)), "walk-in", status, completed))
+            if completed and random_() < feedback_rate:
+                visit_date = clock.day(day)
+                feedback.append((
+                    f"fb-{appointment_id}", patient_id, person[0], appointment_id, visit_date,
+                    pick(RATINGS), "Synthetic feedback", visit_date, pick(FEEDBACK_CATEGORIES),
+                ))
+    yield "patients", patients
+    yield "visits", visits
+    yield "medications", medications
+    yield "appointments", appointments
+    yield "feedback", feedback
+
+def _relax(cursor, dialect_name: str) -> Dict[str, object]:
+    """Apply the load settings; returns the SQLite pragmas to put back afterwards."""
+    if dialect_name == "sqlite":
+        previous = {}
+        for name, value in RELAXED_SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}")
+            previous[name] = cursor.fetchone()[0]
+            cursor.execute(f"PRAGMA {name}={value}")
+        return previous
+    if dialect_name == "postgresql":
+        # SET LOCAL lasts until the load transaction ends
+        settings = dict(RELAXED_POSTGRES_SETTINGS)
+        cursor.execute("SHOW is_superuser")
+        if cursor.fetchone()[0] == "on":
+            settings.update(POSTGRES_SUPERUSER_SETTINGS)
+        for name, value in settings.items():
+            cursor.execute(f"SET LOCAL {name} = {value}")
+    return {}
+
+def _restore(cursor, previous: Dict[str, object]) -> None:
+    if not previous:
+        return
+    for name, value in reversed(list(previous.items())):
+        cursor.execute(f"PRAGMA {name}={value}")
+    if str(previous["locking_mode"]).lower() != "exclusive":
+        cursor.execute("SELECT 1 FROM sqlite_master LIMIT 1")  # Leaving exclusive mode takes effect on the next read
+
+def load_rows(
+    engine,
+    batches: Iterable[Batch],
+    relax: bool = True,
+    drop_indexes: bool = True,
+    progress: Optional[Callable[[str, int], None]] = None
+) -> Dict[str, int]:
+    """Insert generated batches in one transaction; returns the rows written per table.
+
+    Each batch is a single executemany on the raw DBAPI cursor, skipping
+    SQLAlchemy's per-row parameter processing (a COPY on PostgreSQL with
+    psycopg 3). With ``relax`` the database
+    skips fsyncs and (on SQLite) journalling and foreign key checks for the
+    load, and SQLite's previous pragmas are put back afterwards. With
+    ``drop_indexes`` the non-unique indexes of the loaded tables are dropped
+    first and rebuilt once at the end, which is much faster than updating
+    them row by row. Either everything is committed or nothing is.
+    """
+    from sqlalchemy.schema import CreateIndex, DropIndex
+    from app import models
+
+    dialect = engine.dialect
+    marker = "?" if dialect.paramstyle == "qmark" else "%s"
+    statements = {
+        name: f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})"
+        for name, columns in COLUMNS.items()
+    }
+    tables = models.Base.metadata.tables
+    indexes = [index for name in COLUMNS for index in tables[name].indexes if not index.unique] if drop_indexes else []
+    counts = dict.fromkeys(COLUMNS, 0)
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # psycopg 3 streams batches to PostgreSQL with COPY, several times faster than executemany there
+        copy = dialect.name == "postgresql" and hasattr(cursor, "copy")
+        previous = _relax(cursor, dialect.name) if relax else {}
+        try:
+            if dialect.name == "sqlite":
+                cursor.execute("BEGIN")  # Explicit, so the index drops roll back with the rows
+            for index in indexes:
+                cursor.execute(str(DropIndex(index, if_exists=True).compile(dialect=dialect)))
+            for name, rows in batches:
+                if not rows:
+                    continue
+                if copy:
+                    with cursor.copy(f"COPY {name} ({', '.join(COLUMNS[name])}) FROM STDIN") as stream:
+                        for row in rows:
+                            stream.write_row(row)
+                else:
+                    cursor.executemany(statements[name], rows)
+                counts[name] += len(rows)
+                if progress is not None:
+                    progress(name, len(rows))
+            for index in indexes:
+                cursor.execute(str(CreateIndex(index).compile(dialect=dialect)))
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            _restore(cursor, previous)
+            cursor.close()
+    finally:
+        connection.close()
+    return counts
+
+def rebuild_derived(engine) -> None:
+    """Refresh the tables and in-memory state derived from the loaded rows.
+
+    Beds are written with their occupants, so only the doctor workload,
+    patient search, patient allergy and round vitals tables are rebuilt and
+    the bed map reloaded.
+    """
+    from sqlalchemy.orm import Session
+    from app import crud
+    from app.beds import bed_index
+
+    with Session(engine) as db:
+        crud.rebuild_doctor_workload(db)
+        crud.rebuild_patient_search(db)
+        crud.rebuild_patient_allergies(db)
+        crud.rebuild_round_vitals(db)
+        generation = bed_index.begin_load()
+        bed_index.finish_load(crud.get_beds(db), generation)
+
+def seed_hospital(engine, sizes: Dict[str, int] = DEFAULT_SIZES, seed: int = 42) -> dict:
+    """Insert a synthetic hospital and return the ids the workloads pick from.
+
+    The schema must already exist and be empty. Returns a dict with the
+    row counts, the doctor emails and ids, and the out-patient, in-patient
+    and admitted in-patient ids.
+    """
+    from sqlalchemy import select
+    from app import auth, models
+
+    password = auth.get_password_hash(DOCTOR_PASSWORD)  # One bcrypt hash shared by every account
+    counts = load_rows(engine, hospital_rows(sizes, password, seed))
+    rebuild_derived(engine)
+
+    with engine.connect() as conn:
+        admitted = conn.execute(
+            select(models.InPatient.id).where(models.InPatient.status == "admitted").order_by(models.InPatient.id)
+        ).scalars().all()
+    doctor_ids = [f"doc-{i:05d}" for i in range(sizes["doctors"])]
+    return {
+        "counts": counts,
+        "doctor_emails": [f"doctor{i}@hospital.example" for i in range(sizes["doctors"])],
+        "doctor_ids": doctor_ids or ["admin"],
+        "out_patient_ids": [f"op-{i:08d}" for i in range(sizes["out_patients"])],
+        "in_patient_ids": [f"ip-{i:08d}" for i in range(sizes["in_patients"])],
+        "admitted_ids": admitted,
+        "surnames": LAST_NAMES,
+    }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Concurrent load benchmark for the Hospital Management System API.
+
+Seeds a throwaway SQLite database, then drives the FastAPI app in-process with
+50-200 concurrent clients and reports p50/p99 latency per endpoint.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test
+    DB_ASYNC=true python -m benchmarks.load_test --clients 50 100 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def seed(patients: int):
+    """Create the schema and insert synthetic out-patients."""
+    from sqlalchemy import insert
+    from app import models, schemas, crud
+    from app.database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        crud.create_user(db, schemas.UserCreate(
+            name="Bench Admin", email="bench@example.com", role="admin", password="bench-password"
+        ))
+        rows = [
+            {
+                "id": f"op-{i:08d}",
+                "name": f"Patient {i}",
+                "phone": f"555-{i:07d}",
+                "email": f"patient{i}@example.com",
+                "gender": "female" if i % 2 else "male",
+                "date_of_birth": date(1950 + i % 50, 1 + i % 12, 1 + i % 28),
+            }
+            for i in range(patients)
+        ]
+        db.execute(insert(models.OutPatient), rows)
+        db.commit()
+    finally:
+        db.close()
+
+async def run_level(app, token: str, clients: int, requests_per_client: int):
+    """Run one concurrency level and return latency samples per endpoint."""
+    import httpx
+
+    headers = {"Authorization": f"Bearer {token}"}
+    samples = {"GET /api/out-patients/": [], "GET /api/health": []}
+
+    async def client_loop(client: httpx.AsyncClient):
+        for i in range(requests_per_client):
+            # Every fourth request is a cheap health probe, which shows how
+            # long the event loop stalls behind database work.
+            path = "/api/health" if i % 4 == 3 else "/api/out-patients/"
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            samples[f"GET {path}"].append(elapsed * 1000)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        wall = time.perf_counter() - start
+
+    total = clients * requests_per_client
+    return samples, total / wall
+
+async def main_async(args):
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/auth/token", data={"username": "bench@example.com", "password": "bench-password"}
+        )
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+    mode = "async" if os.getenv("DB_ASYNC", "").lower() in ("1", "true", "yes", "on") else "sync"
+    print(f"mode={mode} patients={args.patients} requests/client={args.requests}")
+    print(f"{'clients':>8} {'endpoint':<24} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'req/s':>9}")
+    for clients in args.clients:
+        samples, throughput = await run_level(app, token, clients, args.requests)
+        for endpoint, values in samples.items():
+            print(
+                f"{clients:>8} {endpoint:<24} {percentile(values, 50):>9.1f} "
+                f"{percentile(values, 99):>9.1f} {statistics.mean(values):>9.1f} {throughput:>9.0f}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--patients", type=int, default=5000, help="out-patients to seed")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    seed(args.patients)
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
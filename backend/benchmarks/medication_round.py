@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Ward medication round benchmark.
+
+Seeds a synthetic hospital (see benchmarks/hospital.py) with --in-patients
+in-patients, their rounds and medications, then times the medication
+administration list for each ward and for the whole hospital against
+fetching every admitted patient's active medications one patient at a time,
+printing each SQLite query plan.
+
+Usage (from the backend directory):
+    python -m benchmarks.medication_round
+    python -m benchmarks.medication_round --in-patients 50000 --rounds 12 --repeat 20
+    DATABASE_URL=postgresql://... python -m benchmarks.medication_round
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.appointment_range import time_query
+from benchmarks.hospital import WARDS, sizes_with
+
+def explain(db, statement) -> str:
+    """Return the SQLite query plan for a Core statement, or an empty string elsewhere."""
+    from sqlalchemy import text
+
+    if db.get_bind().dialect.name != "sqlite":
+        return ""
+    compiled = statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    return "; ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--in-patients", type=int, default=1500, help="in-patients to seed; about 70%% are admitted (a 1000-bed hospital)")
+    parser.add_argument("--rounds", type=int, default=6, help="mean rounds per in-patient")
+    parser.add_argument("--medications", type=int, default=2, help="mean medications per round")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per query")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+
+    from sqlalchemy import select
+    from app import crud, models
+    from app.database import SessionLocal, engine
+    from app.serialization import encode_rows
+    from benchmarks.hospital import seed_hospital
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    sizes = sizes_with(
+        doctors=40, out_patients=100, patients=100, feedback=100,
+        in_patients=args.in_patients, rounds=args.rounds, medications=args.medications
+    )
+    start = time.perf_counter()
+    hospital = seed_hospital(engine, sizes)
+    counts = hospital["counts"]
+    print(f"seeded {counts['in_patients']} in-patients, {len(hospital['admitted_ids'])} admitted, "
+          f"{counts['in_patient_medications']} medications in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+    db = SessionLocal()
+    try:
+        def list_and_encode(ward_type=None):
+            return encode_rows(crud.get_medication_administration_list(db, ward_type=ward_type))
+
+        def one_patient_at_a_time():
+            admitted = db.execute(select(models.InPatient.id).where(models.InPatient.status == "admitted")).scalars().all()
+            return [crud.get_active_in_patient_medications(db, patient_id) for patient_id in admitted]
+
+        full = crud.get_medication_administration_list(db)
+        print(f"{len(full)} active medications on the full-hospital list")
+        print(f"{'query':<34} {'median ms':>10}")
+        print(f"{'per patient (before)':<34} {time_query(one_patient_at_a_time, args.repeat):>10.2f}")
+        for ward_type in [None] + WARDS:
+            label = f"ward {ward_type}" if ward_type else "whole hospital"
+            print(f"{label + ', rows + JSON':<34} {time_query(lambda: list_and_encode(ward_type), args.repeat):>10.2f}")
+        plan = explain(db, crud.medication_administration_query("icu"))
+        if plan:
+            print(f"plan (one ward): {plan}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Patient search benchmark.
+
+Seeds a throwaway database with out-patients and in-patients (one million
+by default, a tenth of them in-patients) with random names, phones, emails
+and a visit or round diagnosis each, builds the search index with
+crud.rebuild_patient_search, then times typeahead queries of growing length
+through crud.search_patients against a LIKE scan of the patient table.
+
+Usage (from the backend directory):
+    python -m benchmarks.patient_search
+    python -m benchmarks.patient_search --patients 200000 --repeat 20
+    DATABASE_URL=postgresql://... python -m benchmarks.patient_search
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Aarav", "Priya", "Wei", "Mei", "Oluwaseun", "Amara", "Mateo", "Sofia", "Yusuf", "Fatima",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Sharma", "Patel", "Chen", "Wang", "Okafor", "Adeyemi", "Silva", "Rossi", "Khan", "Ahmed",
+]
+DIAGNOSES = [
+    "hypertension", "type 2 diabetes", "asthma", "bronchitis", "migraine", "pneumonia", "gastritis",
+    "urinary tract infection", "osteoarthritis", "anaemia", "sepsis", "cellulitis", "appendicitis",
+]
+QUERIES = ["jo", "joh", "john", "john sm", "smith", "555", "5550123", "pneum", "sepsis chen", "example.com"]
+
+def seed(engine, patients: int):
+    """Insert patients with one visit or round each, in batches with executemany."""
+    from app import models
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    batch_size = 50000
+    with engine.begin() as conn:
+        for start in range(0, patients, batch_size):
+            out_rows, in_rows, visits, rounds = [], [], [], []
+            for i in range(start, min(start + batch_size, patients)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                row = {
+                    "name": f"{first} {last}",
+                    "phone": f"555-{rng.randrange(10000):04d}-{i % 1000:03d}",
+                    "email": f"{first}.{last}{i}@example.com".lower(),
+                    "gender": rng.choice(["male", "female"]),
+                    "date_of_birth": date(1940, 1, 1) + timedelta(days=rng.randrange(30000)),
+                }
+                history = {"date": now, "chief_complaints": "review", "diagnosis": rng.choice(DIAGNOSES)}
+                if i % 10 == 0:
+                    in_rows.append({**row, "id": f"ip-{i:09d}", "admission_date": now, "status": "admitted"})
+                    rounds.append({**history, "id": f"ipr-{i:09d}", "patient_id": f"ip-{i:09d}"})
+                else:
+                    out_rows.append({**row, "id": f"op-{i:09d}"})
+                    visits.append({**history, "id": f"opv-{i:09d}", "patient_id": f"op-{i:09d}"})
+            conn.execute(models.OutPatient.__table__.insert(), out_rows)
+            conn.execute(models.InPatient.__table__.insert(), in_rows)
+            conn.execute(models.OutPatientVisit.__table__.insert(), visits)
+            conn.execute(models.InPatientRound.__table__.insert(), rounds)
+
+def time_query(fn, repeat: int):
+    """Return (median wall time in milliseconds, last result) of fn()."""
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=1_000_000, help="patients to seed")
+    parser.add_argument("--limit", type=int, default=20, help="results per search")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per query")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app import crud, models
+    from app.database import SessionLocal, engine
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    seed(engine, args.patients)
+    print(f"seeded {args.patients} patients in {time.perf_counter() - start:.1f}s")
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        documents = crud.rebuild_patient_search(db)
+        print(f"indexed {documents} search documents in {time.perf_counter() - start:.1f}s")
+
+        def like_scan(q):
+            pattern = f"%{q}%"
+            return db.query(models.OutPatient.id).filter(
+                models.OutPatient.name.ilike(pattern) | models.OutPatient.email.ilike(pattern) | models.OutPatient.phone.ilike(pattern)
+            ).limit(args.limit).all()
+
+        print(f"{'query':<14} {'hits':>5} {'search ms':>10} {'LIKE ms':>9}  top result")
+        for q in QUERIES:
+            elapsed, results = time_query(lambda: crud.search_patients(db, q, limit=args.limit), args.repeat)
+            like_elapsed, _ = time_query(lambda: like_scan(q), max(1, args.repeat // 5))
+            top = f"{results[0]['name']} <{results[0]['email']}>" if results else "-"
+            print(f"{q:<14} {len(results):>5} {elapsed:>10.2f} {like_elapsed:>9.1f}  {top}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
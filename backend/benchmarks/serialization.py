@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+List serialization benchmark.
+
+Seeds a throwaway database with users, patients, appointments, admissions
+and feedback (20000 rows each by default), then requests every list endpoint
+through the app twice: with FAST_SERIALIZATION_ROUTES empty (ORM objects
+validated against response_model) and with the route enabled (column-only
+rows encoded with orjson). Prints the median time per request and checks
+that both paths return the same JSON. The response cache is cleared before
+each request so the cached lists are measured on a miss.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 5000 --limit 100 --repeat 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+def seed(engine, rows: int):
+    """Insert rows into every listed table with executemany."""
+    from app import models
+
+    rng = random.Random(42)
+    today = datetime.combine(date.today(), dt_time(8))
+    person = {"phone": "555-0100", "gender": "female", "date_of_birth": date(1980, 1, 1), "address": "1 Main Street"}
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [
+            {"id": f"user-{i:06d}", "name": f"Doctor {i}", "email": f"doctor{i}@example.com", "role": "doctor", "password": "x"}
+            for i in range(rows)
+        ])
+        conn.execute(models.OutPatient.__table__.insert(), [
+            {**person, "id": f"op-{i:06d}", "name": f"Out Patient {i}", "email": f"op{i}@example.com"}
+            for i in range(rows)
+        ])
+        conn.execute(models.InPatient.__table__.insert(), [
+            {**person, "id": f"ip-{i:06d}", "name": f"In Patient {i}", "email": f"ip{i}@example.com",
+             "admission_date": today - timedelta(days=i % 30), "status": "admitted" if i % 10 == 0 else "discharged",
+             "ward_type": "general", "room_number": str(i % 50), "admission_diagnosis": "observation"}
+            for i in range(rows)
+        ])
+        conn.execute(models.OutPatientAppointment.__table__.insert(), [
+            {"id": f"op-apt-{i:06d}", "patient_id": f"op-{i:06d}", "date": today + timedelta(days=i % 20, minutes=i % 600),
+             "type": "walk-in", "status": "scheduled", "reminder_sent": bool(i % 2), "notes": "follow-up"}
+            for i in range(rows)
+        ])
+        conn.execute(models.InPatientAdmission.__table__.insert(), [
+            {"id": f"ip-adm-{i:06d}", "patient_id": f"ip-{i:06d}", "admission_date": today - timedelta(days=i % 30),
+             "status": "admitted" if i % 10 == 0 else "discharged", "admission_type": rng.choice(["emergency", "elective"])}
+            for i in range(rows)
+        ])
+        conn.execute(models.Feedback.__table__.insert(), [
+            {"id": f"fb-{i:06d}", "patient_id": f"op-{i:06d}", "patient_name": f"Out Patient {i}", "appointment_id": f"op-apt-{i:06d}",
+             "visit_date": date.today(), "rating": rng.choice(["happy", "satisfied", "not-satisfied"]), "comments": "Fine",
+             "submitted_date": date.today(), "category": "overall"}
+            for i in range(rows)
+        ])
+
+def time_request(client, url: str, headers: dict, repeat: int):
+    """Return (median milliseconds, last JSON body) of GET url, clearing the response cache first."""
+    from app.response_cache import response_cache
+
+    samples, body = [], None
+    for _ in range(repeat):
+        response_cache.clear()
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, (url, response.status_code, response.text[:200])
+        body = response.json()
+    return statistics.median(samples), body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="rows seeded per table")
+    parser.add_argument("--limit", type=int, default=500, help="page size of the paginated lists")
+    parser.add_argument("--repeat", type=int, default=20, help="timed requests per endpoint and path")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from fastapi.testclient import TestClient
+    from app import auth, config, models
+    from app.database import engine
+    from app.main import app
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    seed(engine, args.rows)
+    token = auth.create_access_token({"sub": "doctor0@example.com"})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(app)
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.update().where(models.User.id == "user-000000").values(role="admin"))
+
+    limit = args.limit
+    routes = [
+        ("users", f"/api/users/?limit={limit}"),
+        ("out-patients", f"/api/out-patients/?limit={limit}"),
+        ("in-patients", f"/api/in-patients/?limit={limit}"),
+        ("in-patients/admitted", "/api/in-patients/admitted"),
+        ("appointments/out-patients", f"/api/appointments/out-patients?limit={limit}"),
+        ("appointments/out-patients/today", "/api/appointments/out-patients/today"),
+        ("appointments/in-patients", f"/api/appointments/in-patients?limit={limit}"),
+        ("appointments/in-patients/active", "/api/appointments/in-patients/active"),
+        ("feedback", f"/api/feedback/?limit={limit}"),
+    ]
+
+    mismatched = []
+    print(f"{'route':<34} {'rows':>6} {'ORM ms':>9} {'fast ms':>9} {'speedup':>8}")
+    for route, url in routes:
+        config.FAST_SERIALIZATION_ROUTES = set()
+        orm_ms, orm_body = time_request(client, url, headers, args.repeat)
+        config.FAST_SERIALIZATION_ROUTES = {route}
+        fast_ms, fast_body = time_request(client, url, headers, args.repeat)
+        if fast_body != orm_body:
+            mismatched.append(route)
+        rows = len(orm_body["items"] if isinstance(orm_body, dict) else orm_body)
+        print(f"{route:<34} {rows:>6} {orm_ms:>9.2f} {fast_ms:>9.2f} {orm_ms / fast_ms:>7.1f}x")
+
+    if mismatched:
+        print(f"FAIL: fast path output differs for {', '.join(mismatched)}")
+        sys.exit(1)
+    print("OK: fast path output matches response_model serialization")
+
+if __name__ == "__main__":
+    main()
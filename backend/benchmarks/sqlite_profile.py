@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+SQLite engine profile benchmark.
+
+Runs concurrent writer and reader threads against a fresh database file for
+the "default" and "production" engine profiles and reports write/read
+throughput, read latency and lock errors.
+
+Usage (from the backend directory):
+    python -m benchmarks.sqlite_profile
+    python -m benchmarks.sqlite_profile --writers 4 --readers 16 --seconds 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import percentile
+
+def run_profile(profile: str, args):
+    """Run the mixed workload against one engine profile."""
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+    from app import models
+    from app.database import create_database_engine
+
+    workdir = tempfile.mkdtemp(prefix="hms-sqlite-")
+    engine = create_database_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}", profile=profile)
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    deadline = time.perf_counter() + args.seconds
+    writes, reads, errors = [0], [0], [0]
+    read_latencies = []
+    lock = threading.Lock()
+
+    def writer():
+        while time.perf_counter() < deadline:
+            db = Session()
+            try:
+                db.add(models.OutPatient(
+                    id=f"op-{uuid.uuid4().hex[:12]}",
+                    name="Bench Patient",
+                    phone="555-0100",
+                    email="bench@example.com",
+                    gender="female",
+                    date_of_birth=date(1980, 1, 1),
+                ))
+                db.commit()
+                with lock:
+                    writes[0] += 1
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    errors[0] += 1
+            finally:
+                db.close()
+
+    def reader():
+        while time.perf_counter() < deadline:
+            db = Session()
+            start = time.perf_counter()
+            try:
+                db.query(models.OutPatient).order_by(models.OutPatient.created_at.desc()).limit(50).all()
+                db.query(models.OutPatient).filter(models.OutPatient.phone == "555-0199").first()
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    reads[0] += 1
+                    read_latencies.append(elapsed)
+            except OperationalError:
+                with lock:
+                    errors[0] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer) for _ in range(args.writers)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    print(
+        f"{profile:<11} {writes[0] / args.seconds:>9.0f} {reads[0] / args.seconds:>9.0f} "
+        f"{percentile(read_latencies or [0], 50):>9.1f} {percentile(read_latencies or [0], 99):>9.1f} {errors[0]:>7}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"writers={args.writers} readers={args.readers} seconds={args.seconds}")
+    print(f"{'profile':<11} {'writes/s':>9} {'reads/s':>9} {'read p50':>9} {'read p99':>9} {'errors':>7}")
+    for profile in ("default", "production"):
+        run_profile(profile, args)
+
+if __name__ == "__main__":
+    main()
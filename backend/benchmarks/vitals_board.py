@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Vital signs time series benchmark.
+
+Seeds a synthetic hospital (see benchmarks/hospital.py) with --in-patients
+in-patients and their rounds, then times loading the in-memory vitals
+series, the NEWS2 deterioration board for the whole hospital and for each
+ward, one patient's downsampled series, and refreshing patients after a
+write, against reading every admitted patient's rounds and parsing their
+vital_signs JSON one patient at a time.
+
+Usage (from the backend directory):
+    python -m benchmarks.vitals_board
+    python -m benchmarks.vitals_board --in-patients 20000 --rounds 12 --repeat 20
+    DATABASE_URL=postgresql://... python -m benchmarks.vitals_board
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.appointment_range import time_query
+from benchmarks.hospital import WARDS, sizes_with
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--in-patients", type=int, default=1500, help="in-patients to seed; about 70%% are admitted (a 1000-bed hospital)")
+    parser.add_argument("--rounds", type=int, default=12, help="mean rounds per in-patient")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per query")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+
+    from sqlalchemy import select
+    from app import crud, models
+    from app.database import SessionLocal, engine
+    from app.serialization import dumps
+    from app.vitals import parse_vital_signs
+    from app.vitals_series import vitals_series
+    from benchmarks.hospital import seed_hospital
+
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    sizes = sizes_with(
+        doctors=40, out_patients=100, patients=100, feedback=100,
+        in_patients=args.in_patients, rounds=args.rounds
+    )
+    start = time.perf_counter()
+    hospital = seed_hospital(engine, sizes)
+    counts = hospital["counts"]
+    admitted = hospital["admitted_ids"]
+    print(f"seeded {counts['in_patients']} in-patients, {len(admitted)} admitted, "
+          f"{counts['in_patient_rounds']} rounds in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+    db = SessionLocal()
+    try:
+        def full_load():
+            vitals_series.load(crud.get_vitals_rows(db))
+
+        def board(ward_type=None):
+            return dumps(vitals_series.board(crud.get_admitted_beds(db, ward_type=ward_type)))
+
+        def refresh(patient_ids):
+            vitals_series.update(set(patient_ids), crud.get_vitals_rows(db, patient_ids=patient_ids))
+
+        def one_patient_at_a_time():
+            rounds = models.InPatientRound
+            return [
+                [parse_vital_signs(vital_signs) for vital_signs in db.execute(
+                    select(rounds.vital_signs).where(rounds.patient_id == patient_id).order_by(rounds.date)
+                ).scalars()]
+                for patient_id in admitted
+            ]
+
+        print(f"{'query':<34} {'median ms':>10}")
+        print(f"{'per patient rounds + JSON (before)':<34} {time_query(one_patient_at_a_time, min(args.repeat, 3)):>10.2f}")
+        print(f"{'full load':<34} {time_query(full_load, min(args.repeat, 3)):>10.2f}")
+        for ward_type in [None] + WARDS:
+            label = f"board {ward_type}" if ward_type else "board, whole hospital"
+            print(f"{label + ' + JSON':<34} {time_query(lambda: board(ward_type), args.repeat):>10.2f}")
+        print(f"{'one series, 200 points':<34} {time_query(lambda: vitals_series.series(admitted[0]), args.repeat):>10.2f}")
+        print(f"{'refresh 10 written patients':<34} {time_query(lambda: refresh(admitted[:10]), args.repeat):>10.2f}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Mixed-workload benchmark for the Hospital Management System API.
+
+Seeds a synthetic hospital (see benchmarks/hospital.py) into a fresh
+database, then drives the FastAPI app in-process with concurrent virtual
+users. Each user repeatedly picks a scenario by weight:
+
+    login      POST /api/auth/token as a random doctor
+    dashboard  today's appointments, active admissions, ward occupancy and
+               the doctor's workload, requested together as a browser would
+    chart      patient search by surname prefix, then an out- or in-patient chart
+    booking    the doctor's schedule for the next week, then booking an appointment
+
+Every user draws from its own seeded random generator, so runs with the
+same arguments issue the same requests. Reports throughput and p50/p95/p99
+latency per request and per scenario. Save a run with --output and compare
+a later one with --baseline; the exit status is 1 when a p95 latency got
+worse than --tolerance percent.
+
+Usage (from the backend directory):
+    python -m benchmarks.workload
+    python -m benchmarks.workload --users 50 --iterations 40 --output baseline.json
+    python -m benchmarks.workload --baseline baseline.json --tolerance 15
+    DB_ASYNC=true python -m benchmarks.workload --mix login=0 dashboard=6 chart=3 booking=1
+    DATABASE_URL=postgresql://... python -m benchmarks.workload --out-patients 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.hospital import DOCTOR_PASSWORD, sizes_with
+from benchmarks.load_test import percentile
+
+DEFAULT_MIX = {"login": 1, "dashboard": 4, "chart": 4, "booking": 1}
+
+class Recorder:
+    """Latency samples (ms) per request name and per scenario, plus error counts."""
+
+    def __init__(self):
+        self.requests = {}
+        self.scenarios = {}
+        self.errors = {}
+        self.enabled = True
+
+    async def request(self, client, name: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        if self.enabled:
+            self.requests.setdefault(name, []).append(elapsed)
+            if response.status_code >= 400:
+                self.errors[name] = self.errors.get(name, 0) + 1
+        return response
+
+    def scenario(self, name: str, elapsed: float) -> None:
+        if self.enabled:
+            self.scenarios.setdefault(name, []).append(elapsed)
+
+class VirtualUser:
+    """One doctor working through scenarios against the app."""
+
+    def __init__(self, client, recorder: Recorder, hospital: dict, index: int, seed: int):
+        self.client = client
+        self.recorder = recorder
+        self.hospital = hospital
+        self.rng = random.Random(seed * 100003 + index)
+        self.doctor_index = index % len(hospital["doctor_emails"])
+        self.email = hospital["doctor_emails"][self.doctor_index]
+        self.doctor_id = hospital["doctor_ids"][self.doctor_index]
+        self.headers = {}
+
+    async def login(self):
+        response = await self.recorder.request(
+            self.client, "POST /api/auth/token", "POST", "/api/auth/token",
+            data={"username": self.email, "password": DOCTOR_PASSWORD}
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def dashboard(self):
+        today = date.today()
+        await asyncio.gather(
+            self.get("GET /api/appointments/out-patients/today", "/api/appointments/out-patients/today"),
+            self.get("GET /api/appointments/in-patients/active", "/api/appointments/in-patients/active"),
+            self.get("GET /api/beds/wards", "/api/beds/wards"),
+            self.get("GET /api/workload/doctors", "/api/workload/doctors", params={
+                "from": today.isoformat(), "to": (today + timedelta(days=1)).isoformat()
+            }),
+        )
+
+    async def chart(self):
+        surname = self.rng.choice(self.hospital["surnames"])
+        await self.get("GET /api/search/patients", "/api/search/patients", params={"q": surname[:self.rng.randint(2, 4)]})
+        if self.rng.random() < 0.5 and self.hospital["admitted_ids"]:
+            patient_id = self.rng.choice(self.hospital["admitted_ids"])
+            await self.get("GET /api/in-patients/{patient_id}/chart", f"/api/in-patients/{patient_id}/chart")
+        else:
+            patient_id = self.rng.choice(self.hospital["out_patient_ids"])
+            await self.get("GET /api/out-patients/{patient_id}/chart", f"/api/out-patients/{patient_id}/chart")
+
+    async def booking(self):
+        start = datetime.combine(date.today(), datetime.min.time())
+        await self.get("GET /api/appointments/out-patients", "/api/appointments/out-patients", params={
+            "doctor_id": self.doctor_id, "from": start.isoformat(), "to": (start + timedelta(days=7)).isoformat(), "limit": 100
+        })
+        when = start + timedelta(days=self.rng.randint(1, 7), minutes=15 * self.rng.randrange(32))
+        await self.recorder.request(
+            self.client, "POST /api/appointments/out-patients", "POST", "/api/appointments/out-patients", headers=self.headers, json={
+                "patient_id": self.rng.choice(self.hospital["out_patient_ids"]), "doctor_id": self.doctor_id,
+                "date": when.isoformat(), "type": "walk-in"
+            }
+        )
+
+    async def get(self, name: str, url: str, params=None):
+        return await self.recorder.request(self.client, name, "GET", url, headers=self.headers, params=params)
+
+    async def run(self, mix: dict, iterations: int):
+        names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in names]
+        for _ in range(iterations):
+            name = self.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            await getattr(self, name)()
+            self.recorder.scenario(name, (time.perf_counter() - start) * 1000)
+
+def summarize(samples: dict, wall: float) -> dict:
+    return {
+        name: {
+            "count": len(values),
+            "per_second": len(values) / wall,
+            "mean": statistics.mean(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+        }
+        for name, values in sorted(samples.items())
+    }
+
+def print_table(title: str, stats: dict, errors: dict, baseline: dict):
+    print(f"\n{title:<44} {'count':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}  vs baseline p95")
+    for name, row in stats.items():
+        delta = ""
+        if name in baseline:
+            change = (row["p95"] - baseline[name]["p95"]) / baseline[name]["p95"] * 100
+            delta = f"{change:+.0f}%"
+        print(
+            f"{name:<44} {row['count']:>6} {row['per_second']:>8.1f} {row['p50']:>8.1f} "
+            f"{row['p95']:>8.1f} {row['p99']:>8.1f} {errors.get(name, 0):>6}  {delta}"
+        )
+
+def regressions(stats: dict, baseline: dict, tolerance: float) -> list:
+    """Names whose p95 latency is more than tolerance percent above the baseline."""
+    return [
+        name for name, row in stats.items()
+        if name in baseline and row["p95"] > baseline[name]["p95"] * (1 + tolerance / 100)
+    ]
+
+async def run_workload(app, hospital: dict, args) -> dict:
+    import httpx
+
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        users = [VirtualUser(client, recorder, hospital, index, args.seed) for index in range(args.users)]
+        recorder.enabled = False
+        await asyncio.gather(*(user.login() for user in users))
+        if args.warmup:
+            await asyncio.gather(*(user.run(args.mix, args.warmup) for user in users))
+        recorder.enabled = True
+        start = time.perf_counter()
+        await asyncio.gather(*(user.run(args.mix, args.iterations) for user in users))
+        wall = time.perf_counter() - start
+
+    total = sum(len(values) for values in recorder.requests.values())
+    return {
+        "wall_seconds": wall,
+        "requests_per_second": total / wall,
+        "requests": summarize(recorder.requests, wall),
+        "scenarios": summarize(recorder.scenarios, wall),
+        "errors": recorder.errors,
+    }
+
+def parse_mix(values) -> dict:
+    mix = dict(DEFAULT_MIX)
+    for value in values or []:
+        name, _, weight = value.partition("=")
+        if name not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"--mix expects scenario=weight with a scenario in {sorted(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=25, help="scenarios run by each user")
+    parser.add_argument("--warmup", type=int, default=2, help="unrecorded scenarios per user before timing")
+    parser.add_argument("--mix", nargs="+", metavar="SCENARIO=WEIGHT", help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42, help="seed for the data and the request sequence")
+    for name in ("doctors", "out-patients", "in-patients", "patients", "visits", "rounds", "medications", "appointments", "feedback"):
+        parser.add_argument(f"--{name}", type=int, help=f"{name.replace('-', ' ')} to seed (see benchmarks/hospital.py)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="allowed p95 regression in percent")
+    args = parser.parse_args()
+    args.mix = parse_mix(args.mix)
+
+    workdir = tempfile.mkdtemp(prefix="hms-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+
+    from app import models
+    from app.database import engine
+    from app.main import app
+    from benchmarks.hospital import seed_hospital
+
+    sizes = sizes_with(
+        doctors=args.doctors, out_patients=args.out_patients, in_patients=args.in_patients, patients=args.patients, visits=args.visits,
+        rounds=args.rounds, medications=args.medications, appointments=args.appointments, feedback=args.feedback
+    )
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    hospital = seed_hospital(engine, sizes, seed=args.seed)
+    print(f"seeded {sum(hospital['counts'].values())} rows in {time.perf_counter() - start:.1f}s: "
+          + ", ".join(f"{name}={count}" for name, count in hospital["counts"].items()))
+
+    mode = "async" if os.getenv("DB_ASYNC", "").lower() in ("1", "true", "yes", "on") else "sync"
+    print(f"mode={mode} database={engine.dialect.name} users={args.users} iterations={args.iterations} mix={args.mix}")
+    results = asyncio.run(run_workload(app, hospital, args))
+    results["config"] = {"mode": mode, "database": engine.dialect.name, "users": args.users,
+                         "iterations": args.iterations, "mix": args.mix, "seed": args.seed, "sizes": sizes}
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_table("request", results["requests"], results["errors"], baseline.get("requests", {}))
+    print_table("scenario", results["scenarios"], {}, baseline.get("scenarios", {}))
+    print(f"\n{results['requests_per_second']:.1f} requests/s over {results['wall_seconds']:.1f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+
+    if baseline:
+        worse = regressions(results["requests"], baseline.get("requests", {}), args.tolerance)
+        if worse:
+            print(f"FAIL: p95 more than {args.tolerance:.0f}% above baseline for {', '.join(worse)}")
+            sys.exit(1)
+        print(f"OK: no p95 more than {args.tolerance:.0f}% above baseline")
+
+if __name__ == "__main__":
+    main()
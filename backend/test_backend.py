@@ -1 +1,240 @@
- 
\ No newline at end of file
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# The app reads DATABASE_URL when it is first imported
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hms-test-'), 'test.db')}"
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app import auth, crud, models, schemas
+from app.allergies import CAUTION, CONTRAINDICATED, allergy_checker
+from app.change_feed import RESET, ChangeFeed, MemoryBackend
+from app.database import engine
+from app.vitals import VITAL_COLUMNS
+from app.vitals_series import VitalsSeriesStore, news2, news2_risk
+from benchmarks.chart_queries import measure, seed
+
+HISTORY_SIZES = (1, 10, 100)
+
+@pytest.fixture(scope="module")
+def chart_patients():
+    """Out-patient and in-patient ids for each history size."""
+    models.Base.metadata.create_all(bind=engine)
+    return {history: seed(engine, history, medications=3) for history in HISTORY_SIZES}
+
+@pytest.mark.parametrize("load, schema, which", [
+    (crud.get_out_patient_chart, schemas.OutPatientChart, 0),
+    (crud.get_in_patient_chart, schemas.InPatientChart, 1),
+], ids=["out-patient", "in-patient"])
+def test_chart_query_count_is_constant(chart_patients, load, schema, which):
+    counts = {
+        history: measure(engine, load, schema, patient_ids[which])[0]
+        for history, patient_ids in chart_patients.items()
+    }
+    assert len(set(counts.values())) == 1, counts
+
+@pytest.fixture(scope="module")
+def client():
+    from app.main import app
+    return TestClient(app)
+
+@pytest.fixture(scope="module")
+def headers(client):
+    client.post("/api/auth/register", json={"name": "Test Admin", "email": "admin@test.com", "role": "admin", "password": "pw"})
+    return {"Authorization": f"Bearer {auth.create_access_token({'sub': 'admin@test.com'})}"}
+
+def ok(response, status_code=200):
+    assert response.status_code == status_code, (response.status_code, response.text)
+    return response.json()
+
+def out_patient(**fields) -> dict:
+    return {"name": "Test Patient", "phone": "555", "email": "p@test.com", "gender": "female", "date_of_birth": "1980-01-01", **fields}
+
+def in_patient(**fields) -> dict:
+    return out_patient(admission_date=datetime.utcnow().isoformat(), **fields)
+
+def admission(patient_id: str, **fields) -> dict:
+    return {"patient_id": patient_id, "admission_date": datetime.utcnow().isoformat(), "admission_type": "emergency", **fields}
+
+# NEWS2
+
+def vitals_matrix(*readings: dict) -> np.ndarray:
+    """(metric, reading) matrix of the given readings; metrics a reading leaves out are NaN."""
+    return np.array([[reading.get(column, np.nan) for reading in readings] for column in VITAL_COLUMNS], dtype=np.float32)
+
+@pytest.mark.parametrize("reading, score", [
+    ({}, 0),
+    ({"respiratory_rate": 8}, 3), ({"respiratory_rate": 9}, 1), ({"respiratory_rate": 20}, 0),
+    ({"respiratory_rate": 21}, 2), ({"respiratory_rate": 25}, 3),
+    ({"spo2": 91}, 3), ({"spo2": 92}, 2), ({"spo2": 95}, 1), ({"spo2": 96}, 0),
+    ({"bp_systolic": 90}, 3), ({"bp_systolic": 100}, 2), ({"bp_systolic": 101}, 1), ({"bp_systolic": 111}, 0),
+    ({"bp_systolic": 219}, 0), ({"bp_systolic": 220}, 3),
+    ({"pulse": 40}, 3), ({"pulse": 50}, 1), ({"pulse": 90}, 0), ({"pulse": 91}, 1), ({"pulse": 111}, 2), ({"pulse": 131}, 3),
+    ({"temperature": 35.0}, 3), ({"temperature": 35.5}, 1), ({"temperature": 37.0}, 0),
+    ({"temperature": 38.5}, 1), ({"temperature": 39.1}, 2),
+    ({"bp_diastolic": 130}, 0),  # Not a NEWS2 parameter
+])
+def test_news2_bands(reading, score):
+    scores, red_flags = news2(vitals_matrix(reading))
+    assert scores.tolist() == [score]
+    assert red_flags.tolist() == [score == 3]
+
+def test_news2_adds_metrics_and_bands_risk():
+    scores, red_flags = news2(vitals_matrix(
+        {"respiratory_rate": 25, "spo2": 91, "pulse": 131},  # 3 + 3 + 3
+        {"respiratory_rate": 21, "spo2": 92, "pulse": 91},  # 2 + 2 + 1
+        {"respiratory_rate": 25},  # One parameter scoring 3
+        {"respiratory_rate": 21, "pulse": 111},  # 2 + 2
+        {"respiratory_rate": 16, "spo2": 98, "bp_systolic": 120, "pulse": 70, "temperature": 37.0},
+    ))
+    assert scores.tolist() == [9, 5, 3, 4, 0]
+    assert news2_risk(scores, red_flags).tolist() == ["high", "medium", "low-medium", "low", "low"]
+
+def test_news2_leaves_out_readings_older_than_max_age():
+    now = datetime.utcnow().replace(microsecond=0)
+    rows = [
+        # The pulse from two days ago is not carried into the latest round
+        ("fresh", now - timedelta(days=2), None, None, 131, None, None, None),
+        ("fresh", now - timedelta(hours=1), None, None, None, None, None, 25),
+        ("stale", now - timedelta(days=2), None, None, 131, None, 91, 25),
+    ]
+    store = VitalsSeriesStore(max_age=12)
+    store.load(rows)
+    assert store.get("fresh").news2.tolist() == [3, 3]
+    board = store.board([(patient_id, patient_id, "general", None, None) for patient_id in ("stale", "fresh")], now=now)
+    assert [(row["patient_id"], row["news2"]) for row in board] == [("fresh", 3), ("stale", None)]
+    assert board[1]["observed_at"] == now - timedelta(days=2)
+    # The same readings scored as of when they were taken
+    board = store.board([("stale", "stale", "general", None, None)], now=now - timedelta(days=2))
+    assert (board[0]["news2"], board[0]["risk"]) == (9, "high")
+
+# Allergies
+
+@pytest.mark.parametrize("allergies, medication, expected", [
+    ('["Penicillin"]', "Amoxicillin 500mg", [("penicillins", CONTRAINDICATED)]),
+    ('["Penicillin"]', "Augmentin", [("penicillins", CONTRAINDICATED)]),
+    ('["PCN"]', "Cefalexin", [("cephalosporins", CAUTION)]),
+    ('["Cephalosporins"]', "Meropenem", [("carbapenems", CAUTION)]),
+    ('["Sulfa drugs"]', "Bactrim DS", [("sulfonamides", CONTRAINDICATED)]),
+    ('["Penicillin", "Aspirin"]', "Ibuprofen", [("nsaids", CONTRAINDICATED)]),
+    ('["Latex"]', "Latex gloves", [(None, CONTRAINDICATED)]),
+    ('["Penicillin"]', "Paracetamol", []),
+    ('["Sulfa drugs"]', "Amoxicillin", []),
+    ("[]", "Amoxicillin", []),
+    (None, "Amoxicillin", []),
+])
+def test_allergy_warnings(allergies, medication, expected):
+    warnings = allergy_checker.check(allergies, medication)
+    assert [(warning["drug_class"], warning["severity"]) for warning in warnings] == expected
+
+def test_prescribing_warns_about_allergies(client, headers):
+    patient = ok(client.post("/api/out-patients/", headers=headers, json=out_patient(allergies='["Penicillin"]')))
+    line = lambda name: {"name": name, "dosage": "1", "frequency": "bd", "duration": "5d"}
+    visit = ok(client.post("/api/visits/", headers=headers, json={
+        "patient_id": patient["id"], "date": "2024-02-01T10:00:00", "chief_complaints": "Cough", "diagnosis": "Chest infection",
+        "medications": [line("Amoxicillin 500mg"), line("Cefuroxime"), line("Paracetamol")],
+    }))
+    assert [[warning["severity"] for warning in medication["allergy_warnings"]] for medication in visit["medications"]] == [
+        [CONTRAINDICATED], [CAUTION], [],
+    ]
+    # Editing the patient's allergies applies to the next prescription
+    ok(client.put(f"/api/out-patients/{patient['id']}", headers=headers, json={"allergies": "[]"}))
+    added = ok(client.post(f"/api/visits/{visit['id']}/medications", headers=headers, json=[line("Amoxicillin 500mg")]))
+    assert added[0]["allergy_warnings"] == []
+
+# Beds
+
+def test_bed_double_booking_is_rejected(client, headers):
+    first, second = (ok(client.post("/api/in-patients/", headers=headers, json=in_patient(name=name))) for name in ("First", "Second"))
+    bed = {"ward_type": "icu", "room_number": "7", "bed_number": "1"}
+    ok(client.post("/api/appointments/in-patients", headers=headers, json=admission(first["id"], **bed)))
+    response = client.post("/api/appointments/in-patients", headers=headers, json=admission(second["id"], **bed))
+    assert response.status_code == 409, response.text
+    # Neither another admission nor a row of the same batch can take the bed
+    moved = {**bed, "bed_number": "2"}
+    result = ok(client.post("/api/appointments/in-patients/bulk", headers=headers, json=[
+        admission(second["id"], **bed), admission(second["id"], **moved), admission(first["id"], **moved),
+    ]))
+    assert [row["status"] for row in result["results"]] == ["invalid", "created", "invalid"]
+    assert (result["created"], result["failed"]) == (1, 2)
+    assert ok(client.get(f"/api/in-patients/{second['id']}", headers=headers))["bed_number"] == "2"
+
+# Pagination
+
+def test_cursor_pages_are_stable_under_inserts(client, headers):
+    ok(client.post("/api/out-patients/bulk", headers=headers, json=[out_patient(name=f"Paged {i}") for i in range(7)]))
+    existing = [patient["id"] for patient in ok(client.get("/api/out-patients/", headers=headers, params={"limit": 500}))["items"]]
+    seen, cursor = [], None
+    while True:
+        page = ok(client.get("/api/out-patients/", headers=headers, params={"limit": 3, **({"cursor": cursor} if cursor else {})}))
+        seen += [patient["id"] for patient in page["items"]]
+        # Rows written while paging do not shift the pages after the cursor
+        ok(client.post("/api/out-patients/", headers=headers, json=out_patient(name="Inserted")))
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen))
+    assert [patient_id for patient_id in seen if patient_id in set(existing)] == existing
+    assert client.get("/api/out-patients/", headers=headers, params={"cursor": "not-a-cursor"}).status_code == 400
+
+# Bulk writes
+
+def test_bulk_reports_each_row(client, headers):
+    patient = ok(client.post("/api/out-patients/", headers=headers, json=out_patient()))
+    today = datetime.utcnow().isoformat()
+    created = ok(client.post("/api/appointments/out-patients/bulk", headers=headers, json=[
+        {"patient_id": patient["id"], "date": today, "type": "walk-in"},
+        {"patient_id": "op-missing", "date": today, "type": "walk-in"},
+        {"patient_id": patient["id"], "type": "walk-in"},
+    ]))
+    assert [(row["index"], row["status"]) for row in created["results"]] == [(0, "created"), (1, "invalid"), (2, "invalid")]
+    assert (created["created"], created["failed"]) == (1, 2)
+    appointment_id = created["results"][0]["id"]
+    updated = ok(client.put("/api/appointments/out-patients/bulk", headers=headers, json=[
+        {"id": "missing", "notes": "x"}, {"id": appointment_id, "status": "completed"},
+    ]))
+    assert [row["status"] for row in updated["results"]] == ["not_found", "updated"]
+    assert ok(client.get(f"/api/appointments/out-patients/{appointment_id}", headers=headers))["status"] == "completed"
+
+# Conditional GETs
+
+def test_etag_revalidation(client, headers):
+    ok(client.post("/api/in-patients/", headers=headers, json=in_patient(name="Tagged")))
+    first = client.get("/api/in-patients/admitted", headers=headers)
+    etag = first.headers["etag"]
+    cached = client.get("/api/in-patients/admitted", headers={**headers, "If-None-Match": etag})
+    assert (cached.status_code, cached.content) == (304, b"")
+    ok(client.post("/api/in-patients/", headers=headers, json=in_patient(name="Tagged later")))
+    changed = client.get("/api/in-patients/admitted", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert len(changed.json()) == len(first.json()) + 1
+
+# Change feed
+
+def test_change_feed_resume():
+    feed = ChangeFeed(MemoryBackend(), history=3)
+    change = lambda topic: {"topic": topic, "op": "created", "id": topic, "data": {}}
+
+    async def received(sub, count):
+        return [await asyncio.wait_for(sub.get(), 1) for _ in range(count)]
+
+    async def run():
+        feed.publish([change("appointments"), change("admissions"), change("appointments")])
+        async with feed.subscribe(["appointments"], last_event_id=1) as sub:
+            assert [event["seq"] for event in await received(sub, 1)] == [3]
+        # Ahead of this worker's history, e.g. after it restarted
+        async with feed.subscribe(["appointments"], last_event_id=10) as sub:
+            assert await received(sub, 1) == [RESET]
+        feed.publish([change("appointments")])  # seq 1 leaves the history
+        async with feed.subscribe(["appointments", "admissions"], last_event_id=0) as sub:
+            assert await received(sub, 4) == [RESET, *[{**change(topic), "seq": seq} for topic, seq in (
+                ("admissions", 2), ("appointments", 3), ("appointments", 4))]]
+        async with feed.subscribe(["appointments"]) as sub:
+            feed.dispatch({**change("appointments"), "seq": 9})  # Another worker's events 5 to 8 were lost
+            assert [event.get("seq") for event in await received(sub, 2)] == [None, 9]
+
+    asyncio.run(run())
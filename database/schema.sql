@@ -229,6 +229,86 @@ CREATE TABLE feedback (
     FOREIGN KEY (appointment_id) REFERENCES appointments(id) ON DELETE CASCADE
 );
 
+-- Doctor workload summary (maintained by the API on every visit, round and appointment write)
+CREATE TABLE doctor_daily_workload (
+    doctor_id TEXT NOT NULL,
+    day DATE NOT NULL,
+    kind TEXT CHECK(kind IN ('visit', 'round', 'appointment')) NOT NULL,
+    status TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (doctor_id, day, kind, status)
+);
+
+-- Bed inventory and occupancy (maintained by the API on admission, transfer and discharge)
+CREATE TABLE beds (
+    ward_type TEXT CHECK(ward_type IN ('general', 'semi-private', 'private', 'icu', 'emergency')) NOT NULL,
+    room_number TEXT NOT NULL,
+    bed_number TEXT NOT NULL,
+    patient_id TEXT UNIQUE,
+    occupied_since DATETIME,
+    PRIMARY KEY (ward_type, room_number, bed_number),
+    FOREIGN KEY (patient_id) REFERENCES in_patients(id)
+);
+
+-- Patient search documents (maintained by the API on every patient, visit and round write)
+CREATE TABLE patient_search (
+    id INTEGER PRIMARY KEY,
+    kind TEXT CHECK(kind IN ('out-patient', 'in-patient')) NOT NULL,
+    patient_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    phone TEXT,
+    phone_digits TEXT,
+    email TEXT,
+    diagnoses TEXT,
+    UNIQUE (kind, patient_id)
+);
+
+-- Full-text index over patient_search, kept in sync by triggers
+CREATE VIRTUAL TABLE patient_search_fts USING fts5(
+    name, phone, phone_digits, email, diagnoses, kind UNINDEXED,
+    content='patient_search', content_rowid='id', prefix='2 3 4'
+);
+
+CREATE TRIGGER patient_search_ai AFTER INSERT ON patient_search BEGIN
+    INSERT INTO patient_search_fts(rowid, name, phone, phone_digits, email, diagnoses, kind)
+    VALUES (new.id, new.name, new.phone, new.phone_digits, new.email, new.diagnoses, new.kind);
+END;
+
+CREATE TRIGGER patient_search_ad AFTER DELETE ON patient_search BEGIN
+    INSERT INTO patient_search_fts(patient_search_fts, rowid, name, phone, phone_digits, email, diagnoses, kind)
+    VALUES ('delete', old.id, old.name, old.phone, old.phone_digits, old.email, old.diagnoses, old.kind);
+END;
+
+CREATE TRIGGER patient_search_au AFTER UPDATE ON patient_search BEGIN
+    INSERT INTO patient_search_fts(patient_search_fts, rowid, name, phone, phone_digits, email, diagnoses, kind)
+    VALUES ('delete', old.id, old.name, old.phone, old.phone_digits, old.email, old.diagnoses, old.kind);
+    INSERT INTO patient_search_fts(rowid, name, phone, phone_digits, email, diagnoses, kind)
+    VALUES (new.id, new.name, new.phone, new.phone_digits, new.email, new.diagnoses, new.kind);
+END;
+
+-- Patients' allergies, one row per allergy (parsed by the API from the allergies JSON on every patient write)
+CREATE TABLE patient_allergies (
+    id INTEGER PRIMARY KEY,
+    kind TEXT CHECK(kind IN ('out-patient', 'in-patient')) NOT NULL,
+    patient_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    allergen TEXT NOT NULL,
+    drug_class TEXT
+);
+
+-- Numeric vital signs of each round (parsed by the API from the vital_signs JSON on every round write)
+CREATE TABLE round_vitals (
+    round_id TEXT PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    date DATETIME NOT NULL,
+    bp_systolic REAL,
+    bp_diastolic REAL,
+    pulse REAL,
+    temperature REAL,
+    spo2 REAL,
+    respiratory_rate REAL
+);
+
 -- Create indexes for better performance
 
 -- Out-patients indexes
@@ -240,19 +320,34 @@ CREATE INDEX idx_out_patient_medications_visit_id ON out_patient_medications(vis
 CREATE INDEX idx_out_patient_appointments_patient_id ON out_patient_appointments(patient_id);
 CREATE INDEX idx_out_patient_appointments_date ON out_patient_appointments(date);
 CREATE INDEX idx_out_patient_appointments_status ON out_patient_appointments(status);
+CREATE INDEX idx_out_patient_appointments_date_id ON out_patient_appointments(date, id);
+CREATE INDEX idx_out_patient_appointments_doctor_id_date ON out_patient_appointments(doctor_id, date, id);
+CREATE INDEX idx_out_patient_appointments_status_date ON out_patient_appointments(status, date, id);
 
 -- In-patients indexes
 CREATE INDEX idx_in_patients_email ON in_patients(email);
 CREATE INDEX idx_in_patients_phone ON in_patients(phone);
 CREATE INDEX idx_in_patients_admission_date ON in_patients(admission_date);
 CREATE INDEX idx_in_patients_status ON in_patients(status);
+CREATE INDEX idx_in_patients_ward_type_status ON in_patients(ward_type, status);
 CREATE INDEX idx_in_patient_rounds_patient_id ON in_patient_rounds(patient_id);
 CREATE INDEX idx_in_patient_rounds_date ON in_patient_rounds(date);
 CREATE INDEX idx_in_patient_medications_round_id ON in_patient_medications(round_id);
+CREATE INDEX idx_in_patient_medications_active_round_id ON in_patient_medications(round_id) WHERE status = 'active';
 CREATE INDEX idx_in_patient_admissions_patient_id ON in_patient_admissions(patient_id);
 CREATE INDEX idx_in_patient_admissions_admission_date ON in_patient_admissions(admission_date);
 CREATE INDEX idx_in_patient_admissions_status ON in_patient_admissions(status);
 
+-- Keyset pagination indexes (list endpoints order by created_at, id)
+CREATE INDEX idx_users_created_at_id ON users(created_at, id);
+CREATE INDEX idx_out_patients_created_at_id ON out_patients(created_at, id);
+CREATE INDEX idx_in_patients_created_at_id ON in_patients(created_at, id);
+CREATE INDEX idx_out_patient_visits_created_at_id ON out_patient_visits(created_at, id);
+CREATE INDEX idx_in_patient_rounds_created_at_id ON in_patient_rounds(created_at, id);
+CREATE INDEX idx_out_patient_appointments_created_at_id ON out_patient_appointments(created_at, id);
+CREATE INDEX idx_in_patient_admissions_created_at_id ON in_patient_admissions(created_at, id);
+CREATE INDEX idx_feedback_created_at_id ON feedback(created_at, id);
+
 -- General patients indexes (for backward compatibility)
 CREATE INDEX idx_patients_email ON patients(email);
 CREATE INDEX idx_patients_phone ON patients(phone);
@@ -263,4 +358,17 @@ CREATE INDEX idx_appointments_patient_id ON appointments(patient_id);
 CREATE INDEX idx_appointments_date ON appointments(date);
 CREATE INDEX idx_appointments_status ON appointments(status);
 CREATE INDEX idx_feedback_patient_id ON feedback(patient_id);
-CREATE INDEX idx_feedback_appointment_id ON feedback(appointment_id); 
\ No newline at end of file
+CREATE INDEX idx_feedback_appointment_id ON feedback(appointment_id); 
+
+-- Doctor workload summary indexes
+CREATE INDEX idx_doctor_daily_workload_day ON doctor_daily_workload(day);
+
+-- Allergy and vital sign filter indexes
+CREATE INDEX idx_patient_allergies_allergen ON patient_allergies(allergen, kind, patient_id);
+CREATE INDEX idx_patient_allergies_drug_class ON patient_allergies(drug_class, kind, patient_id);
+CREATE INDEX idx_patient_allergies_kind_patient_id ON patient_allergies(kind, patient_id);
+CREATE INDEX idx_round_vitals_patient_id_date ON round_vitals(patient_id, date);
+CREATE INDEX idx_round_vitals_spo2 ON round_vitals(spo2);
+CREATE INDEX idx_round_vitals_pulse ON round_vitals(pulse);
+CREATE INDEX idx_round_vitals_temperature ON round_vitals(temperature);
+CREATE INDEX idx_round_vitals_bp_systolic ON round_vitals(bp_systolic);
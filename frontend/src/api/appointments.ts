@@ -1,4 +1,4 @@
-import { API_BASE_URL, API_ENDPOINTS, getHeaders } from './config';
+import { API_BASE_URL, API_ENDPOINTS, getHeaders, Page } from './config';
 
 export interface OutPatientAppointment {
   id: string;
@@ -68,7 +68,8 @@ class AppointmentsAPI {
       throw new Error('Failed to fetch out-patient appointments');
     }
 
-    return response.json();
+    const page: Page<OutPatientAppointment> = await response.json();
+    return page.items;
   }
 
   async getTodayOutPatientAppointments(token: string): Promise<OutPatientAppointment[]> {
@@ -160,7 +161,8 @@ class AppointmentsAPI {
       throw new Error('Failed to fetch in-patient admissions');
     }
 
-    return response.json();
+    const page: Page<InPatientAdmission> = await response.json();
+    return page.items;
   }
 
   async getActiveInPatientAdmissions(token: string): Promise<InPatientAdmission[]> {
@@ -83,4 +83,10 @@ export interface ApiResponse<T> {
   data: T;
   message?: string;
   error?: string;
-}
\ No newline at end of file
+}
+
+// Cursor-paginated list response
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
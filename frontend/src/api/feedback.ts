@@ -1,4 +1,4 @@
-import { API_BASE_URL, API_ENDPOINTS, getHeaders } from './config';
+import { API_BASE_URL, API_ENDPOINTS, getHeaders, Page } from './config';
 
 export interface Feedback {
   id: string;
@@ -46,7 +46,8 @@ class FeedbackAPI {
       throw new Error('Failed to fetch feedbacks');
     }
 
-    return response.json();
+    const page: Page<Feedback> = await response.json();
+    return page.items;
   }
 
   async getFeedback(id: string, token: string): Promise<Feedback> {
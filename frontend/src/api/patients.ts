@@ -1,4 +1,4 @@
-import { API_BASE_URL, API_ENDPOINTS, getHeaders } from './config';
+import { API_BASE_URL, API_ENDPOINTS, getHeaders, Page } from './config';
 
 export interface OutPatient {
   id: string;
@@ -98,7 +98,8 @@ class PatientsAPI {
       throw new Error('Failed to fetch out-patients');
     }
 
-    return response.json();
+    const page: Page<OutPatient> = await response.json();
+    return page.items;
   }
 
   async getOutPatient(id: string, token: string): Promise<OutPatient> {
@@ -164,7 +165,8 @@ class PatientsAPI {
       throw new Error('Failed to fetch in-patients');
     }
 
-    return response.json();
+    const page: Page<InPatient> = await response.json();
+    return page.items;
   }
 
   async getAdmittedPatients(token: string): Promise<InPatient[]> {